@@ -0,0 +1,1723 @@
+"""Benchmarks for multi-tv-player.
+
+Everything runs against a local stand-in for TVHeadend, so no network or tuner is needed.
+Usage: python benchmark.py <benchmark> [options]. Results are printed as JSON.
+"""
+import argparse
+import io
+import json
+import sys
+import random
+import re
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+
+def synthetic_schedule(num_channels, start_ts, hours=48):
+    # Programmes of 15-90 minutes, staggered per channel so boundaries don't all line up
+    events = []
+    event_id = 1
+    end_ts = start_ts + hours * 3600
+    for ch in range(num_channels):
+        name = f"Channel {ch + 1}"
+        uuid = f"{ch + 1:032x}"
+        ts = start_ts - (ch * 7 % 60) * 60
+        n = 0
+        while ts < end_ts:
+            duration = (15 + (ch * 13 + n * 29) % 76) * 60
+            events.append({
+                "eventId": event_id,
+                "channelName": name,
+                "channelUuid": uuid,
+                "channelNumber": str(101 + ch),
+                "start": ts,
+                "stop": ts + duration,
+                "title": f"Programme {n} on {name}",
+                "subtitle": f"Episode {n}",
+            })
+            event_id += 1
+            ts += duration
+            n += 1
+    return events
+
+
+class FakeTVH:
+    """Minimal TVHeadend stand-in: EPG grid, channel/service grids, an M3U /playlist and streams.
+
+    Channels are packed onto muxes `channels_per_mux` at a time, in channel order. Channel
+    streams loop `channel_ts` (see make_test_stream) until the client disconnects.
+    """
+
+    def __init__(self, num_channels=200, clock=time.time, hours=48, channels_per_mux=4):
+        self.clock = clock
+        self.num_channels = num_channels
+        self.channels_per_mux = channels_per_mux
+        self.events = synthetic_schedule(num_channels, int(clock()), hours)
+        self.request_count = 0
+        self.lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with fake.lock:
+                    fake.request_count += 1
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                route = fake.routes.get(parts.path)
+                if route is None:
+                    prefix = parts.path.rsplit("/", 1)[0] + "/"
+                    route = fake.routes.get(prefix)
+                    query["path"] = parts.path[len(prefix):]
+                if route is None:
+                    self.send_error(404)
+                    return
+                status, content_type, body = route(query)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if isinstance(body, bytes):
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                # Streaming body, written until the route runs out or the client goes away
+                self.end_headers()
+                try:
+                    for chunk in body:
+                        self.wfile.write(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        self.routes = {
+            "/api/epg/events/grid": self.epg_grid,
+            "/api/channel/grid": self.channel_grid,
+            "/api/mpegts/service/grid": self.service_grid,
+            "/stream/mux/": self.mux_stream,
+            "/stream/channelid/": self.channel_stream,
+            "/hls/": self.hls_playlist,
+            "/playlist": self.playlist,
+        }
+        # Heights of the HLS variants in each channel's master playlist
+        self.hls_heights = (360, 720, 1080)
+        self.profile_requests = {}
+        self.stream_seconds = 2.0
+        self.mux_requests = 0
+        self.channel_requests = 0
+        self.channel_ts = None
+        self.stopped = threading.Event()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def epg_grid(self, query):
+        now = self.clock()
+        entries = [e for e in self.events if e["stop"] > now]
+        if "channel" in query:
+            entries = [e for e in entries if query["channel"] in (e["channelName"], e["channelUuid"])]
+        for f in json.loads(query.get("filter", "[]")):
+            value = f["value"]
+            if f.get("comparison") == "gt":
+                entries = [e for e in entries if e[f["field"]] > value]
+            elif f.get("comparison") == "lt":
+                entries = [e for e in entries if e[f["field"]] < value]
+        start = int(query.get("start", 0))
+        limit = int(query.get("limit", 50))
+        body = json.dumps({"entries": entries[start:start + limit], "totalCount": len(entries)})
+        return 200, "application/json", body.encode()
+
+    def mux_of(self, ch):
+        return f"mux-{ch // self.channels_per_mux}"
+
+    def channel_grid(self, query):
+        entries = [
+            {"uuid": f"{ch + 1:032x}", "name": f"Channel {ch + 1}", "number": 101 + ch, "services": [f"svc-{ch}"]}
+            for ch in range(self.num_channels)
+        ]
+        return 200, "application/json", json.dumps({"entries": entries, "total": len(entries)}).encode()
+
+    def service_grid(self, query):
+        entries = [
+            {"uuid": f"svc-{ch}", "multiplex_uuid": self.mux_of(ch), "multiplex": self.mux_of(ch).upper(),
+             "sid": 1 + ch % self.channels_per_mux}
+            for ch in range(self.num_channels)
+        ]
+        return 200, "application/json", json.dumps({"entries": entries, "total": len(entries)}).encode()
+
+    def mux_stream(self, query):
+        # A multi-program transport stream for the mux, paced roughly like a live feed
+        with self.lock:
+            self.mux_requests += 1
+        data = synthetic_mpts(self.channels_per_mux, 2000)
+
+        def chunks():
+            step = 188 * 100
+            deadline = time.perf_counter() + self.stream_seconds
+            i = 0
+            while time.perf_counter() < deadline:
+                yield data[i:i + step]
+                i = (i + step) % len(data)
+                time.sleep(0.005)
+        return 200, "video/mp2t", chunks()
+
+    def channel_stream(self, query):
+        with self.lock:
+            self.channel_requests += 1
+            profile = query.get("profile")
+            self.profile_requests[profile] = self.profile_requests.get(profile, 0) + 1
+        if self.channel_ts is None:
+            self.channel_ts = synthetic_mpts(1, 4000)
+        data = self.channel_ts
+
+        def chunks():
+            # Roughly real time for a few Mbit/s stream, looping the file
+            step = 188 * 50
+            i = 0
+            while not self.stopped.is_set():
+                yield data[i:i + step]
+                i = (i + step) % len(data)
+                time.sleep(0.02)
+        return 200, "video/mp2t", chunks()
+
+    def hls_playlist(self, query):
+        # /hls/<channel>.m3u8 is a master playlist; /hls/<channel>-<height>.m3u8 a variant of it
+        name = query["path"].rsplit(".", 1)[0]
+        channel, _, height = name.partition("-")
+        if not height:
+            lines = ["#EXTM3U"]
+            for h in self.hls_heights:
+                lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={h * 5000},RESOLUTION={h * 16 // 9}x{h}")
+                lines.append(f"{channel}-{h}.m3u8")
+        else:
+            lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:2", "#EXTINF:2.0,",
+                     f"{self.url}/stream/channelid/{channel}?profile=hls-{height}"]
+        return 200, "application/vnd.apple.mpegurl", ("\n".join(lines) + "\n").encode()
+
+    def playlist(self, query):
+        return 200, "audio/x-mpegurl", synthetic_playlist(self.num_channels, self.url).encode()
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_test_stream(path, seconds=10):
+    """Write a decodable test-pattern TS with ffmpeg, if it's installed.
+
+    Returns the TS bytes, or None without ffmpeg (the stand-in then serves synthetic
+    packets, which VLC opens and plays but can't draw).
+    """
+    import shutil
+    import subprocess
+    if shutil.which("ffmpeg") is None:
+        return None
+    cmd = [
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=25:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=1000:duration={seconds}",
+        "-c:v", "mpeg2video", "-b:v", "4M", "-g", "25", "-c:a", "mp2", "-f", "mpegts", str(path),
+    ]
+    try:
+        subprocess.run(cmd, check=True, timeout=120)
+        with open(path, "rb") as f:
+            return f.read()
+    except Exception as e:
+        print(f"Error generating test stream: {e}", file=sys.stderr)
+        return None
+
+
+class SimClock:
+    def __init__(self, now=None):
+        self.now = int(now if now is not None else time.time())
+
+    def __call__(self):
+        return self.now
+
+
+def bench_epg_sync(args):
+    from multi_tv_player import EPGFetcher
+
+    def run(short_hours=None):
+        clock = SimClock()
+        fake = FakeTVH(args.channels, clock=clock)
+        if short_hours is not None:
+            # One channel whose guide runs out early (or has expired) must not drag every window sync back
+            short = fake.events[-1]["channelUuid"]
+            fake.events = [e for e in fake.events
+                           if e["channelUuid"] != short or e["start"] < clock.now + short_hours * 3600]
+        fake.start()
+        try:
+            fetcher = EPGFetcher(fake.url)
+            fetcher.set_watched_channels([f"Channel {i + 1}" for i in range(args.watched)])
+            start = clock.now
+            ticks = 0
+            fetched = 0
+            fetch_pages = fetcher._fetch_pages
+
+            def counting_fetch(params=None):
+                nonlocal fetched
+                entries = fetch_pages(params)
+                fetched += len(entries)
+                return entries
+            fetcher._fetch_pages = counting_fetch
+            while clock.now - start < args.duration:
+                clock.now += int(fetcher.tick(clock.now))
+                ticks += 1
+            total_events = len([e for e in fake.events if e["stop"] > start])
+            return fake.request_count, ticks, fetched, len(fetcher.store), total_events
+        finally:
+            fake.stop()
+
+    requests, ticks, fetched, held, total_events = run()
+    short_requests, _, short_fetched, _, _ = run(short_hours=1)
+    return {
+        "benchmark": "epg-sync",
+        "channels": args.channels,
+        "simulated_seconds": args.duration,
+        "requests": requests,
+        "wakeups": ticks,
+        "events_fetched": fetched,
+        "events_held": held,
+        "short_channel_requests": short_requests,
+        "short_channel_events_fetched": short_fetched,
+        # The old fetcher polled once a second and only ever saw the first 1000 events
+        "legacy_requests": args.duration,
+        "legacy_events_visible": min(1000, total_events),
+        "ok": (requests < args.duration and held >= min(1000, total_events)
+               # A short channel may cost its own small requests, not a refetch of the whole grid
+               and short_requests <= requests + args.duration // 600 and short_fetched <= fetched * 1.1),
+    }
+
+
+def legacy_now_next(epg_data, now):
+    # The pre-EPGStore approach: regroup by channel name, sort and scan every tick
+    channel_data = {}
+    for event in epg_data:
+        channel_data.setdefault(event.get('channelName', ''), []).append(event)
+    parsed = {}
+    for cname, events in channel_data.items():
+        events.sort(key=lambda e: e['start'])
+        now_event, next_event = None, None
+        for i, e in enumerate(events):
+            if e['start'] <= now < e['stop']:
+                now_event = e
+                if i + 1 < len(events):
+                    next_event = events[i + 1]
+                break
+            elif e['start'] > now and next_event is None:
+                next_event = e
+        parsed[cname] = (now_event, next_event)
+    return parsed, channel_data
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def bench_epg_store(args):
+    from multi_tv_player import EPGStore
+
+    now = int(time.time())
+    events = synthetic_schedule(args.channels, now, hours=args.days * 24)
+    names = sorted({e["channelName"] for e in events})
+    queries = [(random.choice(names), now + random.randint(0, args.days * 86400)) for _ in range(args.queries)]
+
+    legacy_events, _ = measure_memory(lambda: [dict(e) for e in events])
+    t0 = time.perf_counter()
+    _, legacy_index = legacy_now_next(legacy_events, now)
+    legacy_tick = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name, ts in queries:
+        next((e for e in legacy_index[name] if e['start'] <= ts < e['stop']), None)
+    legacy_query = time.perf_counter() - t0
+    _, legacy_mem = measure_memory(lambda: legacy_now_next([dict(e) for e in events], now))
+
+    t0 = time.perf_counter()
+    store, store_mem = measure_memory(lambda: _build_store(EPGStore, events))
+    build_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name in names:
+        store.now_next(name, now)
+    store_tick = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name, ts in queries:
+        store.at(name, ts)
+    store_query = time.perf_counter() - t0
+
+    return {
+        "benchmark": "epg-store",
+        "channels": args.channels,
+        "events": len(events),
+        "store_build_s": round(build_time, 4),
+        "store_now_next_all_channels_s": round(store_tick, 6),
+        "legacy_now_next_all_channels_s": round(legacy_tick, 6),
+        "store_at_queries_per_s": round(len(queries) / store_query),
+        "legacy_at_queries_per_s": round(len(queries) / legacy_query),
+        "store_memory_mb": round(store_mem / 2**20, 2),
+        "legacy_memory_mb": round(legacy_mem / 2**20, 2),
+    }
+
+
+def bench_epg_cache(args):
+    """Warm start from the on-disk EPG cache: how long the GUI thread waits, and how soon the overlays get data."""
+    import tempfile
+    from pathlib import Path
+    from multi_tv_player import EPGCache, EPGFetcher, EPGStore
+
+    app = qt_app()
+    now = int(time.time())
+    events = synthetic_schedule(args.channels, now, hours=args.days * 24)
+    cache = EPGCache(Path(tempfile.mkdtemp(prefix="mtp-bench-")) / "epg.sqlite3", max_days=args.days)
+    t0 = time.perf_counter()
+    cache.save(_build_store(EPGStore, events), now)
+    save_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    loaded = cache.load(EPGStore(), now)
+    load_time = time.perf_counter() - t0
+
+    tvh = FakeTVH(args.channels).start()
+    fetcher = EPGFetcher(tvh.url, cache=cache)
+    first = []
+    fetcher.data_ready.connect(lambda data: first or first.append((time.perf_counter(), len(data))))
+    # What MultiPlayerApp does on the GUI thread before the window can show
+    t0 = time.perf_counter()
+    fetcher.start()
+    blocked = time.perf_counter() - t0
+    deadline = time.perf_counter() + 30
+    while not first and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    fetcher.stop()
+    fetcher.wait(5000)
+    tvh.stop()
+    return {
+        "benchmark": "epg-cache",
+        "channels": args.channels,
+        "events": loaded,
+        "save_s": round(save_time, 3),
+        "load_s": round(load_time, 3),
+        "gui_blocked_ms": round(blocked * 1000, 2),
+        "first_data_ms": round((first[0][0] - t0) * 1000, 1) if first else None,
+        "first_data_channels": first[0][1] if first else 0,
+        "ok": blocked < 0.05 and bool(first) and first[0][1] > 0,
+    }
+
+
+def synthetic_playlist(num_channels, base_url="http://127.0.0.1:9981"):
+    lines = ["#EXTM3U"]
+    for i in range(num_channels):
+        attrs = f'tvg-id="{i + 1:032x}" tvg-name="Channel {i + 1}" tvg-logo="http://logos.example/{i}.png" group-title="Group {i % 40}"'
+        if i % 10:
+            attrs += f' tvg-chno="{101 + i}"'
+        lines.append(f"#EXTINF:-1 {attrs},Channel {i + 1}")
+        if i % 25 == 0:
+            lines.append("#EXTVLCOPT:http-user-agent=multi-tv-player")
+        lines.append(f"{base_url}/stream/channelid/{i + 1}?profile=pass")
+    return "\n".join(lines) + "\n"
+
+
+def legacy_parse_playlist(text):
+    # The original load_channels_from_url parser (minus its debug printing)
+    channels, channels_by_number = {}, {}
+    lines = text.splitlines()
+    for i in range(len(lines)):
+        line = lines[i].strip()
+        if line.startswith('#EXTINF'):
+            name_match = line.split(',', 1)
+            channel_name = name_match[1].strip() if len(name_match) > 1 else f"Unknown_{i}"
+            chno_match = re.search(r'tvg-chno="(\d+)"', line)
+            channel_number = chno_match.group(1) if chno_match else None
+            if i + 1 < len(lines):
+                stream_url = lines[i + 1].strip()
+                channels[channel_name] = stream_url
+                if channel_number:
+                    channels_by_number[channel_number] = (channel_name, stream_url)
+    return channels, channels_by_number
+
+
+def bench_m3u_parse(args):
+    from multi_tv_player import parse_playlist
+
+    text = synthetic_playlist(args.entries)
+
+    def chunks():
+        # The way fetch_playlist feeds it: 64 KiB pieces of the response as they arrive
+        for i in range(0, len(text), 65536):
+            yield text[i:i + 65536]
+
+    # Best of three for both, a single run is too noisy to compare against
+    legacy_time = parse_time = float('inf')
+    for _ in range(3):
+        t0 = time.perf_counter()
+        legacy_channels, legacy_by_number = legacy_parse_playlist(text)
+        legacy_time = min(legacy_time, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        channels, by_number = parse_playlist(chunks())
+        parse_time = min(parse_time, time.perf_counter() - t0)
+
+    # Peak memory is measured in separate runs, tracemalloc slows everything down
+    tracemalloc.start()
+    legacy_parse_playlist(text)
+    legacy_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stream = chunks()
+    tracemalloc.start()
+    parse_playlist(stream)
+    parse_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "benchmark": "m3u-parse",
+        "entries": args.entries,
+        "playlist_mb": round(len(text) / 2**20, 2),
+        "channels": len(channels),
+        "numbered": len(by_number),
+        "with_options": sum(1 for c in channels.values() if c.options),
+        "parse_s": round(parse_time, 4),
+        "parse_peak_mb": round(parse_peak / 2**20, 2),
+        # The old parser only kept name/url/tvg-chno; its #EXTVLCOPT lines became bogus URLs
+        "legacy_parse_s": round(legacy_time, 4),
+        "legacy_peak_mb": round(legacy_peak / 2**20, 2),
+        "legacy_numbered": len(legacy_by_number),
+        "ok": parse_time < legacy_time and len(channels) == args.entries,
+    }
+
+
+def legacy_cycle(channels_by_number, current_url, direction):
+    # What cycle_channel used to do on every wheel notch
+    sorted_channels = sorted(
+        channels_by_number.items(),
+        key=lambda item: int(item[0]) if str(item[0]).isdigit() else 999999
+    )
+    for idx, (num, data) in enumerate(sorted_channels):
+        if data[1] == current_url:
+            return sorted_channels[(idx + direction) % len(sorted_channels)]
+    return None
+
+
+def bench_channel_index(args):
+    from multi_tv_player import ChannelIndex, parse_playlist
+
+    channels, by_number = parse_playlist(io.StringIO(synthetic_playlist(args.entries)))
+    t0 = time.perf_counter()
+    index = ChannelIndex(by_number, channels)
+    build_time = time.perf_counter() - t0
+
+    # Surf through the whole list and make sure it wraps back to the start
+    num, channel = index.at(0)
+    t0 = time.perf_counter()
+    for _ in range(len(index)):
+        num, channel = index.step(channel.url, 1)
+    step_time = (time.perf_counter() - t0) / len(index)
+    assert num == index.numbers[0], "cycling did not wrap around"
+
+    t0 = time.perf_counter()
+    for _ in range(10000):
+        index.random()
+    random_time = (time.perf_counter() - t0) / 10000
+
+    legacy_steps = 20
+    t0 = time.perf_counter()
+    url = index.records[len(index) // 2].url
+    for _ in range(legacy_steps):
+        legacy_cycle(by_number, url, 1)
+    legacy_time = (time.perf_counter() - t0) / legacy_steps
+
+    return {
+        "benchmark": "channel-index",
+        "channels": len(index),
+        "build_s": round(build_time, 4),
+        "step_us": round(step_time * 1e6, 2),
+        "random_us": round(random_time * 1e6, 2),
+        "legacy_step_us": round(legacy_time * 1e6, 2),
+        "ok": step_time < legacy_time,
+    }
+
+
+def qt_app():
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def bench_dropdown_epg(args):
+    from PySide6.QtWidgets import QComboBox
+    from multi_tv_player import ChannelIndex, ChannelListModel, parse_playlist
+
+    app = qt_app()
+    channels, by_number = parse_playlist(io.StringIO(synthetic_playlist(args.entries)))
+    index = ChannelIndex(by_number, channels)
+
+    def epg_tick(n):
+        # Roughly one channel in twenty changes programme between EPG updates
+        return {c.name: {"now_title": f"Programme {n if i % 20 == n % 20 else 0}"} for i, c in enumerate(index.records)}
+
+    # Old layout: every tile owns a combo with every channel and rewrites all of its rows per tick
+    t0 = time.perf_counter()
+    legacy = []
+    for _ in range(args.tiles):
+        combo = QComboBox()
+        for num, channel in zip(index.numbers, index.records):
+            combo.addItem(f"{num} - {channel.name}", num)
+        legacy.append(combo)
+    legacy_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for n in range(args.ticks):
+        data = epg_tick(n)
+        for combo in legacy:
+            for row in range(combo.count()):
+                num = combo.itemData(row)
+                channel = index.records[index.position_by_number[num]]
+                title = data.get(channel.name, {}).get("now_title", "")
+                combo.setItemText(row, f"{num} - {channel.name} ({title})" if title else f"{num} - {channel.name}")
+        app.processEvents()
+    legacy_tick = (time.perf_counter() - t0) / args.ticks
+
+    t0 = time.perf_counter()
+    model = ChannelListModel()
+    model.set_channel_index(index, {})
+    shared = []
+    for _ in range(args.tiles):
+        combo = QComboBox()
+        combo.setModel(model)
+        combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        combo.setMinimumContentsLength(28)
+        combo.view().setUniformItemSizes(True)
+        shared.append(combo)
+    shared_build = time.perf_counter() - t0
+    changed_rows = []
+    model.dataChanged.connect(lambda a, b, roles: changed_rows.append(b.row() - a.row() + 1))
+    t0 = time.perf_counter()
+    for n in range(args.ticks):
+        model.update_epg(epg_tick(n))
+        app.processEvents()
+    shared_tick = (time.perf_counter() - t0) / args.ticks
+
+    return {
+        "benchmark": "dropdown-epg",
+        "tiles": args.tiles,
+        "channels": len(index),
+        "legacy_build_s": round(legacy_build, 4),
+        "legacy_tick_ms": round(legacy_tick * 1000, 2),
+        "legacy_set_item_text_per_tick": args.tiles * len(index),
+        "shared_build_s": round(shared_build, 4),
+        "shared_tick_ms": round(shared_tick * 1000, 2),
+        "shared_rows_changed_per_tick": round(sum(changed_rows) / args.ticks, 1),
+    }
+
+
+def _player_config(tvh):
+    import tempfile
+    # Channel 101 has no tvg-chno in the synthetic playlist, so groups start at 102
+    return {
+        "playlist_url": tvh.url + "/playlist",
+        "cache_dir": tempfile.mkdtemp(prefix="mtp-bench-"),
+        "stream_groups": {
+            "3x3": [str(102 + i) for i in range(9)],
+            "2x2": ["102", "103", "104", "120"],
+            "1x1": ["106"],
+        },
+    }
+
+
+def bench_hover_wakeups(args):
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from PySide6.QtGui import QCursor
+    from PySide6.QtWidgets import QApplication
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    window = MultiPlayerApp(_player_config(tvh))
+    window.show()
+
+    class TimerCounter(QObject):
+        def __init__(self):
+            super().__init__()
+            self.total = 0
+            self.hover = 0
+            self.hover_timers = set()
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Timer:
+                self.total += 1
+                if obj in self.hover_timers:
+                    self.hover += 1
+            return False
+
+    def idle_window(counter):
+        # Let startup settle (stream loading, overlay fades), then count timer wakeups with the mouse still
+        deadline = time.perf_counter() + args.settle
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+        counter.total = counter.hover = 0
+        QApplication.instance().installEventFilter(counter)
+        deadline = time.perf_counter() + args.idle
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+        QApplication.instance().removeEventFilter(counter)
+        return counter.total / args.idle, counter.hover / args.idle
+
+    counter = TimerCounter()
+    counter.hover_timers.add(window.hover_tracker.idle_timer)
+    tracked_total, tracked_hover = idle_window(counter)
+
+    # Old behaviour: a 15 ms timer scanning every overlay, whether or not the mouse moves
+    def legacy_check_hover():
+        pos = QCursor.pos()
+        for overlay in window.overlays:
+            overlay.target_widget.mapFromGlobal(pos)
+            window.videos.index(overlay.target_widget)
+            overlay.mapFromGlobal(pos)
+
+    legacy_timer = QTimer()
+    legacy_timer.setInterval(15)
+    legacy_timer.timeout.connect(legacy_check_hover)
+    legacy_timer.start()
+    counter = TimerCounter()
+    counter.hover_timers.add(legacy_timer)
+    legacy_total, legacy_hover = idle_window(counter)
+    legacy_timer.stop()
+
+    window.close()
+
+    # Grids that aren't full: the hover hit-test and slot sizes must match where Qt put the tiles
+    misplaced = {}
+    for count in (2, 3, 5, 6):
+        config = _player_config(tvh)
+        config["stream_groups"] = {"partial": [str(102 + i) for i in range(count)]}
+        window = MultiPlayerApp(config)
+        window.resize(1920, 1080)
+        window.show()
+        deadline = time.perf_counter() + args.settle
+        while time.perf_counter() < deadline and len(window.tiles) < count:
+            app.processEvents()
+            time.sleep(0.005)
+        app.processEvents()
+        wrong = []
+        for i, tile in enumerate(window.tiles):
+            rect = tile.video.rect()
+            points = (rect.center(), rect.topLeft(), rect.bottomRight())
+            if any(window.tile_at(tile.video.mapToGlobal(p)) != i for p in points) or \
+                    abs(window.slot_height(i) - tile.pixel_size()[1]) > 1:
+                wrong.append(i)
+        misplaced[count] = wrong
+        window.close()
+    tvh.stop()
+    return {
+        "benchmark": "hover-wakeups",
+        "idle_s": args.idle,
+        "legacy_timer_events_per_s": round(legacy_total, 1),
+        "legacy_hover_wakeups_per_s": round(legacy_hover, 1),
+        "event_driven_timer_events_per_s": round(tracked_total, 1),
+        "event_driven_hover_wakeups_per_s": round(tracked_hover, 1),
+        "partial_grid_misplaced_tiles": misplaced,
+        "ok": not any(misplaced.values()),
+    }
+
+
+def bench_group_switch(args):
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    window = MultiPlayerApp(_player_config(tvh))
+    window.show()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    def all_playing():
+        return all(p.get_state() == vlc.State.Playing for p in window.players)
+
+    def legacy_setup(streams):
+        # What setup_players used to do: tear every tile down and build the group from scratch
+        for tile in window.tiles + window.tile_pool:
+            tile.player.stop()
+            window.grid_layout.removeWidget(tile.video)
+            for widget in (tile.video, tile.overlay, tile.epg_overlay, tile.chan_overlay, tile.mute_overlay):
+                widget.deleteLater()
+        window.tiles, window.tile_pool = [], []
+        pooled_setup(streams)
+
+    pooled_setup = window.setup_players
+    pump(args.settle, lambda: window.players and all_playing() and not window.stream_scheduler.busy)
+    pump(0.5)
+
+    sequence = [1, 0, 2, 0] * args.rounds
+    results = {}
+    for mode, setup in (("legacy", legacy_setup), ("pooled", pooled_setup)):
+        window.setup_players = setup
+        switch_ms, ready_ms, restarted, created = [], [], 0, 0
+        for group in sequence:
+            before = {id(p): p.get_state() for p in window.players}
+            known = {id(t.player) for t in window.tiles + window.tile_pool}
+            t0 = time.perf_counter()
+            window.switch_group(group)
+            switch_ms.append((time.perf_counter() - t0) * 1000)
+            created += sum(1 for p in window.players if id(p) not in known)
+            restarted += sum(1 for p in window.players if before.get(id(p)) != vlc.State.Playing or p.get_state() != vlc.State.Playing)
+            ready = pump(args.settle, all_playing)
+            ready_ms.append((time.perf_counter() - t0) * 1000 if ready else None)
+            pump(0.2)
+        done = [ms for ms in ready_ms if ms is not None]
+        results[mode] = {
+            "switch_call_ms": round(sum(switch_ms) / len(switch_ms), 2),
+            "all_playing_ms": round(sum(done) / len(done), 1) if done else None,
+            "players_created": created,
+            "tiles_restarted": restarted,
+        }
+    window.setup_players = pooled_setup
+
+    window.close()
+    tvh.stop()
+    return {"benchmark": "group-switch", "switches": len(sequence), **results}
+
+
+def bench_zap(args):
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    results = {}
+    for mode, depth in (("cold", 0), ("prefetched", args.zap_depth)):
+        config = _player_config(tvh)
+        config["stream_groups"] = {"1x1": ["106"]}
+        config["zap_prefetch_depth"] = depth
+        config["zap_prefetch_budget"] = args.zap_budget
+        window = MultiPlayerApp(config)
+        window.show()
+        pump(args.settle, lambda: window.players and window.players[0].get_state() == vlc.State.Playing)
+
+        zap_ms, swaps, peak_streams = [], 0, 0
+        for n in range(args.zaps):
+            # Let the prefetcher catch up, as a viewer pausing on a channel would
+            pump(args.zap_interval)
+            warm = set(window.prefetcher.warm)
+            t0 = time.perf_counter()
+            window.cycle_channel(0, 1 if n % 4 < 3 else -1)
+            swaps += window.tiles[0].url in warm
+            if pump(args.settle, lambda: window.players[0].get_state() == vlc.State.Playing):
+                zap_ms.append((time.perf_counter() - t0) * 1000)
+            peak_streams = max(peak_streams, 1 + len(window.prefetcher.warm))
+        window.close()
+        window.prefetcher.clear()
+        results[mode] = {
+            "zap_to_playing_ms": round(sum(zap_ms) / len(zap_ms), 1) if zap_ms else None,
+            "swapped_in": swaps,
+            "peak_streams": peak_streams,
+        }
+    tvh.stop()
+    return {"benchmark": "zap", "zaps": args.zaps, "depth": args.zap_depth, "budget": args.zap_budget, **results}
+
+
+def bench_tuner_admission(args):
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    config = _player_config(tvh)
+    config["tuners"] = args.tuners
+    window = MultiPlayerApp(config)
+    window.show()
+
+    deadline = time.perf_counter() + args.settle
+    while time.perf_counter() < deadline and (not window.tiles or window.stream_scheduler.busy or not window.tuners.learned):
+        app.processEvents()
+        time.sleep(0.002)
+
+    channels = [window.channel_for_url(t.url) for t in window.tiles if t.url]
+    demanded = []
+    for channel in channels:
+        mux = window.tuners.mux_for(channel)
+        if mux not in demanded:
+            demanded.append(mux)
+    # Without admission control every tile is opened and the backend refuses muxes past the tuner count
+    legacy_black = sum(1 for c in channels if demanded.index(window.tuners.mux_for(c)) >= args.tuners)
+    playing = sum(1 for t in window.tiles if t.player.get_state() == vlc.State.Playing)
+    blocked = sum(1 for t in window.tiles if t.blocked)
+    in_use = window.tuners.muxes(window.channel_for_url(t.url) for t in window.tiles if t.tuned)
+
+    window.close()
+    tvh.stop()
+    return {
+        "benchmark": "tuner-admission",
+        "tiles": len(channels),
+        "tuners": args.tuners,
+        "muxes_demanded": len(demanded),
+        "legacy_black_tiles": legacy_black,
+        "muxes_in_use": len(in_use),
+        "tiles_playing": playing,
+        "tiles_no_tuner": blocked,
+        "unexplained_black_tiles": len(channels) - playing - blocked,
+        "ok": len(in_use) <= args.tuners and len(channels) - playing - blocked == 0,
+    }
+
+
+def _ts_packet(pid, payload, cc, start=False):
+    header = bytes([0x47, (0x40 if start else 0) | pid >> 8, pid & 0xFF, 0x10 | (cc & 0x0F)])
+    return (header + payload + b"\xff" * 184)[:188]
+
+
+def _psi(table_id, body):
+    from multi_tv_player import crc32_mpeg
+    section = bytes([table_id, 0xB0 | (len(body) + 4) >> 8, (len(body) + 4) & 0xFF]) + body
+    return b"\x00" + section + crc32_mpeg(section).to_bytes(4, "big")
+
+
+def synthetic_mpts(programs, packets):
+    """Multi-program TS: program p has PMT 0x100+p, video 0x200+p (also PCR) and audio 0x300+p."""
+    pat = _psi(0x00, bytes([0, 1, 0xC1, 0, 0]) + b"".join(
+        bytes([0, p, 0xE1, p]) for p in range(1, programs + 1)))
+    pmts = {
+        p: _psi(0x02, bytes([0, p, 0xC1, 0, 0, 0xE2, p, 0xF0, 0x00,
+                             0x1B, 0xE2, p, 0xF0, 0x00, 0x03, 0xE3, p, 0xF0, 0x00]))
+        for p in range(1, programs + 1)
+    }
+    out = bytearray()
+    cc = {}
+    es_pids = [pid for p in range(1, programs + 1) for pid in (0x200 + p, 0x300 + p)]
+    for n in range(packets):
+        if n % 40 == 0:
+            out += _ts_packet(0, pat, n // 40, start=True)
+            for p, pmt in pmts.items():
+                out += _ts_packet(0x100 + p, pmt, n // 40, start=True)
+        pid = es_pids[n % len(es_pids)]
+        cc[pid] = cc.get(pid, -1) + 1
+        out += _ts_packet(pid, bytes([pid & 0xFF]) * 184, cc[pid])
+    return bytes(out)
+
+
+def check_program_stream(data, program):
+    """PIDs seen in a relayed stream, and whether every PAT in it lists just `program`."""
+    from multi_tv_player import TSProgramFilter, crc32_mpeg
+    pids, pats_ok = set(), True
+    for i in range(0, len(data) - 187, 188):
+        packet = data[i:i + 188]
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        pids.add(pid)
+        if pid == 0:
+            section = TSProgramFilter._section(packet)
+            length = ((section[1] & 0x0F) << 8) | section[2]
+            body = section[:3 + length]
+            listed = (body[8] << 8) | body[9]
+            pats_ok &= crc32_mpeg(body) == 0 and length == 13 and listed == program
+    return pids, pats_ok
+
+
+def bench_mux_relay(args):
+    import urllib.request
+    from multi_tv_player import MuxRelay, TSProgramFilter
+
+    # Raw demux speed on a 4-program mux
+    data = synthetic_mpts(4, args.packets)
+    demux = TSProgramFilter()
+    t0 = time.perf_counter()
+    for i in range(0, len(data), 188 * 348):
+        demux.feed(data[i:i + 188 * 348], (1, 2, 3))
+    demux_s = time.perf_counter() - t0
+
+    tvh = FakeTVH(args.channels).start()
+    relay = MuxRelay(tvh.url + "/stream/mux/{mux}", linger=0.5).start()
+    programs = list(range(1, tvh.channels_per_mux + 1))
+    received = {}
+
+    def watch(program):
+        with urllib.request.urlopen(relay.url_for("mux-0", program), timeout=10) as resp:
+            received[program] = resp.read()
+
+    threads = [threading.Thread(target=watch, args=(p,)) for p in programs]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    streams = {}
+    for program in programs:
+        pids, pats_ok = check_program_stream(received.get(program, b""), program)
+        streams[program] = {
+            "bytes": len(received.get(program, b"")),
+            "only_own_pids": pids <= {0, 0x100 + program, 0x200 + program, 0x300 + program},
+            "pats_ok": pats_ok,
+        }
+    relay.stop()
+    tvh.stop()
+    return {
+        "benchmark": "mux-relay",
+        "demux_packets_per_s": round(args.packets / demux_s),
+        "tiles": len(programs),
+        "legacy_upstream_connections": len(programs),
+        "relay_upstream_connections": tvh.mux_requests,
+        "streams": streams,
+    }
+
+
+def bench_stream_health(args):
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    window = MultiPlayerApp(_player_config(tvh))
+    window.show()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    pump(args.settle, lambda: window.tiles and all(
+        tile.url and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+    monitor = window.health_monitor
+    detected = {}
+    original_fail = monitor.fail
+
+    failed = []
+
+    def fail(tile, reason):
+        detected.setdefault(reason, time.perf_counter())
+        failed.append(tile)
+        original_fail(tile, reason)
+    monitor.fail = fail
+
+    # A tile still starting past the stall timeout is the scheduler's to time out, not a stall
+    slow = window.tiles[3]
+    frozen = slow.player.get_media().get_stats
+    slow.player.get_media().get_stats = lambda stats: True
+    window.stream_scheduler.in_flight[id(slow.player)] = (slow, -1)
+    pump(monitor.stall_timeout * 2.5)
+    window.stream_scheduler.in_flight.pop(id(slow.player), None)
+    slow.player.get_media().get_stats = frozen
+    slow_start_restarted = slow in failed
+    detected.clear()
+
+    results = {}
+    # One tile whose counters stop moving, one whose player reports an error
+    stalled, errored = window.tiles[1], window.tiles[2]
+    for reason, tile, inject in (
+        ("stalled", stalled, lambda t: setattr(t.player.get_media(), "get_stats", lambda stats: True)),
+        ("error", errored, lambda t: monitor.player_failed.emit(t.player, "error")),
+    ):
+        before = monitor.reconnect_count
+        t0 = time.perf_counter()
+        inject(tile)
+        pump(monitor.stall_timeout * 3, lambda: reason in detected)
+        recovered = pump(monitor.backoff_max + args.settle,
+                         lambda: monitor.reconnect_count > before and tile.player.get_state() == vlc.State.Playing)
+        results[reason] = {
+            "detect_ms": round((detected[reason] - t0) * 1000) if reason in detected else None,
+            "recovered_ms": round((time.perf_counter() - t0) * 1000) if recovered else None,
+        }
+
+    window.close()
+    tvh.stop()
+    return {
+        "benchmark": "stream-health",
+        "stall_timeout_s": monitor.stall_timeout,
+        **results,
+        "slow_start_restarted": slow_start_restarted,
+        "ok": not slow_start_restarted and all(r["recovered_ms"] is not None for r in results.values()),
+    }
+
+
+def bench_telemetry(args):
+    import urllib.request
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    window = MultiPlayerApp(_player_config(tvh))
+    window.show()
+
+    deadline = time.perf_counter() + args.settle
+    while time.perf_counter() < deadline and not (window.tiles and all(
+            tile.url and tile.player.get_state() == vlc.State.Playing for tile in window.tiles)):
+        app.processEvents()
+        time.sleep(0.002)
+
+    telemetry = window.telemetry
+    # Any free port
+    telemetry.start_server(0)
+    samples = []
+    for _ in range(args.ticks):
+        t0 = time.perf_counter()
+        telemetry.sample()
+        samples.append(time.perf_counter() - t0)
+        time.sleep(0.05)
+
+    port = telemetry.server.server_address[1]
+    t0 = time.perf_counter()
+    body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    scrape = time.perf_counter() - t0
+
+    window.close()
+    tvh.stop()
+    tick = sorted(samples)[len(samples) // 2]
+    return {
+        "benchmark": "telemetry",
+        "tiles_sampled": len(telemetry.tiles),
+        "sample_ms_per_tick": round(tick * 1000, 3),
+        "cpu_share_at_interval": f"{tick / (telemetry.timer.interval() / 1000):.5%}",
+        "scrape_ms": round(scrape * 1000, 2),
+        "metrics_lines": len(body.splitlines()),
+    }
+
+
+def bench_variants(args):
+    """Lighter streams for small tiles and the overlap handover to full quality in single fullscreen."""
+    import vlc
+    from multi_tv_player import MultiPlayerApp, VariantSelector
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels).start()
+    config = _player_config(tvh)
+    # Anything up to the height of a 3x3 tile gets the light profile
+    config["stream_profiles"] = {args.small_height: "low"}
+    window = MultiPlayerApp(config)
+    window.resize(1920, 1080)
+    window.show()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    pump(args.settle, lambda: window.tiles and all(
+        tile.tuned and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+    grid_variants = [tile.variant for tile in window.tiles]
+
+    def handover(index):
+        # Time until the tile plays the wanted variant, and how long it spent not playing
+        t0 = time.perf_counter()
+        window.toggle_single_fullscreen(index)
+        wanted = window.variants.pick(window.tiles[index].url, window.slot_height(index))[0]
+        blank = 0.0
+        last = t0
+        done = None
+        while time.perf_counter() - t0 < args.settle:
+            app.processEvents()
+            now = time.perf_counter()
+            if window.tiles[index].player.get_state() != vlc.State.Playing:
+                blank += now - last
+            last = now
+            if window.tiles[index].variant == wanted and not window.handovers:
+                done = now
+                break
+            time.sleep(0.002)
+        return {
+            "variant": window.tiles[index].variant,
+            "handover_ms": round((done - t0) * 1000, 1) if done else None,
+            "not_playing_ms": round(blank * 1000, 1),
+        }
+
+    to_full = handover(4)
+    to_grid = handover(4)
+    window.close()
+
+    # HLS: the smallest variant that still fills the tile, once the master playlist is in
+    selector = VariantSelector(None)
+    master = f"{tvh.url}/hls/5.m3u8"
+    selector.pick(master, 300)
+    pump(5, lambda: selector.masters.get(master))
+    hls = {height: selector.pick(master, height)[1].rsplit("/", 1)[-1] for height in (300, 360, 700, 1080, 2160)}
+    tvh.stop()
+    return {
+        "benchmark": "variants",
+        "grid_variants": grid_variants,
+        "to_fullscreen": to_full,
+        "back_to_grid": to_grid,
+        "profile_requests": tvh.profile_requests,
+        "hls_picks": hls,
+        "ok": all(v == "low" for v in grid_variants) and to_full["variant"] is None and to_full["not_playing_ms"] == 0,
+    }
+
+
+def bench_decoder_profiles(args):
+    """CPU of a 3x3 wall with libvlc's default decoding against the per-tile decoder profiles.
+
+    Uses a decodable test stream when ffmpeg is installed, so the difference is real decode work.
+    """
+    import tempfile
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels)
+    tvh.channel_ts = make_test_stream(tempfile.mktemp(suffix=".ts", prefix="mtp-bench-"))
+    tvh.start()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    results = {}
+    for mode, thresholds in (("default", {}), ("profiles", {args.small_height: "low", 720: "medium"})):
+        config = _player_config(tvh)
+        config["vlc_options"] = ["--vout=dummy", "--aout=dummy"]
+        config["decoder_profiles"] = thresholds
+        window = MultiPlayerApp(config)
+        # The decoder options each player's current media was built with
+        media_options = {}
+        tile_media = window.tile_media
+
+        def recording_tile_media(tile, *a, **kw):
+            media = tile_media(tile, *a, **kw)
+            media_options[id(tile.player)] = window.decoder_profiles.media_options(tile.decoder)
+            return media
+        window.tile_media = recording_tile_media
+        window.resize(1920, 1080)
+        window.show()
+        pump(args.settle, lambda: window.tiles and all(
+            tile.tuned and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+        pump(1.0)
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        pump(args.idle)
+        cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+        profiles = [tile.decoder for tile in window.tiles]
+
+        # Listening to one tile moves just that tile to full quality
+        t0 = time.perf_counter()
+        window.mute_only(4)
+        handovers = 0
+        focus_ms = None
+        deadline = time.perf_counter() + args.settle
+        while time.perf_counter() < deadline:
+            app.processEvents()
+            handovers = max(handovers, len(window.handovers))
+            if focus_ms is None and window.tiles[4].decoder == ("full" if thresholds else None) and not window.handovers:
+                focus_ms = (time.perf_counter() - t0) * 1000
+                pump(0.5)
+                break
+            time.sleep(0.002)
+        focused = window.tiles[4]
+        results[mode] = {
+            "cpu_percent": round(cpu * 100, 1),
+            "tile_profiles": profiles,
+            "focused_profile": focused.decoder,
+            "focused_media_options": media_options.get(id(focused.player)),
+            "focus_to_full_ms": round(focus_ms, 1) if focus_ms is not None and thresholds else None,
+            "focus_handovers": handovers,
+        }
+        full_options = window.decoder_profiles.media_options("full")
+        window.close()
+        pump(0.5)
+    tvh.stop()
+    return {
+        "benchmark": "decoder-profiles",
+        "decodable_stream": tvh.channel_ts is not None,
+        "idle_s": args.idle,
+        **results,
+        "ok": (results["profiles"]["focused_media_options"] == full_options
+               and results["profiles"]["focus_handovers"] <= 1
+               and results["default"]["focus_handovers"] == 0),
+    }
+
+
+def bench_visibility(args):
+    """CPU saved by the hidden-tile policy while one tile of a 3x3 wall is single-fullscreen.
+
+    Compares hidden tiles that keep playing, go warm (no video/audio decoding) and are
+    stopped, and times how long the grid takes to come back.
+    """
+    import tempfile
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels)
+    tvh.channel_ts = make_test_stream(tempfile.mktemp(suffix=".ts", prefix="mtp-bench-"))
+    tvh.start()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    def cpu_percent():
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        pump(args.idle)
+        return round((time.process_time() - cpu0) / (time.perf_counter() - wall0) * 100, 1)
+
+    def all_back(window):
+        return all(tile.player.get_state() == vlc.State.Playing and tile.player.video_get_track() != -1
+                   for tile in window.tiles)
+
+    results = {}
+    for mode in ("play", "warm", "stop"):
+        config = _player_config(tvh)
+        config["vlc_options"] = ["--vout=dummy", "--aout=dummy"]
+        config["hidden_tiles"] = mode
+        window = MultiPlayerApp(config)
+        window.show()
+        pump(args.settle, lambda: window.tiles and all(
+            tile.tuned and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+        pump(1.0)
+        grid = cpu_percent()
+        window.toggle_single_fullscreen(4)
+        pump(0.5)
+        single = cpu_percent()
+        t0 = time.perf_counter()
+        window.toggle_single_fullscreen(4)
+        restored = pump(args.settle, lambda: all_back(window))
+        restore_ms = (time.perf_counter() - t0) * 1000
+        window.close()
+        pump(0.5)
+        results[mode] = {
+            "grid_cpu_percent": grid,
+            "single_fullscreen_cpu_percent": single,
+            "restore_ms": round(restore_ms, 1) if restored else None,
+        }
+    tvh.stop()
+    baseline = results["play"]["single_fullscreen_cpu_percent"]
+    for mode in ("warm", "stop"):
+        results[mode]["cpu_saved_percent"] = round(baseline - results[mode]["single_fullscreen_cpu_percent"], 1)
+    return {"benchmark": "visibility", "decodable_stream": tvh.channel_ts is not None, "idle_s": args.idle, **results}
+
+
+def bench_muted_audio(args):
+    """CPU of a 3x3 wall with one audible tile, decoding the muted tiles' audio or not."""
+    import tempfile
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels)
+    tvh.channel_ts = make_test_stream(tempfile.mktemp(suffix=".ts", prefix="mtp-bench-"))
+    tvh.start()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    results = {}
+    for mode, decode in (("decoded", True), ("skipped", False)):
+        config = _player_config(tvh)
+        config["vlc_options"] = ["--vout=dummy", "--aout=dummy"]
+        config["decode_muted_audio"] = decode
+        window = MultiPlayerApp(config)
+        window.show()
+        pump(args.settle, lambda: window.tiles and all(
+            tile.tuned and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+        window.mute_only(4)
+        pump(1.0)
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        pump(args.idle)
+        cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+        audio_on = sum(tile.player.audio_get_track() != -1 for tile in window.tiles)
+
+        # Moving the sound around the grid, as clicking tiles does
+        unmutes = []
+        for n in range(args.rounds * 4):
+            t0 = time.perf_counter()
+            window.mute_only(n % len(window.tiles))
+            unmutes.append(time.perf_counter() - t0)
+            pump(0.1)
+        window.close()
+        pump(0.5)
+        results[mode] = {
+            "cpu_percent": round(cpu * 100, 1),
+            "tiles_decoding_audio": audio_on,
+            "mute_only_ms": _median_ms(unmutes),
+        }
+    tvh.stop()
+    return {
+        "benchmark": "muted-audio",
+        "decodable_stream": tvh.channel_ts is not None,
+        "idle_s": args.idle,
+        **results,
+        "cpu_saved_percent": round(results["decoded"]["cpu_percent"] - results["skipped"]["cpu_percent"], 1),
+    }
+
+
+def bench_governor(args):
+    """Walk the resource governor down to 'paused' and back on a 3x3 wall, with CPU at each level.
+
+    The governor's timer is off and its thresholds are moved to force pressure or headroom,
+    so each step happens on cue; the decision log comes back with the results.
+    """
+    import tempfile
+    import vlc
+    from multi_tv_player import MultiPlayerApp
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels)
+    tvh.channel_ts = make_test_stream(tempfile.mktemp(suffix=".ts", prefix="mtp-bench-"))
+    tvh.start()
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    def cpu_percent():
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        pump(args.idle)
+        return round((time.process_time() - cpu0) / (time.perf_counter() - wall0) * 100, 1)
+
+    config = _player_config(tvh)
+    config["vlc_options"] = ["--vout=dummy", "--aout=dummy"]
+    config["governor"] = False
+    window = MultiPlayerApp(config)
+    window.show()
+    pump(args.settle, lambda: window.tiles and all(
+        tile.tuned and tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+    governor = window.governor
+    # Start the CPU window from here
+    governor.sample()
+    pump(1.0)
+
+    def force(pressure, ticks):
+        governor.cpu_high, governor.cpu_low = (-2, -1) if pressure else (1e9, 1e9 - 1)
+        for _ in range(ticks):
+            pump(0.05)
+            governor.tick()
+        pump(1.0, lambda: not window.handovers)
+
+    levels = [{"level": governor.LEVELS[governor.level], "cpu_percent": cpu_percent()}]
+    # One pressured sample isn't enough to step down
+    force(True, governor.DOWN_AFTER - 1)
+    held = governor.level == 0
+    audio_back_on = None
+    while governor.level < len(governor.LEVELS) - 1:
+        force(True, governor.DOWN_AFTER)
+        levels.append({"level": governor.LEVELS[governor.level], "cpu_percent": cpu_percent()})
+        if governor.level == governor.AUDIO_OFF:
+            # Unmuting everything selects the audio tracks again; the next sample has to undo it
+            window.unmute_all()
+            pump(0.2)
+            governor.tick()
+            audio_back_on = sum(1 for tile in governor.governed() if tile.player.audio_get_track() != -1)
+    t0 = time.perf_counter()
+    while governor.level > 0:
+        force(False, governor.UP_AFTER)
+    restored = pump(args.settle, lambda: all(tile.player.get_state() == vlc.State.Playing for tile in window.tiles))
+    restore_ms = (time.perf_counter() - t0) * 1000
+    decisions = [f"{d['from']} -> {d['to']}" for d in governor.decisions]
+    window.close()
+    tvh.stop()
+    return {
+        "benchmark": "governor",
+        "decodable_stream": tvh.channel_ts is not None,
+        "idle_s": args.idle,
+        "levels": levels,
+        "hysteresis_held": held,
+        "restore_ms": round(restore_ms, 1) if restored else None,
+        "decisions": decisions,
+        "governed_with_audio_after_unmute": audio_back_on,
+        "ok": held and len(decisions) == 2 * (len(governor.LEVELS) - 1) and audio_back_on == 0,
+    }
+
+
+def _rss_bytes():
+    try:
+        import os
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def bench_e2e(args):
+    """Startup, group switch, zap, CPU and RSS per tile for each grid size, end to end.
+
+    Runs MultiPlayerApp under the offscreen Qt platform against FakeTVH, with VLC's
+    dummy video and audio outputs. Pass --output to keep the JSON for comparing releases.
+    """
+    import platform
+    import tempfile
+    import vlc
+    from multi_tv_player import MultiPlayerApp, TileLayout
+
+    app = qt_app()
+    tvh = FakeTVH(args.channels)
+    tvh.channel_ts = make_test_stream(tempfile.mktemp(suffix=".ts", prefix="mtp-bench-"))
+    decodable = tvh.channel_ts is not None
+    tvh.start()
+    # Every tenth synthetic channel (101, 111, ...) has no number
+    numbered = [str(101 + i) for i in range(args.channels) if i % 10]
+
+    def pump(seconds, until=None):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if until is not None and until():
+                return True
+            app.processEvents()
+            time.sleep(0.002)
+        return until is None
+
+    def all_playing(window):
+        return bool(window.tiles) and all(
+            tile.url and tile.player.get_state() == vlc.State.Playing for tile in window.tiles)
+
+    # Warm up once so the first grid isn't charged for Qt and libvlc initialisation
+    warmup = MultiPlayerApp({"playlist_url": tvh.url + "/playlist", "cache_dir": tempfile.mkdtemp(prefix="mtp-bench-"),
+                             "vlc_options": ["--vout=dummy", "--aout=dummy"], "stream_groups": {"a": numbered[:1]}})
+    warmup.show()
+    pump(args.settle, lambda: all_playing(warmup))
+    warmup.close()
+    pump(0.5)
+
+    grids = []
+    for spec in args.grids.split(","):
+        # "RxC" or "1+N", as in a stream group's layout
+        layout = TileLayout.build(spec, 1)
+        size = 1 + int(spec.split("+")[1]) if "+" in spec else layout.rows * layout.cols
+        # Two groups of different channels
+        config = {
+            "playlist_url": tvh.url + "/playlist",
+            "cache_dir": tempfile.mkdtemp(prefix="mtp-bench-"),
+            "fastboot": args.fastboot,
+            "vlc_options": ["--vout=dummy", "--aout=dummy"],
+            "stream_groups": {
+                "a": {"layout": spec, "channels": numbered[:size]},
+                "b": {"layout": spec, "channels": numbered[size:2 * size]},
+            },
+        }
+        rss_before = _rss_bytes()
+        t0 = time.perf_counter()
+        window = MultiPlayerApp(config)
+        window.show()
+        started = pump(args.settle, lambda: all_playing(window))
+        startup = time.perf_counter() - t0
+
+        # Steady state: everything playing, nobody touching anything
+        pump(1.0)
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        pump(args.idle)
+        cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+        rss = _rss_bytes() - rss_before
+
+        # Reflowing the wall: every tile and its overlays move
+        resizes = []
+        for w, h in ((1280, 720), (1920, 1080)) * 2:
+            t0 = time.perf_counter()
+            window.resize(w, h)
+            app.processEvents()
+            resizes.append(time.perf_counter() - t0)
+
+        switches = []
+        for n in range(args.rounds * 2):
+            t0 = time.perf_counter()
+            window.switch_group(1 - window.current_group_index)
+            if pump(args.settle, lambda: all_playing(window)):
+                switches.append(time.perf_counter() - t0)
+
+        zaps = []
+        for n in range(args.zaps):
+            t0 = time.perf_counter()
+            window.cycle_channel(0, 1)
+            if pump(args.settle, lambda: window.tiles[0].player.get_state() == vlc.State.Playing):
+                zaps.append(time.perf_counter() - t0)
+            pump(0.2)
+
+        latency = window.latency.summary()["actions"]
+        window.close()
+        pump(0.5)
+        grids.append({
+            "grid": spec,
+            "tiles": size,
+            "startup_s": round(startup, 3) if started else None,
+            "group_switch_ms": _median_ms(switches),
+            "zap_ms": _median_ms(zaps),
+            "resize_ms": _median_ms(resizes),
+            "first_frame_p50_ms": {action: data["first_frame"]["p50_ms"] for action, data in latency.items()},
+            "cpu_percent_per_tile": round(cpu * 100 / size, 2),
+            "rss_mb_per_tile": round(rss / size / 2 ** 20, 1),
+        })
+
+    tvh.stop()
+    return {
+        "benchmark": "e2e",
+        "meta": {
+            "time": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "libvlc": vlc.libvlc_get_version().decode(errors="replace"),
+            "decodable_stream": decodable,
+        },
+        "grids": grids,
+    }
+
+
+def _median_ms(samples):
+    if not samples:
+        return None
+    return round(sorted(samples)[len(samples) // 2] * 1000, 1)
+
+
+def bench_import_time(args):
+    """Cost of `import multi_tv_player` in a fresh interpreter; fails past --max-import-ms.
+
+    Also fails if a module meant to be loaded lazily gets imported eagerly again.
+    """
+    import os
+    import subprocess
+    lazy = ["vlc", "requests", "PIL.Image", "screeninfo", "sqlite3", "pickle"]
+    probe = f"import sys, multi_tv_player; print([m for m in {lazy!r} if m in sys.modules])"
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+
+    totals = []
+    modules = {}
+    eager = []
+    for _ in range(args.rounds):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                              capture_output=True, text=True, env=env, check=True)
+        eager = json.loads(proc.stdout.strip().replace("'", '"'))
+        children = {}
+        for line in proc.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package", nesting shown by indentation
+            match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+            if not match:
+                continue
+            cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            if depth == 2:
+                children[name] = cumulative
+            elif depth == 0:
+                # Children are listed before their parent
+                if name == "multi_tv_player":
+                    totals.append(cumulative / 1000)
+                    for child, us in children.items():
+                        modules[child] = min(modules.get(child, us), us)
+                children = {}
+
+    total = min(totals)
+    return {
+        "benchmark": "import-time",
+        "import_ms": round(total, 1),
+        "max_import_ms": args.max_import_ms,
+        "heaviest": {name: round(us / 1000, 1) for name, us in sorted(modules.items(), key=lambda kv: -kv[1])[:8]},
+        "eager_lazy_modules": eager,
+        "ok": total <= args.max_import_ms and not eager,
+    }
+
+
+def _build_store(cls, events):
+    store = cls()
+    store.merge(events)
+    return store
+
+
+BENCHMARKS = {
+    "epg-sync": bench_epg_sync,
+    "epg-store": bench_epg_store,
+    "epg-cache": bench_epg_cache,
+    "m3u-parse": bench_m3u_parse,
+    "channel-index": bench_channel_index,
+    "dropdown-epg": bench_dropdown_epg,
+    "hover-wakeups": bench_hover_wakeups,
+    "group-switch": bench_group_switch,
+    "zap": bench_zap,
+    "tuner-admission": bench_tuner_admission,
+    "mux-relay": bench_mux_relay,
+    "stream-health": bench_stream_health,
+    "telemetry": bench_telemetry,
+    "variants": bench_variants,
+    "decoder-profiles": bench_decoder_profiles,
+    "visibility": bench_visibility,
+    "muted-audio": bench_muted_audio,
+    "governor": bench_governor,
+    "e2e": bench_e2e,
+    "import-time": bench_import_time,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="multi-tv-player benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--channels", type=int, default=300)
+    parser.add_argument("--watched", type=int, default=9)
+    parser.add_argument("--duration", type=int, default=2 * 3600, help="simulated seconds")
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--tiles", type=int, default=9)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--settle", type=float, default=16.0, help="seconds to wait before measuring idle")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--zaps", type=int, default=8)
+    parser.add_argument("--tuners", type=int, default=2)
+    parser.add_argument("--packets", type=int, default=200000, help="TS packets to push through the demuxer")
+    parser.add_argument("--zap-interval", type=float, default=2.0, help="seconds spent on each channel")
+    parser.add_argument("--zap-depth", type=int, default=1)
+    parser.add_argument("--zap-budget", type=int, default=2)
+    parser.add_argument("--small-height", type=int, default=400, help="tallest tile given the light profile")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds of idle to measure")
+    parser.add_argument("--grids", default="1x1,2x2,3x3,4x4,5x5,1+5", help="comma-separated layouts for e2e")
+    parser.add_argument("--fastboot", action="store_true", help="start every e2e stream at once")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--max-import-ms", type=float, default=250.0, help="import-time budget")
+    args = parser.parse_args(argv)
+    result = BENCHMARKS[args.benchmark](args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    # Checks report ok: false and exit non-zero so CI can catch regressions
+    return 1 if result.get("ok") is False else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
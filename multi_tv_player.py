@@ -1,16 +1,52 @@
+import time
+PROCESS_START = time.perf_counter()
+
 import sys
 import os
 import math
 from pathlib import Path
 from datetime import datetime
-import requests
+import importlib
 import re
+import json
+import threading
+import queue
+import bisect
+import gc
+from array import array
+from collections import namedtuple, deque
+from urllib.parse import urlsplit, urlunsplit, urljoin, urlencode, parse_qsl, quote, unquote
 import yaml
 import random
+import copy
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Keeps heavy imports (libvlc, requests, the caches' sqlite3 and pickle) off the path
+    to the first window paint; PIL and screeninfo are imported where they're used.
+    """
 
-import vlc
-from screeninfo import get_monitors
-from PIL import Image
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return getattr(module, attr)
+
+
+vlc = LazyModule('vlc')
+requests = LazyModule('requests')
+sqlite3 = LazyModule('sqlite3')
+pickle = LazyModule('pickle')
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QGridLayout, QFrame,
@@ -19,9 +55,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import (
     Qt, QTimer, QObject, QEvent, QPropertyAnimation, QPoint,
-    QParallelAnimationGroup, QRect, Signal
+    QParallelAnimationGroup, QRect, Signal, QAbstractListModel, QModelIndex
 )
-from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut, QKeyEvent, QCursor, QPainter
+from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut, QKeyEvent, QCursor, QPainter, QPixmap
 
 # --- Configuration Loading Function ---
 def load_config(config_filename="config.yaml", example_config_filename="example_config.yaml"):
@@ -41,25 +77,40 @@ def load_config(config_filename="config.yaml", example_config_filename="example_
 
 
 class OutlinedLabel(QLabel):
+    # The outline is 48 offset copies of the text; render each text/size once, shared by every label
+    _outline_cache = {}
+
     def paintEvent(self, event):
+        ratio = self.devicePixelRatioF()
+        key = (self.text(), self.width(), self.height(), self.font().key(), int(self.alignment()), ratio)
+        outline = self._outline_cache.get(key)
+        if outline is None:
+            if len(self._outline_cache) > 256:
+                self._outline_cache.clear()
+            outline = self._outline_cache[key] = QPixmap(self.size() * ratio)
+            outline.setDevicePixelRatio(ratio)
+            outline.fill(Qt.transparent)
+            painter = QPainter(outline)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.TextAntialiasing)
+            
+            text = self.text()
+            rect = self.rect()
+            align = self.alignment()
+            
+            painter.setPen(Qt.black)
+            painter.setFont(self.font())
+            
+            outline_width = 3
+            for dx in range(-outline_width, outline_width + 1):
+                for dy in range(-outline_width, outline_width + 1):
+                    if dx == 0 and dy == 0:
+                        continue
+                    painter.drawText(rect.translated(dx, dy), align, text)
+            painter.end()
+            
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.TextAntialiasing)
-        
-        text = self.text()
-        rect = self.rect()
-        align = self.alignment()
-        
-        painter.setPen(Qt.black)
-        painter.setFont(self.font())
-        
-        outline_width = 3
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx == 0 and dy == 0:
-                    continue
-                painter.drawText(rect.translated(dx, dy), align, text)
-                
+        painter.drawPixmap(0, 0, outline)
         painter.end()
         super().paintEvent(event)
 
@@ -197,6 +248,84 @@ class MuteOverlay(ChannelOverlay):
         self.move(x, y)
 
 
+class TileStatusOverlay(MuteOverlay):
+    """Stays over a tile while its stream is unhealthy (stalled, reconnecting), wipes away once it recovers."""
+
+    def __init__(self, master_app, target_widget):
+        super().__init__(master_app, target_widget)
+        self.status = None
+        self.label.setStyleSheet("""
+            QLabel {
+                background-color: transparent;
+                color: #ff9b3d;
+                font-family: 'Arial Rounded MT Bold', 'Helvetica Rounded', 'Arial Black', sans-serif;
+                font-size: 28px;
+                font-weight: bold;
+            }
+        """)
+
+    def show_status(self, text):
+        self.status = text
+        self.label.setText(text)
+        if not self.target_widget.isVisible() or self.target_widget.width() == 0:
+            return
+        self.anim_group.stop()
+        self.hide_timer.stop()
+        self.clip_widget.setGeometry(20, 20, 180, 100)
+        self.label.setGeometry(0, 0, 180, 100)
+        self.update_position()
+        self.show()
+        self.raise_()
+
+    def clear_status(self):
+        if self.status is None:
+            return
+        self.status = None
+        if self.isVisible():
+            self.start_wipe()
+
+    def update_position(self):
+        if not self.target_widget.isVisible() or self.target_widget.width() == 0:
+            return
+        self.move(self.target_widget.mapToGlobal(QPoint(30, max(0, self.target_widget.height() - 160))))
+
+
+class StatsOverlay(QLabel):
+    """Small live readout of a tile's playback stats, toggled with I."""
+
+    def __init__(self, master_app, target_widget):
+        super().__init__(master_app)
+        self.target_widget = target_widget
+        self.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowTransparentForInput | Qt.WindowDoesNotAcceptFocus)
+        self.setAttribute(Qt.WA_ShowWithoutActivating, True)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: rgba(0, 0, 0, 170);
+                color: #9fe89f;
+                font-family: Consolas, 'DejaVu Sans Mono', monospace;
+                font-size: 12px;
+                padding: 6px;
+            }
+        """)
+
+    def show_stats(self, text):
+        if self.text() != text:
+            self.setText(text)
+            self.adjustSize()
+        if not self.target_widget.isVisible() or self.target_widget.width() == 0:
+            self.hide()
+            return
+        self.update_position()
+        if not self.isVisible():
+            self.show()
+            self.raise_()
+
+    def update_position(self):
+        if not self.target_widget.isVisible() or self.target_widget.width() == 0:
+            return
+        self.move(self.target_widget.mapToGlobal(QPoint(self.target_widget.width() - self.width() - 10, 10)))
+
+
 class OverlayControls(QWidget):
     def __init__(self, master_app, target_widget, player, index):
         super().__init__(master_app)
@@ -260,6 +389,12 @@ class OverlayControls(QWidget):
         self.channel_dropdown.wheelEvent = lambda event: event.ignore()
         self.channel_dropdown.setMaxVisibleItems(30)
         
+        # All tiles share one model; don't let each combo measure every row to size itself
+        self.channel_dropdown.setModel(self.master_app.channel_model)
+        self.channel_dropdown.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.channel_dropdown.setMinimumContentsLength(28)
+        self.channel_dropdown.view().setUniformItemSizes(True)
+        
         # Fix dropdown rendering behind the main window when "Always on Top" is active
         popup = self.channel_dropdown.view().window()
         popup.setWindowFlags(popup.windowFlags() | Qt.WindowStaysOnTopHint)
@@ -284,26 +419,7 @@ class OverlayControls(QWidget):
             }
         """)
         
-        try:
-            sorted_channels = sorted(
-                self.master_app.channels_by_number.items(), 
-                key=lambda item: int(item[0]) if str(item[0]).isdigit() else 999999
-            )
-        except Exception:
-            sorted_channels = self.master_app.channels_by_number.items()
-            
-        for num, data in sorted_channels:
-            name, url = data
-            self.channel_dropdown.addItem(f"{num} - {name}", str(num))
-            
-        current_streams = self.master_app.stream_groups[self.master_app.current_group_index]
-        if self.index < len(current_streams):
-            current_url = current_streams[self.index][1]
-            for idx in range(self.channel_dropdown.count()):
-                num = self.channel_dropdown.itemData(idx)
-                if num in self.master_app.channels_by_number and self.master_app.channels_by_number[num][1] == current_url:
-                    self.channel_dropdown.setCurrentIndex(idx)
-                    break
+        self.sync_channel_selection()
                     
         self.channel_dropdown.currentIndexChanged.connect(self.on_channel_dropdown_changed)
         
@@ -316,9 +432,6 @@ class OverlayControls(QWidget):
         layout.addWidget(self.prev_btn)
         layout.addWidget(self.next_btn)
         
-        if hasattr(self.master_app, 'epg_data'):
-            self.update_epg_labels(self.master_app.epg_data)
-        
         self.anim = QPropertyAnimation(self, b"windowOpacity")
         self.anim.setDuration(250)
         self.anim.finished.connect(self._on_anim_finished)
@@ -360,6 +473,9 @@ class OverlayControls(QWidget):
 
     def set_mute_ui(self, muted):
         self.player.audio_set_mute(muted)
+        self.master_app.set_audio_decoding(self.player, not muted)
+        # Focus moved: once the clicks settle the watched tile moves to full decoding (see refresh_streams)
+        self.master_app.refresh_variants()
         self.mute_btn.setText(f"{'🔇' if muted else '🔊'} [{'OFF' if muted else 'ON'}]")
 
     def toggle_subtitles(self):
@@ -406,89 +522,33 @@ class OverlayControls(QWidget):
         
     def on_random_channel_clicked(self):
         try:
-            channels = list(self.master_app.channels_by_number.items())
-            if not channels: return
-            random_channel = random.choice(channels)
-            
-            # Use cycle_channel's underlying logic but directly switch to this channel
-            # Find the index of this random channel in the sorted list
-            sorted_channels = sorted(
-                self.master_app.channels_by_number.items(), 
-                key=lambda item: int(item[0]) if str(item[0]).isdigit() else 999999
-            )
-            random_sorted_idx = -1
-            for idx, (num, data) in enumerate(sorted_channels):
-                if num == random_channel[0]:
-                    random_sorted_idx = idx
-                    break
-                    
-            if random_sorted_idx != -1:
-                # To simulate cycling to this specific index, we can compute the direction jump
-                # Or just manually switch it as on_channel_dropdown_changed does
-                channel_num = random_channel[0]
-                channel_data = random_channel[1]
-                
-                # Update the player media
-                media = self.master_app.create_media(channel_data[0], channel_data[1])
-                self.player.set_media(media)
-                self.player.play()
-                
-                # Update the master_app's stream state
-                current_streams = self.master_app.stream_groups[self.master_app.current_group_index]
-                if self.index < len(current_streams):
-                    current_streams[self.index] = channel_data
-                    
-                    # Update EPG if we have one
-                    if hasattr(self.master_app, 'epg_overlays') and self.index < len(self.master_app.epg_overlays):
-                        self.master_app.epg_overlays[self.index].channel_name = channel_data[0]
-                        epg_data = getattr(self.master_app, 'epg_data', {})
-                        self.master_app.epg_overlays[self.index].update_data(epg_data.get(channel_data[0], {}))
-                        
-                if hasattr(self.master_app, 'all_groups_labels'):
-                    try:
-                        one_by_one_idx = self.master_app.all_groups_labels.index('1x1')
-                        if self.master_app.current_group_index == one_by_one_idx:
-                            self.master_app.stream_groups[one_by_one_idx] = [channel_data]
-                    except ValueError:
-                        pass
-                        
-                # Update Top Left Number
-                if self.index < len(self.master_app.channel_overlays):
-                    self.master_app.channel_overlays[self.index].real_channel_number = str(channel_num)
-                    self.master_app.channel_overlays[self.index].show_number()
-                    
-                # Update Dropdown UI
-                self.channel_dropdown.blockSignals(True)
-                for idx in range(self.channel_dropdown.count()):
-                    num = self.channel_dropdown.itemData(idx)
-                    if num == str(channel_num):
-                        self.channel_dropdown.setCurrentIndex(idx)
-                        break
-                self.channel_dropdown.blockSignals(False)
+            picked = self.master_app.channel_index.random()
+            if picked:
+                self.master_app.tune_tile(self.index, picked[0])
         except Exception as e:
             print(f"Error picking random channel: {e}")
 
-    def update_epg_labels(self, epg_data):
+    def sync_channel_selection(self):
+        current_streams = self.master_app.stream_groups[self.master_app.current_group_index]
+        if self.index < len(current_streams):
+            position = self.master_app.channel_index.position_by_url.get(current_streams[self.index].url)
+            if position is not None:
+                self.select_channel(position)
+
+    def select_channel(self, position):
+        # Dropdown rows are in ChannelIndex order, so the position is the row
         self.channel_dropdown.blockSignals(True)
-        for idx in range(self.channel_dropdown.count()):
-            channel_num = self.channel_dropdown.itemData(idx)
-            channel_data = self.master_app.channels_by_number.get(str(channel_num))
-            if channel_data:
-                channel_name = channel_data[0]
-                show_info = epg_data.get(channel_name, {})
-                now_title = show_info.get('now_title', '')
-                
-                if now_title and now_title != "No Title":
-                    new_text = f"{channel_num} - {channel_name} ({now_title})"
-                else:
-                    new_text = f"{channel_num} - {channel_name}"
-                self.channel_dropdown.setItemText(idx, new_text)
+        self.channel_dropdown.setCurrentIndex(position)
         self.channel_dropdown.blockSignals(False)
 
     def update_position(self):
         if not self.target_widget.isVisible() or self.target_widget.width() == 0:
             return
         
+        # Keep the bar inside small tiles on big walls
+        contents = 28 if self.target_widget.width() >= 560 else 12
+        if self.channel_dropdown.minimumContentsLength() != contents:
+            self.channel_dropdown.setMinimumContentsLength(contents)
         self.adjustSize()
         rect = self.target_widget.geometry()
         top_left = self.target_widget.mapToGlobal(QPoint(0, 0))
@@ -521,38 +581,7 @@ class OverlayControls(QWidget):
         channel_num = self.channel_dropdown.itemData(index)
         
         try:
-            channel_data = self.master_app.channels_by_number[str(channel_num)]
-            
-            # Update the player media
-            media = self.master_app.create_media(channel_data[0], channel_data[1])
-            self.player.set_media(media)
-            self.player.play()
-            
-            # Update the master_app's stream state
-            current_streams = self.master_app.stream_groups[self.master_app.current_group_index]
-            if self.index < len(current_streams):
-                current_streams[self.index] = channel_data
-                
-                # Update EPG if we have one
-                if hasattr(self.master_app, 'epg_overlays') and self.index < len(self.master_app.epg_overlays):
-                    self.master_app.epg_overlays[self.index].channel_name = channel_data[0]
-                    epg_data = getattr(self.master_app, 'epg_data', {})
-                    self.master_app.epg_overlays[self.index].update_data(epg_data.get(channel_data[0], {}))
-            
-            # If we're in 1x1 preset, we should probably also update the preset array so it remembers
-            if hasattr(self.master_app, 'all_groups_labels'):
-                try:
-                    one_by_one_idx = self.master_app.all_groups_labels.index('1x1')
-                    if self.master_app.current_group_index == one_by_one_idx:
-                        self.master_app.stream_groups[one_by_one_idx] = [channel_data]
-                except ValueError:
-                    pass
-                    
-            # Update Top Left Number
-            if self.index < len(self.master_app.channel_overlays):
-                self.master_app.channel_overlays[self.index].real_channel_number = str(channel_num)
-                self.master_app.channel_overlays[self.index].show_number()
-                    
+            self.master_app.tune_tile(self.index, channel_num, action='dropdown')
         except Exception as e:
             print(f"Error switching channel: {e}")
 
@@ -598,7 +627,15 @@ class SmoothProgressBar(QWidget):
         self.update_timer = QTimer(self)
         self.update_timer.setInterval(1000)
         self.update_timer.timeout.connect(self.update)
+
+    def showEvent(self, event):
+        # Only tick while someone can see the countdown
         self.update_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.update_timer.stop()
+        super().hideEvent(event)
 
     def set_fullscreen(self, is_fs):
         self.is_fs = is_fs
@@ -626,7 +663,6 @@ class SmoothProgressBar(QWidget):
             painter.end()
             return
             
-        import time
         now = int(time.time())
         total = self.stop_ts - self.start_ts
         elapsed = now - self.start_ts
@@ -738,11 +774,16 @@ class EPGOverlay(QWidget):
         
         self.anim = QPropertyAnimation(self.opacity_effect, b"opacity")
         self.anim.setDuration(300)
+        self.anim.finished.connect(self._on_anim_finished)
+
+    def _on_anim_finished(self):
+        if self.opacity_effect.opacity() == 0.0:
+            self.hide()
 
     def windowOpacity(self):
         return self.opacity_effect.opacity()
         
-    def update_fonts(self, is_single_fs):
+    def update_fonts(self, is_single_fs, width=600):
         self.now_label.setWordWrap(True)
         self.next_label.setWordWrap(True)
         if is_single_fs:
@@ -752,7 +793,7 @@ class EPGOverlay(QWidget):
             self.progress_bar.set_fullscreen(True)
             self.next_label.setStyleSheet("font-size: 19px; color: #aaaaaa; border: none; padding: 0px; margin: 0px; background: transparent;")
         else:
-            self.setFixedWidth(600)
+            self.setFixedWidth(width)
             self.now_label.setStyleSheet("font-weight: bold; font-size: 15px; color: white; border: none; padding: 0px; margin: 0px; background: transparent;")
             self.desc_label.setStyleSheet("font-size: 13px; color: #dddddd; border: none; padding: 0px; margin: 0px; background: transparent;")
             self.progress_bar.set_fullscreen(False)
@@ -763,15 +804,18 @@ class EPGOverlay(QWidget):
             return
             
         is_fs = getattr(self.master_app, 'single_fs_active', False)
-        fs_changed = not hasattr(self, 'last_is_fs') or self.last_is_fs != is_fs
-        self.last_is_fs = is_fs
+        # Small tiles on big walls get a narrower panel; restyling is only needed when this changes
+        width = min(600, max(200, self.target_widget.width() - 20))
+        restyle = getattr(self, 'last_style', None) != (is_fs, width)
+        self.last_style = (is_fs, width)
         
-        self.update_fonts(is_fs)
+        if restyle:
+            self.update_fonts(is_fs, width)
             
         rect = self.target_widget.geometry()
         top_left = self.target_widget.mapToGlobal(QPoint(0, 0))
         
-        if fs_changed:
+        if restyle:
             self.layout.invalidate()
             h = self.layout.heightForWidth(self.width()) if self.layout.hasHeightForWidth() else self.layout.sizeHint().height()
             self.setFixedHeight(h)
@@ -859,14 +903,264 @@ class EPGOverlay(QWidget):
 from PySide6.QtCore import QThread, Signal
 from datetime import datetime
 
+class ChannelSchedule:
+    __slots__ = ('name', 'event_ids', 'starts', 'stops', 'titles', 'descs')
+
+    def __init__(self, name):
+        self.name = name
+        self.event_ids = array('q')
+        self.starts = array('q')
+        self.stops = array('q')
+        self.titles = []
+        self.descs = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def rows(self):
+        return zip(self.event_ids, self.starts, self.stops, self.titles, self.descs)
+
+    def load(self, rows):
+        # rows: iterable of (event_id, start, stop, title, desc), stored sorted by start
+        rows = sorted(rows, key=lambda r: r[1])
+        self.event_ids = array('q', [r[0] for r in rows])
+        self.starts = array('q', [r[1] for r in rows])
+        self.stops = array('q', [r[2] for r in rows])
+        self.titles = [r[3] for r in rows]
+        self.descs = [r[4] for r in rows]
+
+    def event(self, i):
+        return {'start': self.starts[i], 'stop': self.stops[i], 'title': self.titles[i], 'desc': self.descs[i]}
+
+    def index_at(self, ts):
+        i = bisect.bisect_right(self.starts, ts) - 1
+        if i >= 0 and self.stops[i] > ts:
+            return i
+        return -1
+
+
+class EPGStore:
+    """In-memory EPG keyed by channel UUID, with per-channel start-sorted arrays.
+
+    Channel names and numbers are kept as aliases so lookups work with whatever
+    identifier the caller has. Now/next and "on at time T" queries are bisects.
+    """
+
+    def __init__(self):
+        self.channels = {}
+        self.aliases = {}
+
+    def __len__(self):
+        return sum(len(sched) for sched in self.channels.values())
+
+    def resolve(self, channel):
+        if channel in self.channels:
+            return channel
+        return self.aliases.get(channel)
+
+    def schedule(self, channel):
+        key = self.resolve(channel)
+        return self.channels.get(key) if key is not None else None
+
+    @staticmethod
+    def _row(event):
+        title = event.get('title') or 'No Title'
+        desc = event.get('subtitle', '') or event.get('description', '') or ''
+        # Titles and descriptions repeat a lot across a multi-day schedule
+        return (int(event.get('eventId', 0)), int(event['start']), int(event['stop']), sys.intern(title), sys.intern(desc))
+
+    def _group(self, events):
+        grouped = {}
+        for event in events:
+            name = event.get('channelName', '')
+            key = event.get('channelUuid') or name
+            if key not in self.channels:
+                self.channels[key] = ChannelSchedule(name)
+            if name:
+                self.aliases[name] = key
+            if event.get('channelNumber'):
+                self.aliases[str(event['channelNumber'])] = key
+            grouped.setdefault(key, []).append(self._row(event))
+        return grouped
+
+    def merge(self, events):
+        for key, rows in self._group(events).items():
+            sched = self.channels[key]
+            # Events without an id are deduplicated on their start time
+            merged = {r[0] or ('start', r[1]): r for r in sched.rows()}
+            for r in rows:
+                merged[r[0] or ('start', r[1])] = r
+            sched.load(merged.values())
+
+    def replace_channel(self, channel, events):
+        key = self.resolve(channel)
+        if key is not None:
+            self.channels[key].load([])
+        self.merge(events)
+
+    def replace_all(self, events):
+        self.channels = {}
+        self.aliases = {}
+        self.merge(events)
+
+    def drop_before(self, ts):
+        # Programmes don't overlap, so stop times are sorted as well
+        for sched in self.channels.values():
+            cut = bisect.bisect_right(sched.stops, ts)
+            if cut:
+                del sched.event_ids[:cut], sched.starts[:cut], sched.stops[:cut], sched.titles[:cut], sched.descs[:cut]
+
+    def horizon(self, channel=None):
+        # Start of the last programme held, for one channel or the furthest of any
+        if channel is not None:
+            sched = self.channels.get(channel)
+            return sched.starts[-1] if sched is not None and len(sched) else 0
+        return max((sched.starts[-1] for sched in self.channels.values() if len(sched)), default=0)
+
+    def at(self, channel, ts):
+        sched = self.schedule(channel)
+        if sched is None:
+            return None
+        i = sched.index_at(ts)
+        return sched.event(i) if i >= 0 else None
+
+    def now_next(self, channel, ts):
+        sched = self.schedule(channel)
+        if sched is None:
+            return None, None
+        i = bisect.bisect_right(sched.starts, ts) - 1
+        now_event = sched.event(i) if i >= 0 and sched.stops[i] > ts else None
+        next_event = sched.event(i + 1) if i + 1 < len(sched) else None
+        return now_event, next_event
+
+    def next_boundary(self, channel, ts):
+        sched = self.schedule(channel)
+        if sched is None:
+            return None
+        i = bisect.bisect_right(sched.starts, ts) - 1
+        if i >= 0 and sched.stops[i] > ts:
+            return sched.stops[i]
+        return sched.starts[i + 1] if i + 1 < len(sched) else None
+
+
+class EPGCache:
+    """SQLite copy of the EPGStore so overlays can be filled before TVHeadend answers."""
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path, max_days=7, max_events=200000):
+        self.path = Path(path)
+        self.max_days = max_days
+        self.max_events = max_events
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            # Old or unknown layout: it's only a cache, so start again
+            conn.executescript("""
+                DROP TABLE IF EXISTS channels;
+                DROP TABLE IF EXISTS aliases;
+                DROP TABLE IF EXISTS events;
+                CREATE TABLE channels (key TEXT PRIMARY KEY, name TEXT);
+                CREATE TABLE aliases (alias TEXT PRIMARY KEY, key TEXT);
+                CREATE TABLE events (key TEXT, event_id INTEGER, start INTEGER, stop INTEGER, title TEXT, descr TEXT);
+                CREATE INDEX events_key_start ON events (key, start);
+            """)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        return conn
+
+    def load(self, store, now):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            print(f"EPG cache unavailable: {e}")
+            return 0
+        try:
+            conn.execute("DELETE FROM events WHERE stop <= ?", (now,))
+            conn.commit()
+            for key, name in conn.execute("SELECT key, name FROM channels"):
+                store.channels[key] = ChannelSchedule(name)
+            store.aliases.update(conn.execute("SELECT alias, key FROM aliases"))
+            rows = {}
+            for key, event_id, start, stop, title, descr in conn.execute(
+                    "SELECT key, event_id, start, stop, title, descr FROM events ORDER BY key, start"):
+                rows.setdefault(key, []).append((event_id, start, stop, sys.intern(title), sys.intern(descr)))
+            for key, channel_rows in rows.items():
+                if key in store.channels:
+                    store.channels[key].load(channel_rows)
+            return len(store)
+        except sqlite3.Error as e:
+            print(f"EPG cache read failed: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def save(self, store, now, keys=None):
+        """Write the store out; with `keys` only those channels are replaced in the cache."""
+        cutoff = now + self.max_days * 86400
+        channels = store.channels if keys is None else {k: store.channels[k] for k in keys if k in store.channels}
+        rows = [(key, *row) for key, sched in channels.items() for row in sched.rows()
+                if row[2] > now and row[1] < cutoff]
+        if keys is None and len(rows) > self.max_events:
+            # Keep the programmes closest to now across all channels
+            rows.sort(key=lambda r: r[2])
+            del rows[self.max_events:]
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            print(f"EPG cache unavailable: {e}")
+            return
+        try:
+            with conn:
+                if keys is None:
+                    conn.execute("DELETE FROM channels")
+                    conn.execute("DELETE FROM aliases")
+                    conn.execute("DELETE FROM events")
+                else:
+                    # A targeted refresh: the rest of the cache is still current
+                    conn.executemany("DELETE FROM events WHERE key = ?", [(k,) for k in channels])
+                conn.executemany("INSERT OR REPLACE INTO channels VALUES (?, ?)", [(k, sched.name) for k, sched in channels.items()])
+                conn.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?)", list(store.aliases.items()))
+                conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"EPG cache write failed: {e}")
+        finally:
+            conn.close()
+
+
 class EPGFetcher(QThread):
     data_ready = Signal(dict)
+    # Channels whose schedule runs out sooner than this are topped up on their own
+    SHORT_SCHEDULE = 24 * 3600
     
-    def __init__(self, tvh_url="http://192.168.1.73:9981"):
+    def __init__(self, tvh_url="http://192.168.1.73:9981", page_size=500, max_interval=600,
+                 full_refresh_interval=3600, boundary_lead=5, cache=None):
         super().__init__()
         self.tvh_url = tvh_url
+        self.cache = cache
         self.running = True
         
+        # Sync tuning: events are pulled in pages, a full resync happens rarely and
+        # between those we only ask for schedule data beyond what we already hold.
+        self.page_size = page_size
+        self.max_interval = max_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.boundary_lead = boundary_lead
+        
+        self.store = EPGStore()
+        # Short channels TVHeadend had nothing more for; asked again after the next full sync
+        self.exhausted = set()
+        self.last_full_sync = None
+        self.last_window_sync = None
+        self.last_emitted = None
+        self.request_count = 0
+        self.watched_channels = set()
+        self._prefetched = {}        # channel -> boundary we already refreshed it for
+        self._wake = threading.Event()
+        self._session = None
+        
     def format_time(self, ts):
         return datetime.fromtimestamp(ts).strftime('%H:%M')
         
@@ -877,244 +1171,2396 @@ class EPGFetcher(QThread):
         progress = int((elapsed / total) * length)
         progress = min(max(progress, 0), length - 1)
         return '[' + '=' * progress + '>' + '.' * (length - progress - 1) + ']'
+
+    def load_cache(self, now):
+        # First thing the thread does: a week of guide for a big lineup takes a while to read,
+        # which the window shouldn't wait for; the overlays fill in from data_ready
+        if self.cache is None:
+            return
+        count = self.cache.load(self.store, now)
+        if count:
+            print(f"Loaded {count} EPG events from cache")
+            self.emit_now_next(now)
+
+    def set_watched_channels(self, channel_names):
+        # Called from the GUI thread whenever the visible channels change
+        watched = set(n for n in channel_names if n)
+        if watched != self.watched_channels:
+            self.watched_channels = watched
+            self._wake.set()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
+    def _get(self, params):
+        if self._session is None:
+            self._session = requests.Session()
+        self.request_count += 1
+        resp = self._session.get(f"{self.tvh_url}/api/epg/events/grid", params=params, timeout=5)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _fetch_pages(self, params=None):
+        entries = []
+        start = 0
+        while True:
+            page_params = dict(params or {})
+            page_params.update({"start": start, "limit": self.page_size})
+            payload = self._get(page_params)
+            page = payload.get('entries', [])
+            entries.extend(page)
+            start += len(page)
+            total = payload.get('totalCount', 0)
+            if len(page) < self.page_size or start >= total:
+                return entries
+
+    def sync_full(self, now):
+        self.store.replace_all(self._fetch_pages())
+        self.exhausted.clear()
+        self.last_full_sync = now
+        self.last_window_sync = now
+
+    @staticmethod
+    def _after(ts):
+        return json.dumps([{"field": "start", "type": "numeric", "value": ts, "comparison": "gt"}])
+
+    def sync_window(self, now):
+        # Only ask for events starting after the newest one we already have
+        self.store.merge(self._fetch_pages({"filter": self._after(self.store.horizon())}))
+        # A channel whose schedule ends early would never get the gap filled in by that, so
+        # those ask for their own; one that comes back empty isn't asked again until the
+        # next full sync, so a channel with no more guide data doesn't cost a request each time
+        for key in list(self.store.channels):
+            horizon = self.store.horizon(key)
+            if key in self.exhausted or horizon >= now + self.SHORT_SCHEDULE:
+                continue
+            events = self._fetch_pages({"channel": key, "filter": self._after(horizon)})
+            if events:
+                self.store.merge(events)
+            else:
+                self.exhausted.add(key)
+        self.last_window_sync = now
+
+    def sync_channels(self, channel_names):
+        refreshed = set()
+        for cname in channel_names:
+            key = self.store.resolve(cname) or cname
+            self.store.replace_channel(cname, self._fetch_pages({"channel": key}))
+            refreshed.add(self.store.resolve(cname) or key)
+        return refreshed
+
+    def build_now_next(self, now):
+        parsed_epg = {}
+        for sched in self.store.channels.values():
+            i = bisect.bisect_right(sched.starts, now) - 1
+            now_event = sched.event(i) if i >= 0 and sched.stops[i] > now else None
+            next_event = sched.event(i + 1) if i + 1 < len(sched) else None
+            if not (now_event or next_event):
+                continue
+                
+            cname = sched.name
+            parsed_epg[cname] = {}
+            if now_event:
+                parsed_epg[cname]['now_title'] = now_event['title']
+                parsed_epg[cname]['now_time'] = f"{self.format_time(now_event['start'])} - {self.format_time(now_event['stop'])}"
+                parsed_epg[cname]['desc'] = now_event['desc']
+                parsed_epg[cname]['start_ts'] = now_event['start']
+                parsed_epg[cname]['stop_ts'] = now_event['stop']
+                parsed_epg[cname]['progress'] = self.progress_bar(now_event['start'], now_event['stop'], now)
+            if next_event:
+                parsed_epg[cname]['next_title'] = next_event['title']
+                parsed_epg[cname]['next_time'] = f"{self.format_time(next_event['start'])} - {self.format_time(next_event['stop'])}"
+        return parsed_epg
+
+    def channel_boundaries(self, channels, now):
+        boundaries = {}
+        for c in channels:
+            b = self.store.next_boundary(c, now)
+            if b is not None:
+                boundaries[c] = b
+        return boundaries
+
+    def emit_now_next(self, now):
+        parsed = self.build_now_next(now)
+        if parsed != self.last_emitted:
+            self.last_emitted = parsed
+            self.data_ready.emit(parsed)
+
+    def tick(self, now):
+        """Run one sync step at time `now` and return how long to sleep before the next one."""
+        synced = True
+        refreshed = set()
+        if self.last_full_sync is None or now - self.last_full_sync >= self.full_refresh_interval:
+            self.sync_full(now)
+        elif now - self.last_window_sync >= self.max_interval:
+            self.sync_window(now)
+        else:
+            synced = False
+        self.store.drop_before(now)
+        
+        watched = self.watched_channels
+        boundaries = self.channel_boundaries(watched or self.store.channels, now)
+        
+        # Watched channels whose next boundary is about to pass (or that have nothing scheduled)
+        # get one targeted refresh per boundary, so late schedule changes are picked up
+        due = [c for c in watched
+               if not (c in self._prefetched and self._prefetched[c] == boundaries.get(c))
+               and (c not in boundaries or boundaries[c] - now <= self.boundary_lead)]
+        if due:
+            if self.last_full_sync != now:
+                refreshed = self.sync_channels(due)
+                boundaries = self.channel_boundaries(watched, now)
+            for c in due:
+                self._prefetched[c] = boundaries.get(c)
+                
+        self.emit_now_next(now)
+        if self.cache is not None:
+            if synced:
+                self.cache.save(self.store, now)
+            elif refreshed:
+                # Boundary refreshes only touch a few channels; don't rewrite the whole cache
+                self.cache.save(self.store, now, keys=refreshed)
+            
+        wake_at = min(self.last_full_sync + self.full_refresh_interval, self.last_window_sync + self.max_interval)
+        if watched:
+            for c in watched:
+                if c not in boundaries:
+                    continue
+                b = boundaries[c]
+                # Wake just before the boundary to refresh, then right after it to flip now/next
+                wake_at = min(wake_at, b + 1 if self._prefetched.get(c) == b else b - self.boundary_lead)
+        elif boundaries:
+            wake_at = min(wake_at, min(boundaries.values()) + 1)
+        return max(1, wake_at - now)
         
     def run(self):
-        import time, requests
+        self.load_cache(int(time.time()))
         while self.running:
+            delay = 30
             try:
-                url = f"{self.tvh_url}/api/epg/events/grid"
-                resp = requests.get(url, params={"start": 0, "limit": 1000}, timeout=5)
-                if resp.status_code == 200:
-                    epg_data = resp.json().get('entries', [])
-                    now = int(time.time())
-                    
-                    channel_data = {}
-                    for event in epg_data:
-                        cname = event.get('channelName', '')
-                        if cname not in channel_data:
-                            channel_data[cname] = []
-                        channel_data[cname].append(event)
-                        
-                    parsed_epg = {}
-                    for cname, events in channel_data.items():
-                        events.sort(key=lambda e: e['start'])
-                        now_event, next_event = None, None
-                        for i, e in enumerate(events):
-                            if e['start'] <= now < e['stop']:
-                                now_event = e
-                                if i + 1 < len(events):
-                                    next_event = events[i + 1]
-                                break
-                            elif e['start'] > now and next_event is None:
-                                next_event = e
-                                
-                        if now_event or next_event:
-                            parsed_epg[cname] = {}
-                            if now_event:
-                                parsed_epg[cname]['now_title'] = now_event.get('title', 'No Title')
-                                parsed_epg[cname]['now_time'] = f"{self.format_time(now_event['start'])} - {self.format_time(now_event['stop'])}"
-                                parsed_epg[cname]['desc'] = now_event.get('subtitle', '') or now_event.get('description', '')
-                                parsed_epg[cname]['start_ts'] = now_event['start']
-                                parsed_epg[cname]['stop_ts'] = now_event['stop']
-                                parsed_epg[cname]['progress'] = self.progress_bar(now_event['start'], now_event['stop'], now)
-                            if next_event:
-                                parsed_epg[cname]['next_title'] = next_event.get('title', 'No Title')
-                                parsed_epg[cname]['next_time'] = f"{self.format_time(next_event['start'])} - {self.format_time(next_event['stop'])}"
-                                
-                    self.data_ready.emit(parsed_epg)
+                delay = self.tick(int(time.time()))
             except Exception as e:
                 print(f"EPG Fetch error: {e}")
+                self.last_full_sync = None
+                # Keep cached programmes ticking over while TVHeadend is unreachable
+                self.store.drop_before(int(time.time()))
+                self.emit_now_next(int(time.time()))
                 
-            for _ in range(1):
-                if not self.running: break
-                time.sleep(1)
+            self._wake.wait(delay)
+            self._wake.clear()
 
 
-class MultiPlayerApp(QMainWindow):
-    def __init__(self, config):
-        super().__init__()
-        self.setWindowTitle("multi-tv-player")
-        self.setMinimumSize(640, 480)
-        self.setContentsMargins(0, 0, 0, 0)
-        
-        # We apply this universally to KILL any default Qt margins or lines
-        self.setStyleSheet("background-color: black; border: none;")
+class HoverTracker(QObject):
+    """Drives the hover overlays, the control HUD and cursor hiding from mouse events.
 
-        self.central_widget = QWidget()
-        self.central_widget.setStyleSheet("background-color: black; margin: 0px; padding: 0px; border: none;")
-        self.setCentralWidget(self.central_widget)
-        self.grid_layout = QGridLayout(self.central_widget)
-        self.grid_layout.setContentsMargins(0, 0, 0, 0)
-        self.grid_layout.setSpacing(0)
+    Mouse moves anywhere in the application update the state straight away; a single
+    single-shot timer covers the idle deadlines, so nothing wakes up once the mouse
+    has been still for a while.
+    """
+    OVERLAY_IDLE = 1.6
+    HUD_IDLE = 0.5
+    MOVE_EVENTS = (QEvent.MouseMove, QEvent.HoverMove, QEvent.Enter, QEvent.Leave)
 
-        self.is_fullscreen = False
-        self.players = []
-        self.videos = []
-        self.overlays = []
-        self.channel_overlays = []
-        self.mute_overlays = []
-        
-        self.show_epg_overlays = True
-        self.epg_mode = 'hover'
-        self.epg_data = {}
-        self.epg_overlays = []
-        self.epg_fetcher = EPGFetcher()
-        self.epg_fetcher.data_ready.connect(self.on_epg_data_ready)
-        self.epg_fetcher.start()
-        self.grid_rows = 2
-        self.grid_cols = 2
+    def __init__(self, master_app):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.last_pos = None
+        self.last_move_time = time.monotonic()
+        self.hover_window = None
+        self.cursor_hidden = False
+        self._last_state = None
         
-        self.single_fs_active = False
-        self.single_fs_index = -1
-
-        self.config = config
-        self.load_channels_from_url()
-
-        self.stream_groups_numbers = list(self.config['stream_groups'].values())
-        self.all_groups_labels = list(self.config['stream_groups'].keys())
-        self.stream_groups = [
-            [self.channels_by_number[number] for number in group] for group in self.stream_groups_numbers
-        ]
-        import copy
-        self.original_stream_groups = copy.deepcopy(self.stream_groups)
-        self.current_group_index = 0
-
-        # Set application palette to pure black just in case
-        palette = self.palette()
-        palette.setColor(self.backgroundRole(), Qt.black)
-        self.setPalette(palette)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.refresh)
+        QApplication.instance().installEventFilter(self)
 
-        # Force VLC to use Direct3D11, as older renderers (Direct3D9) often create a 1px border
-        self.instance = vlc.Instance('--quiet', '--network-caching=100', "--aout=directsound", "--vout=direct3d11", "--no-keyboard-events")
-        self.setup_players(self.stream_groups[self.current_group_index])
-        
-        # Shortcuts
-        QShortcut(QKeySequence("M"), self, self.handle_mute_toggle, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("S"), self, self.handle_sub_toggle, context=Qt.ApplicationShortcut)
-        for i in range(1, 10):
-            QShortcut(QKeySequence(str(i)), self, lambda checked=False, idx=i-1: self.handle_number_shortcut(idx), context=Qt.ApplicationShortcut)
-            
-        QShortcut(QKeySequence("F11"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("F"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("0"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("Esc"), self, self.handle_escape, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("*"), self, self.close, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("Ctrl+W"), self, self.close, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("Up"), self, self.unmute_all, context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("Down"), self, self.mute_all, context=Qt.ApplicationShortcut)
-        
-        QShortcut(QKeySequence("Left"), self, lambda: self.handle_arrow_cycle(-1), context=Qt.ApplicationShortcut)
-        QShortcut(QKeySequence("Right"), self, lambda: self.handle_arrow_cycle(1), context=Qt.ApplicationShortcut)
-            
-        # Default main window size to 1080p instead of forcing borderless fullscreen
-        self.resize(1920, 1080)
+    def track(self, widget):
+        # Qt only reports button-less mouse moves to widgets that track the mouse
+        widget.setMouseTracking(True)
+        for child in widget.findChildren(QWidget):
+            child.setMouseTracking(True)
 
-        # Hover checker
-        self.hover_timer = QTimer(self)
-        self.hover_timer.setInterval(15)
-        self.hover_timer.timeout.connect(self.check_hover)
-        self.hover_timer.start()
-        
-        self.installEventFilter(self)
+    def eventFilter(self, obj, event):
+        if event.type() in self.MOVE_EVENTS:
+            pos = QCursor.pos()
+            if pos != self.last_pos:
+                self.last_pos = pos
+                self.last_move_time = time.monotonic()
+                self.hover_window = obj.window() if isinstance(obj, QWidget) else None
+                self.refresh()
+        return False
 
-    def check_hover(self):
+    def refresh(self, force=False):
+        app = self.master_app
         pos = QCursor.pos()
+        idle_time = time.monotonic() - self.last_move_time
+        mouse_is_idle = idle_time >= self.OVERLAY_IDLE
+        over_main_window = app.rect().contains(app.mapFromGlobal(pos))
+        tile = app.tile_at(pos)
         
-        # Track idle time
-        import time
-        if not hasattr(self, 'last_mouse_pos') or self.last_mouse_pos != pos:
-            self.last_mouse_pos = pos
-            self.last_mouse_move_time = time.time()
-            
-        idle_time = time.time() - getattr(self, 'last_mouse_move_time', time.time())
-        mouse_is_idle = idle_time >= 1.6
-
-        all_overlays = list(self.overlays)
-        if getattr(self, 'epg_mode', 'locked') == 'hover':
-            all_overlays.extend(getattr(self, 'epg_overlays', []))
-        for overlay in all_overlays:
-            if not overlay.target_widget.isVisible():
-                continue
-                
-            video_rect = overlay.target_widget.rect()
-            mapped_video_pos = overlay.target_widget.mapFromGlobal(pos)
-            
-            # Add a 50px margin of error to swallow any Qt geometry desyncs after DWM transitions
-            margin = 50
-            over_video = (-margin <= mapped_video_pos.x() <= video_rect.width() + margin) and \
-                         (-margin <= mapped_video_pos.y() <= video_rect.height() + margin)
+        forced_for = getattr(app, 'force_show_overlays_until', 0) - time.time()
+        if app.single_fs_active and forced_for > 0:
+            tile = app.single_fs_index
+            mouse_is_idle = False
             
-            try:
-                overlay_idx = self.videos.index(overlay.target_widget)
-            except ValueError:
-                overlay_idx = -1
-                
-            is_forced = getattr(self, 'single_fs_active', False) and \
-                        overlay_idx == getattr(self, 'single_fs_index', -1) and \
-                        time.time() < getattr(self, 'force_show_overlays_until', 0)
-                        
-            if is_forced:
-                over_video = True
-                mouse_is_idle = False
-            
-            overlay_rect = overlay.rect()
-            mapped_overlay_pos = overlay.mapFromGlobal(pos)
-            over_overlay = overlay.isVisible() and overlay_rect.contains(mapped_overlay_pos)
-            
-            if over_video or over_overlay:
-                if mouse_is_idle and not over_overlay:
-                    if overlay.windowOpacity() > 0 or overlay.isVisible():
+        # Overlays only need touching when the hovered tile or the idle state changes
+        state = (tile, mouse_is_idle, self.hover_window, app.single_fs_active, app.epg_mode)
+        if force or state != self._last_state:
+            self._last_state = state
+            hover_sets = [app.overlays]
+            if app.epg_mode == 'hover':
+                hover_sets.append(app.epg_overlays)
+            for overlays in hover_sets:
+                for idx, overlay in enumerate(overlays):
+                    if not overlay.target_widget.isVisible():
+                        continue
+                    over_overlay = overlay.isVisible() and overlay.rect().contains(overlay.mapFromGlobal(pos))
+                    if (idx == tile or over_overlay) and (over_overlay or not mouse_is_idle):
+                        overlay.fade_in()
+                    elif overlay.windowOpacity() > 0 or overlay.isVisible():
                         overlay.fade_out()
-                else:
-                    overlay.fade_in()
-            else:
-                if overlay.windowOpacity() > 0 or overlay.isVisible():
-                    overlay.fade_out()
-                    
-        # Check if mouse is hovering over the main application window
-        mapped_main = self.mapFromGlobal(pos)
-        over_main_window = self.rect().contains(mapped_main)
-                    
+                        
         # Cursor hiding logic
         if mouse_is_idle and over_main_window:
-            if not getattr(self, '_cursor_hidden', False):
+            if not self.cursor_hidden:
                 QApplication.setOverrideCursor(Qt.BlankCursor)
-                self._cursor_hidden = True
+                self.cursor_hidden = True
+        elif self.cursor_hidden:
+            QApplication.restoreOverrideCursor()
+            self.cursor_hidden = False
+            
+        # Fade controls window based on mouse activity
+        if hasattr(app, 'controls_window'):
+            controls = app.controls_window
+            if app.single_fs_active:
+                # Completely hide the global controls in single fullscreen
+                if controls.opacity_effect.opacity() > 0 or controls.isVisible():
+                    controls.fade_out()
+            else:
+                over_controls = controls.isVisible() and controls.rect().contains(controls.mapFromGlobal(pos))
+                # Make the HUD disappear faster than the video controls
+                hud_is_idle = idle_time >= self.HUD_IDLE
+                if (hud_is_idle and not over_controls) or not over_main_window:
+                    if controls.opacity_effect.opacity() > 0 or controls.isVisible():
+                        controls.fade_out()
+                else:
+                    controls.fade_in()
+                    
+        # Sleep until the next idle deadline, if any is still ahead
+        deadlines = [limit - idle_time for limit in (self.HUD_IDLE, self.OVERLAY_IDLE) if idle_time < limit]
+        if app.single_fs_active and forced_for > 0:
+            deadlines.append(forced_for)
+        if deadlines:
+            self.idle_timer.start(int(min(deadlines) * 1000) + 10)
+        else:
+            self.idle_timer.stop()
+
+
+class ChannelIndex:
+    """Playlist channels in tuning order, with constant-time lookups for every way of tuning.
+
+    Built once per playlist load; cycling, random picks and the dropdowns all work on
+    positions in this order instead of re-sorting channels_by_number each time.
+    """
+
+    def __init__(self, channels_by_number=None, channels=None):
+        items = sorted(
+            (channels_by_number or {}).items(),
+            key=lambda item: int(item[0]) if str(item[0]).isdigit() else 999999
+        )
+        self.numbers = [num for num, _ in items]
+        self.records = [channel for _, channel in items]
+        self.position_by_number = {num: pos for pos, num in enumerate(self.numbers)}
+        self.position_by_url = {}
+        for pos, channel in enumerate(self.records):
+            self.position_by_url.setdefault(channel.url, pos)
+        self.by_name = dict(channels or {})
+
+    def __len__(self):
+        return len(self.records)
+
+    def at(self, position):
+        position %= len(self.records)
+        return self.numbers[position], self.records[position]
+
+    def step(self, url, direction):
+        position = self.position_by_url.get(url)
+        if position is None or not self.records:
+            return None
+        return self.at(position + direction)
+
+    def random(self):
+        if not self.records:
+            return None
+        return self.at(random.randrange(len(self.records)))
+
+    def neighbours(self, url, depth):
+        # Channels either side of `url` in tuning order, nearest first
+        position = self.position_by_url.get(url)
+        if position is None or len(self.records) < 2:
+            return []
+        found = []
+        for step in range(1, depth + 1):
+            for direction in (1, -1):
+                num, channel = self.at(position + direction * step)
+                if channel.url != url and (num, channel) not in found:
+                    found.append((num, channel))
+        return found
+
+
+class ChannelListModel(QAbstractListModel):
+    """The channel list behind every tile's dropdown, with the current programme in each row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.channel_index = ChannelIndex()
+        self.now_titles = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.channel_index)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.channel_index):
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            num, channel = self.channel_index.numbers[row], self.channel_index.records[row]
+            now_title = self.now_titles[row]
+            return f"{num} - {channel.name} ({now_title})" if now_title else f"{num} - {channel.name}"
+        if role == Qt.UserRole:
+            return self.channel_index.numbers[row]
+        return None
+
+    def _titles(self, epg_data):
+        titles = []
+        for channel in self.channel_index.records:
+            now_title = epg_data.get(channel.name, {}).get('now_title', '')
+            titles.append(now_title if now_title != "No Title" else '')
+        return titles
+
+    def set_channel_index(self, channel_index, epg_data):
+        self.beginResetModel()
+        self.channel_index = channel_index
+        self.now_titles = self._titles(epg_data)
+        self.endResetModel()
+
+    def update_epg(self, epg_data):
+        # Only rows whose programme changed are repainted, in contiguous runs
+        titles = self._titles(epg_data)
+        start = None
+        for row, (old, new) in enumerate(zip(self.now_titles, titles)):
+            if old != new:
+                if start is None:
+                    start = row
+            elif start is not None:
+                self.dataChanged.emit(self.index(start), self.index(row - 1), [Qt.DisplayRole])
+                start = None
+        self.now_titles = titles
+        if start is not None:
+            self.dataChanged.emit(self.index(start), self.index(len(titles) - 1), [Qt.DisplayRole])
+
+
+class PlaylistCache:
+    """Last good playlist, kept with its HTTP validators so unchanged playlists aren't re-parsed."""
+    SNAPSHOT_VERSION = 3
+
+    def __init__(self, cache_dir):
+        self.snapshot_path = Path(cache_dir) / "playlist.pickle"
+        self.snapshot = None
+
+    def load(self, url):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, TypeError):
+            return None
+        if snapshot.get('version') != self.SNAPSHOT_VERSION or snapshot.get('url') != url:
+            return None
+        self.snapshot = snapshot
+        return snapshot
+
+    def request_headers(self):
+        headers = {}
+        if self.snapshot:
+            if self.snapshot.get('etag'):
+                headers['If-None-Match'] = self.snapshot['etag']
+            if self.snapshot.get('last_modified'):
+                headers['If-Modified-Since'] = self.snapshot['last_modified']
+        return headers
+
+    def save(self, url, response, channels, channels_by_number):
+        snapshot = {
+            'version': self.SNAPSHOT_VERSION,
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'channels': channels,
+            'channels_by_number': channels_by_number,
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+            self.snapshot = snapshot
+        except OSError as e:
+            print(f"Could not write playlist cache: {e}")
+
+
+class Channel(namedtuple('Channel', 'name url number options info', defaults=(None, (), ''))):
+    """One playlist entry. Indexes 0/1 are name/url, like the old (name, url) tuples.
+
+    `info` keeps the raw #EXTINF attribute text; the rarely used attributes are only
+    picked out of it when asked for, so parsing a big playlist stays cheap.
+    """
+    __slots__ = ()
+
+    @property
+    def tvg_id(self):
+        return _m3u_attr(self.info, 'tvg-id')
+
+    @property
+    def logo(self):
+        return _m3u_attr(self.info, 'tvg-logo')
+
+    @property
+    def group(self):
+        return _m3u_attr(self.info, 'group-title')
+
+    @property
+    def attrs(self):
+        attrs = dict(EXTINF_ATTR_RE.findall(self.info))
+        for key in ('tvg-chno', 'tvg-id', 'tvg-logo', 'group-title'):
+            attrs.pop(key, None)
+        if attrs.get('tvg-name') == self.name:
+            del attrs['tvg-name']
+        return attrs or None
+
+
+EXTINF_ATTR_RE = re.compile(r'([\w-]+)="([^"]*)"')
+
+
+def _m3u_attr(info, key):
+    needle = key + '="'
+    start = info.find(needle)
+    while start > 0 and info[start - 1] not in ' \t':
+        start = info.find(needle, start + 1)
+    if start < 0:
+        return None
+    start += len(needle)
+    return info[start:info.find('"', start)] or None
+
+
+def iter_m3u(chunks):
+    """Yield a Channel for every entry of an M3U playlist read as a stream of text chunks.
+
+    The text is cut into entries at each #EXTINF a buffer at a time rather than line by
+    line; only text after the last complete #EXTINF is carried over to the next chunk.
+    """
+    buffer = '\n'
+    count = 0
+    for chunk in chunks:
+        buffer += chunk
+        cut = buffer.rfind('\n#EXTINF:')
+        if cut <= 0:
+            continue
+        block = _parse_m3u_block(buffer[:cut], count)
+        count += len(block)
+        yield from block
+        buffer = buffer[cut:]
+    yield from _parse_m3u_block(buffer, count)
+
+
+def _parse_m3u_block(text, count):
+    channels = []
+    append = channels.append
+    new = tuple.__new__
+    for entry in text.split('\n#EXTINF:')[1:]:
+        info, _, rest = entry.partition('\n')
+        quote = info.rfind('"')
+        name = info[quote + 1:]
+        if ',' in name:
+            name = name.partition(',')[2].strip()
+        else:
+            name = info.rpartition(',')[2].strip()
+        info = info[:quote + 1]
+        url = rest.strip()
+        options = ()
+        if '#' in rest or '\n' in url:
+            # #EXTVLCOPT/#EXTGRP/comment lines between the #EXTINF and the URL
+            url = ''
+            options = []
+            for line in rest.splitlines():
+                line = line.strip()
+                if line.startswith('#EXTVLCOPT:'):
+                    options.append(line[11:].strip())
+                elif line.startswith('#EXTGRP:') and not _m3u_attr(info, 'group-title'):
+                    info += f' group-title="{line[8:].strip()}"'
+                elif line and not line.startswith('#'):
+                    url = line
+                    break
+            options = tuple(options)
+        if not url:
+            continue
+        # info still starts with the duration, so every attribute follows a space
+        number = info.find(' tvg-chno="')
+        if number >= 0:
+            number = info[number + 11:info.find('"', number + 11)] or None
+        else:
+            number = None
+        append(new(Channel, (name or f"Unknown_{count + len(channels)}", url, number, options, info)))
+    return channels
+
+
+def parse_playlist(chunks):
+    channels = {}
+    channels_by_number = {}
+    # Every entry is a fresh tuple; with tens of thousands of them the cyclic collector
+    # would otherwise keep rescanning the ones already parsed
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for channel in iter_m3u(chunks):
+            channels[channel.name] = channel
+            if channel.number:
+                channels_by_number[channel.number] = channel
+    finally:
+        if collecting:
+            gc.enable()
+    return channels, channels_by_number
+
+
+def fetch_playlist(url, cache):
+    snapshot = cache.snapshot or cache.load(url)
+    try:
+        response = requests.get(url, headers=cache.request_headers(), timeout=(3, 10), stream=True)
+        if response.status_code == 304 and snapshot:
+            print("Playlist unchanged, using cached channel list")
+            return snapshot['channels'], snapshot['channels_by_number']
+        response.raise_for_status()
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = 'utf-8'
+        # Parse while the body is still arriving instead of holding it all in memory
+        channels, channels_by_number = parse_playlist(response.iter_content(chunk_size=65536, decode_unicode=True))
+    except requests.RequestException as e:
+        print(f"Error fetching playlist: {e}")
+        if snapshot:
+            print("Starting from the last cached playlist")
+            return snapshot['channels'], snapshot['channels_by_number']
+        return {}, {}
+
+    cache.save(url, response, channels, channels_by_number)
+    return channels, channels_by_number
+
+
+class PlaylistLoader(QThread):
+    loaded = Signal(object, object)
+
+    def __init__(self, url, cache):
+        super().__init__()
+        self.url = url
+        self.cache = cache
+
+    def run(self):
+        self.loaded.emit(*fetch_playlist(self.url, self.cache))
+
+
+def fetch_mux_map(tvh_url):
+    """Map TVHeadend channel uuids, numbers and names to (mux uuid, program number) ({} on failure)."""
+    params = {"start": 0, "limit": 100000}
+    try:
+        session = requests.Session()
+        channels = session.get(f"{tvh_url}/api/channel/grid", params=params, timeout=5)
+        channels.raise_for_status()
+        services = session.get(f"{tvh_url}/api/mpegts/service/grid", params=params, timeout=5)
+        services.raise_for_status()
+    except Exception as e:
+        print(f"Error fetching mux layout: {e}")
+        return {}
+    program_by_service = {
+        svc.get('uuid'): (svc.get('multiplex_uuid') or svc.get('multiplex'), svc.get('sid'))
+        for svc in services.json().get('entries', [])
+    }
+    muxes = {}
+    for ch in channels.json().get('entries', []):
+        program = next((program_by_service[svc] for svc in ch.get('services', []) if svc in program_by_service), None)
+        if not program or not program[0]:
+            continue
+        for key in (ch.get('uuid'), str(ch.get('number') or ''), ch.get('name')):
+            if key:
+                muxes.setdefault(key, program)
+    return muxes
+
+
+def with_query_param(url, name, value):
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != name]
+    query.append((name, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def parse_hls_master(lines, base_url):
+    """Variants of an HLS master playlist as (height, bandwidth, url), [] if it isn't one."""
+    variants = []
+    pending = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            attrs = dict(re.findall(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)', line[18:]))
+            resolution = re.match(r'(\d+)x(\d+)', attrs.get('RESOLUTION', ''))
+            pending = (int(resolution.group(2)) if resolution else 0, int(attrs.get('BANDWIDTH', 0) or 0))
+        elif line and not line.startswith('#') and pending is not None:
+            variants.append(pending + (urljoin(base_url, line),))
+            pending = None
+    return variants
+
+
+def fetch_hls_variants(url):
+    try:
+        response = requests.get(url, timeout=(3, 10))
+        response.raise_for_status()
+        return parse_hls_master(response.text.splitlines(), response.url)
+    except Exception as e:
+        print(f"Error fetching HLS variants: {e}")
+        return []
+
+
+class MuxMapLoader(QThread):
+    loaded = Signal(object)
+
+    def __init__(self, tvh_url, cache_path=None):
+        super().__init__()
+        self.tvh_url = tvh_url
+        self.cache_path = cache_path
+
+    def run(self):
+        muxes = fetch_mux_map(self.tvh_url)
+        if muxes and self.cache_path:
+            # The mux layout rarely changes; keep it so the next start can use it straight away
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_path.with_suffix('.tmp')
+                tmp.write_text(json.dumps(muxes))
+                os.replace(tmp, self.cache_path)
+            except Exception as e:
+                print(f"Error saving mux layout: {e}")
+        self.loaded.emit(muxes)
+
+
+def process_rss():
+    """Resident memory of this process in bytes, 0 where the platform won't say."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+
+            class Counters(ctypes.Structure):
+                _fields_ = [('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong)] + [
+                    (name, ctypes.c_size_t) for name in (
+                        'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                        'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+            counters = Counters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return 0
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def load_mux_map(cache_path):
+    try:
+        return {key: tuple(value) for key, value in json.loads(cache_path.read_text()).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error loading mux layout: {e}")
+        return {}
+
+
+def _crc32_mpeg_table():
+    table = []
+    for i in range(256):
+        crc = i << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else (crc << 1)
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+_CRC32_MPEG = _crc32_mpeg_table()
+
+
+def crc32_mpeg(data):
+    crc = 0xFFFFFFFF
+    for b in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC32_MPEG[((crc >> 24) ^ b) & 0xFF]
+    return crc
+
+
+class TSProgramFilter:
+    """Splits a multi-program MPEG transport stream into single-program streams by PID.
+
+    Follows the PAT and PMTs as they go by; each program gets its own PMT, PCR and
+    elementary stream packets, with the PAT rewritten to list only that program.
+    """
+    PACKET = 188
+
+    def __init__(self):
+        self.pmt_pids = {}
+        self.pmt_programs = {}
+        self.program_pids = {}
+        self.transport_stream_id = 0
+        self._pat_version = 0
+        self._pat_cache = {}
+        self._pat_cc = {}
+        self._pid_targets = None
+        self._partial = b""
+
+    @staticmethod
+    def _section(packet):
+        # Start of the PSI section in a packet carrying a payload_unit_start
+        if not packet[1] & 0x40:
+            return None
+        offset = 4
+        if packet[3] & 0x20:
+            offset += 1 + packet[4]
+        if not packet[3] & 0x10 or offset >= TSProgramFilter.PACKET:
+            return None
+        offset += 1 + packet[offset]
+        return packet[offset:]
+
+    def _parse_pat(self, packet):
+        section = self._section(packet)
+        if not section or len(section) < 12 or section[0] != 0x00:
+            return
+        end = min(3 + (((section[1] & 0x0F) << 8) | section[2]) - 4, len(section))
+        pmt_pids = {}
+        for i in range(8, end - 3, 4):
+            program = (section[i] << 8) | section[i + 1]
+            if program:
+                pmt_pids[program] = ((section[i + 2] & 0x1F) << 8) | section[i + 3]
+        tsid = (section[3] << 8) | section[4]
+        if pmt_pids != self.pmt_pids or tsid != self.transport_stream_id:
+            self.pmt_pids = pmt_pids
+            self.pmt_programs = {pid: program for program, pid in pmt_pids.items()}
+            self.transport_stream_id = tsid
+            self.program_pids = {p: self.program_pids.get(p, {pid}) for p, pid in pmt_pids.items()}
+            self._pat_version = self._pat_version + 1 & 0x1F
+            self._pat_cache.clear()
+            self._pid_targets = None
+
+    def _parse_pmt(self, program, packet):
+        section = self._section(packet)
+        if not section or len(section) < 12 or section[0] != 0x02:
+            return
+        end = min(3 + (((section[1] & 0x0F) << 8) | section[2]) - 4, len(section))
+        pids = {self.pmt_pids[program], ((section[8] & 0x1F) << 8) | section[9]}
+        i = 12 + (((section[10] & 0x0F) << 8) | section[11])
+        while i + 5 <= end:
+            pids.add(((section[i + 1] & 0x1F) << 8) | section[i + 2])
+            i += 5 + (((section[i + 3] & 0x0F) << 8) | section[i + 4])
+        if pids != self.program_pids.get(program):
+            self.program_pids[program] = pids
+            self._pid_targets = None
+
+    def pat_for(self, program):
+        section = self._pat_cache.get(program)
+        if section is None:
+            pmt_pid = self.pmt_pids[program]
+            tsid = self.transport_stream_id
+            body = bytes([0x00, 0xB0, 13, tsid >> 8, tsid & 0xFF, 0xC1 | self._pat_version << 1, 0x00, 0x00,
+                          program >> 8, program & 0xFF, 0xE0 | (pmt_pid >> 8), pmt_pid & 0xFF])
+            section = body + crc32_mpeg(body).to_bytes(4, 'big')
+            self._pat_cache[program] = section
+        cc = self._pat_cc.get(program, -1) + 1 & 0x0F
+        self._pat_cc[program] = cc
+        packet = bytes([0x47, 0x40, 0x00, 0x10 | cc, 0x00]) + section
+        return packet + b"\xff" * (self.PACKET - len(packet))
+
+    def _targets(self, programs):
+        # PID -> programs that want it, rebuilt only when the PAT/PMTs change
+        if self._pid_targets is None or self._pid_targets[0] != programs:
+            targets = {}
+            for program in programs:
+                for pid in self.program_pids.get(program, ()):
+                    targets.setdefault(pid, []).append(program)
+            self._pid_targets = (programs, targets)
+        return self._pid_targets[1]
+
+    def feed(self, data, programs):
+        """Consume a chunk of the mux; returns {program: bytes} for the requested programs."""
+        programs = tuple(programs)
+        out = {program: bytearray() for program in programs}
+        targets = self._targets(programs)
+        data = self._partial + data if self._partial else data
+        size = self.PACKET
+        n = len(data)
+        i = 0
+        while i + size <= n:
+            if data[i] != 0x47:
+                # Lost sync; skip to the next sync byte
+                j = data.find(b"\x47", i + 1)
+                i = n if j < 0 else j
+                continue
+            pid = ((data[i + 1] & 0x1F) << 8) | data[i + 2]
+            if pid == 0:
+                self._parse_pat(data[i:i + size])
+                targets = self._targets(programs)
+                for program in programs:
+                    if program in self.pmt_pids:
+                        out[program] += self.pat_for(program)
+            else:
+                dests = targets.get(pid)
+                if dests:
+                    packet = data[i:i + size]
+                    program = self.pmt_programs.get(pid)
+                    if program is not None:
+                        self._parse_pmt(program, packet)
+                        targets = self._targets(programs)
+                    for program in dests:
+                        out[program] += packet
+            i += size
+        self._partial = data[i:]
+        return {program: bytes(buf) for program, buf in out.items()}
+
+
+class MuxFeed:
+    """One upstream connection to a whole mux, fanned out to the tiles watching its programs."""
+
+    def __init__(self, relay, mux, url):
+        self.relay = relay
+        self.mux = mux
+        self.url = url
+        self.clients = []
+        self.lock = threading.Lock()
+        self.empty_since = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def add(self, client):
+        with self.lock:
+            self.clients.append(client)
+            self.empty_since = None
+
+    def remove(self, client):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+            if not self.clients:
+                self.empty_since = time.monotonic()
+
+    def run(self):
+        demux = TSProgramFilter()
+        try:
+            with requests.get(self.url, stream=True, timeout=(3, 10)) as resp:
+                resp.raise_for_status()
+                for chunk in resp.iter_content(chunk_size=188 * 348):
+                    with self.lock:
+                        clients = list(self.clients)
+                        idle = self.empty_since is not None and time.monotonic() - self.empty_since > self.relay.linger
+                    if idle or self.relay.stopped:
+                        break
+                    streams = demux.feed(chunk, sorted({c.program for c in clients}))
+                    for client in clients:
+                        client.push(streams[client.program])
+        except Exception as e:
+            print(f"Mux stream {self.mux} failed: {e}")
+        finally:
+            self.relay.feed_closed(self)
+            with self.lock:
+                clients, self.clients = self.clients, []
+            for client in clients:
+                client.push(None)
+
+
+class MuxClient:
+    # Live TV: if a player falls this far behind, drop data rather than buffer without end
+    MAX_BACKLOG = 256
+
+    def __init__(self, program):
+        self.program = program
+        self.chunks = queue.Queue(self.MAX_BACKLOG)
+
+    def push(self, data):
+        if data == b"":
+            return
+        try:
+            self.chunks.put_nowait(data)
+        except queue.Full:
+            if data is None:
+                # Make room so the player still hears that the stream ended
+                try:
+                    self.chunks.get_nowait()
+                except queue.Empty:
+                    pass
+                self.chunks.put(None)
+
+
+class MuxRelay:
+    """Local HTTP relay so tiles on the same mux share one TVHeadend connection (and tuner).
+
+    Players open http://127.0.0.1:<port>/mux/<mux>/<program>; the relay opens the mux once,
+    demultiplexes it with TSProgramFilter and hands each player its own program. Only muxes
+    handed out through url_for are served.
+    """
+
+    def __init__(self, url_template, linger=5.0):
+        self.url_template = url_template
+        self.linger = linger
+        self.feeds = {}
+        self.known = set()
+        self.lock = threading.Lock()
+        self.stopped = False
+        self.upstream_count = 0
+        relay = self
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = self.path.strip('/').split('/')
+                if len(parts) != 3 or parts[0] != 'mux' or not parts[2].isdigit():
+                    self.send_error(404)
+                    return
+                client = relay.subscribe(unquote(parts[1]), int(parts[2]))
+                if client is None:
+                    self.send_error(404)
+                    return
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "video/mp2t")
+                    self.end_headers()
+                    while True:
+                        data = client.chunks.get()
+                        if data is None:
+                            break
+                        self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    pass
+                finally:
+                    relay.unsubscribe(unquote(parts[1]), client)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped = True
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url_for(self, mux, program):
+        with self.lock:
+            self.known.add(str(mux))
+        return f"http://127.0.0.1:{self.port}/mux/{quote(str(mux), safe='')}/{program}"
+
+    def subscribe(self, mux, program):
+        client = MuxClient(program)
+        with self.lock:
+            if mux not in self.known:
+                # Anything else on localhost could ask; don't let it pick the upstream URL
+                return None
+            feed = self.feeds.get(mux)
+            if feed is None:
+                feed = MuxFeed(self, mux, self.url_template.format(mux=quote(mux, safe='')))
+                self.feeds[mux] = feed
+                self.upstream_count += 1
+                feed.add(client)
+                feed.thread.start()
+            else:
+                feed.add(client)
+        return client
+
+    def unsubscribe(self, mux, client):
+        with self.lock:
+            feed = self.feeds.get(mux)
+        if feed is not None:
+            feed.remove(client)
+
+    def feed_closed(self, feed):
+        with self.lock:
+            if self.feeds.get(feed.mux) is feed:
+                del self.feeds[feed.mux]
+
+
+class TunerAdmission:
+    """Keeps the number of distinct DVB muxes being received within the number of tuners.
+
+    Channels on the same mux share a tuner. The mapping comes from `channel_muxes` in the
+    config (by number or name) and from TVHeadend; a channel with no known mux is assumed
+    to need a tuner of its own. With `tuners` unset every channel is admitted.
+    """
+
+    def __init__(self, tuners=0, channel_muxes=None):
+        self.tuners = tuners
+        self.configured = {str(k): str(v) for k, v in (channel_muxes or {}).items()}
+        self.learned = {}
+
+    @property
+    def enabled(self):
+        return self.tuners > 0
+
+    def mux_for(self, channel):
+        for mapping in (self.configured, self.learned):
+            for key in (channel.number, channel.name, channel.tvg_id):
+                if key and key in mapping:
+                    return mapping[key]
+        return channel.url
+
+    def muxes(self, channels):
+        return {self.mux_for(c) for c in channels if c.url}
+
+    def admits(self, channel, holders):
+        if not self.enabled or not channel.url:
+            return True
+        in_use = self.muxes(holders)
+        return self.mux_for(channel) in in_use or len(in_use) < self.tuners
+
+
+class TileLayout:
+    """Where each tile of a group sits: a rows x cols grid and a (row, col, rowspan, colspan) cell per tile.
+
+    Built from a group's `layout` in stream_groups: "RxC", "1+N" (one big tile with N small ones
+    down its right side and along the bottom), an explicit list of [row, col, rowspan, colspan]
+    cells, or nothing for the smallest square grid that fits. Tiles that don't fit get extra
+    rows. Rows and columns nobody occupies are dropped, as QGridLayout collapses them, so the
+    arithmetic here matches where the tiles really are.
+    """
+
+    def __init__(self, rows, cols, cells):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        # Cell -> tile index, so hit-testing the mouse is one lookup
+        self.cell_map = [-1] * (rows * cols)
+        for i, (row, col, rowspan, colspan) in enumerate(cells):
+            for r in range(row, min(rows, row + rowspan)):
+                for c in range(col, min(cols, col + colspan)):
+                    self.cell_map[r * cols + c] = i
+
+    def index_at(self, row, col):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cell_map[row * self.cols + col]
+        return -1
+
+    @classmethod
+    def build(cls, spec, count):
+        count = max(1, count)
+        cells = None
+        if isinstance(spec, str) and re.fullmatch(r"\s*\d+\s*x\s*\d+\s*", spec.lower()):
+            rows, cols = (int(n) for n in spec.lower().split("x"))
+        elif isinstance(spec, str) and re.fullmatch(r"\s*1\s*\+\s*\d+\s*", spec):
+            small = max(int(spec.split("+")[1]), count - 1)
+            # Big tile (k-1)x(k-1) in a kxk grid leaves 2k-1 small cells around it
+            k = 2
+            while 2 * k - 1 < small:
+                k += 1
+            rows = cols = k
+            cells = [(0, 0, k - 1, k - 1)]
+            cells += [(r, k - 1, 1, 1) for r in range(k - 1)]
+            cells += [(k - 1, c, 1, 1) for c in range(k)]
+        elif isinstance(spec, (list, tuple)) and spec:
+            cells = [tuple(int(v) for v in cell) + (1, 1)[len(cell) - 2:] for cell in spec]
+            rows = max(row + rowspan for row, _, rowspan, _ in cells)
+            cols = max(col + colspan for _, col, _, colspan in cells)
+        else:
+            if spec:
+                print(f"Unknown layout {spec!r}, using a square grid")
+            cols = math.ceil(math.sqrt(count))
+            rows = math.ceil(count / cols)
+        if cells is None:
+            cells = [(i // cols, i % cols, 1, 1) for i in range(rows * cols)]
+        cells = cells[:count]
+        extra = count - len(cells)
+        if extra > 0:
+            cells += [(rows + i // cols, i % cols, 1, 1) for i in range(extra)]
+        rows = max(row + rowspan for row, _, rowspan, _ in cells)
+        cols = max(col + colspan for _, col, _, colspan in cells)
+        return cls(rows, cols, cells)
+
+
+class VariantSelector(QObject):
+    """Picks a lighter stream for tiles drawn small: a TVHeadend profile or an HLS variant.
+
+    `profiles` maps a tile height in device pixels to the TVHeadend streaming profile used
+    up to that height (the `profile` query parameter); taller tiles keep the playlist URL.
+    HLS master playlists are fetched once in the background, after which the smallest
+    variant at least as tall as the tile is picked.
+    """
+    loaded = Signal()
+
+    def __init__(self, parent, profiles=None, hls=True):
+        super().__init__(parent)
+        self.profiles = sorted((int(height), profile) for height, profile in (profiles or {}).items())
+        self.hls = hls
+        # Master playlist url -> variants; None while the fetch is running
+        self.masters = {}
+
+    def pick(self, url, height):
+        """(variant key, url to play) for a tile `height` pixels tall; key None is the URL as is."""
+        if not url or height is None:
+            return None, url
+        if self.hls and urlsplit(url).path.endswith('.m3u8'):
+            if url not in self.masters:
+                self.masters[url] = None
+                threading.Thread(target=self._fetch, args=(url,), daemon=True).start()
+            variants = self.masters[url]
+            if not variants:
+                return None, url
+            tall_enough = [v for v in variants if v[0] >= height]
+            variant = min(tall_enough) if tall_enough else max(variants)
+            return variant[2], variant[2]
+        for max_height, profile in self.profiles:
+            if height <= max_height:
+                return profile, with_query_param(url, 'profile', profile)
+        return None, url
+
+    def _fetch(self, url):
+        self.masters[url] = fetch_hls_variants(url)
+        if self.masters[url]:
+            self.loaded.emit()
+
+
+class DecoderProfiles:
+    """Per-media decoder settings for a tile, from how big it's drawn and whether it has focus.
+
+    `thresholds` maps a tile height in device pixels to the profile used up to that height;
+    taller tiles, the single-fullscreen tile and the one left unmuted get 'full'. The decoder
+    options only take effect on a new media, so a tile gaining or losing focus is moved over
+    with a handover like a resize. With no thresholds every tile plays with libvlc's defaults.
+
+    Deinterlacing stays on libvlc's auto-detection unless `deinterlace` is set, since
+    forcing a mode would also hit progressive channels.
+    """
+    PROFILES = {
+        # threads 0 lets libavcodec decide; skip levels are libavcodec's (1 non-ref frames, 4 all)
+        'low': {'threads': 1, 'skip_frame': 1, 'skip_loop_filter': 4, 'deinterlace': 'discard', 'fps': 12.5},
+        'medium': {'threads': 2, 'skip_frame': 0, 'skip_loop_filter': 1, 'deinterlace': 'blend', 'fps': 25},
+        'full': {'threads': 0, 'skip_frame': 0, 'skip_loop_filter': 0, 'deinterlace': 'yadif', 'fps': 0},
+        # Keyframes only; what ResourceGovernor falls back to under load
+        'skip': {'threads': 1, 'skip_frame': 3, 'skip_loop_filter': 4, 'deinterlace': 'discard', 'fps': 5},
+    }
+
+    def __init__(self, thresholds=None, deinterlace=False, video_filter=''):
+        self.thresholds = sorted((int(height), name) for height, name in (thresholds or {}).items())
+        self.deinterlace = deinterlace
+        self.video_filter = video_filter
+
+    def pick(self, height, focused=False):
+        if not self.thresholds or height is None:
+            return None
+        if not focused:
+            for max_height, name in self.thresholds:
+                if height <= max_height:
+                    return name
+        return 'full'
+
+    def media_options(self, name):
+        profile = self.PROFILES.get(name)
+        if profile is None:
+            return []
+        options = [
+            f"avcodec-threads={profile['threads']}",
+            f"avcodec-skip-frame={profile['skip_frame']}",
+            f"avcodec-skiploopfilter={profile['skip_loop_filter']}",
+        ]
+        if profile['fps']:
+            chain = f"{self.video_filter}:fps" if self.video_filter else 'fps'
+            options += [f"video-filter={chain}", f"fps-fps={profile['fps']}"]
+        return options
+
+    def apply(self, player, name, focused=False):
+        # Deinterlacing is a video output setting, so it can change without restarting the media
+        profile = self.PROFILES.get(name)
+        if profile is None or not self.deinterlace:
+            return
+        if focused:
+            profile = self.PROFILES['full']
+        try:
+            player.video_set_deinterlace(profile['deinterlace'])
+        except Exception as e:
+            print(f"Error setting deinterlace mode: {e}")
+
+
+class Tile:
+    """One grid cell: a VLC player, its video frame and the overlays drawn over it."""
+    __slots__ = ('player', 'video', 'placeholder', 'overlay', 'epg_overlay', 'chan_overlay', 'mute_overlay',
+                 'status_overlay', 'stats_overlay', 'url', 'variant', 'decoder', 'tuned', 'blocked')
+
+    def __init__(self, player, video, placeholder, overlay, epg_overlay, chan_overlay, mute_overlay, status_overlay,
+                 stats_overlay):
+        self.player = player
+        self.video = video
+        self.placeholder = placeholder
+        self.overlay = overlay
+        self.epg_overlay = epg_overlay
+        self.chan_overlay = chan_overlay
+        self.mute_overlay = mute_overlay
+        self.status_overlay = status_overlay
+        self.stats_overlay = stats_overlay
+        self.url = None
+        # Which lighter stream it's playing (see VariantSelector), None for the playlist's own
+        self.variant = None
+        # Its DecoderProfiles profile, None for libvlc's defaults
+        self.decoder = None
+        # Holding a tuner, or waiting for one to free up
+        self.tuned = False
+        self.blocked = False
+
+    def pixel_size(self):
+        """Size of the video frame in device pixels, what VLC actually has to fill."""
+        ratio = self.video.devicePixelRatioF()
+        return round(self.video.width() * ratio), round(self.video.height() * ratio)
+
+    def update_positions(self):
+        for overlay in (self.overlay, self.chan_overlay, self.mute_overlay, self.status_overlay, self.stats_overlay):
+            overlay.update_position()
+
+
+class StreamScheduler(QObject):
+    """Starts tile streams a few at a time, moving on as soon as one plays, fails or times out.
+
+    Tiles are started in priority order with at most `concurrency` connecting at once
+    (0 means all at once), instead of one per second regardless of how quickly they come up.
+    """
+    player_event = Signal(object, bool)
+    finished = Signal()
+    # Centre tile first, then the top row and middle column, then the rest
+    GRID_PRIORITY = [4, 0, 2, 1, 3, 5, 6, 7, 8]
+
+    def __init__(self, master_app, concurrency=2, timeout=8.0):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.concurrency = concurrency
+        self.timeout_ms = int(timeout * 1000)
+        self.queue = []
+        # id(player) -> (tile, attempt); the attempt number ties a timeout to the start it was set for
+        self.in_flight = {}
+        self.prepare = {}
+        self.attempts = 0
+        self.active = False
+        self.player_event.connect(self._on_player_event)
+
+    def watch(self, player):
+        # VLC calls back on its own threads; the signal hands the event to the GUI thread
+        em = player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerPlaying, lambda e, p=player: self.player_event.emit(p, True))
+        em.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda e, p=player: self.player_event.emit(p, False))
+
+    def priority(self, indices, focus=-1):
+        layout = self.master_app.tile_layout
+        order = [i for i in self.GRID_PRIORITY if i in indices] if (layout.rows, layout.cols) == (3, 3) else []
+        order += [i for i in indices if i not in order]
+        # In mixed layouts the big tiles come first
+        cells = layout.cells
+        order.sort(key=lambda i: -(cells[i][2] * cells[i][3]) if i < len(cells) else 0)
+        if focus in order:
+            order.remove(focus)
+            order.insert(0, focus)
+        return order
+
+    def start(self, tiles, prepare=None):
+        """Queue tiles to play; `prepare(tile)` runs when a tile's turn comes, just before it plays."""
+        for tile in tiles:
+            if prepare is not None:
+                self.prepare[id(tile)] = prepare
+            if tile not in self.queue and id(tile.player) not in self.in_flight:
+                self.queue.append(tile)
+        self._pump()
+
+    def discard(self, tile):
+        # The tile was tuned by hand; it no longer needs starting
+        self.prepare.pop(id(tile), None)
+        if tile in self.queue:
+            self.queue.remove(tile)
+
+    def cancel(self):
+        self.queue.clear()
+        self.in_flight.clear()
+        self.prepare.clear()
+        self.active = False
+
+    @property
+    def busy(self):
+        return bool(self.queue or self.in_flight)
+
+    def starting(self, tile):
+        return tile in self.queue or id(tile.player) in self.in_flight
+
+    def _pump(self):
+        while self.queue and (self.concurrency <= 0 or len(self.in_flight) < self.concurrency):
+            tile = self.queue.pop(0)
+            prepare = self.prepare.pop(id(tile), None)
+            if not tile.url or tile not in self.master_app.tiles:
+                continue
+            if prepare is not None:
+                prepare(tile)
+            if not self.master_app.admit_tile(tile):
+                continue
+            self.attempts += 1
+            self.in_flight[id(tile.player)] = (tile, self.attempts)
+            self.active = True
+            self.master_app.latency.mark(tile.player, 'play')
+            tile.player.play()
+            QTimer.singleShot(self.timeout_ms, lambda p=tile.player, a=self.attempts: self._on_timeout(p, a))
+        if self.active and not self.busy:
+            self.active = False
+            self.finished.emit()
+
+    def _settle(self, player, ok):
+        entry = self.in_flight.pop(id(player), None)
+        if entry is None:
+            return
+        tile = entry[0]
+        if not ok:
+            print(f"Stream failed to start: {tile.url}")
+        self.master_app._on_tile_started(tile)
+        self._pump()
+
+    def _on_player_event(self, player, ok):
+        self._settle(player, ok)
+
+    def _on_timeout(self, player, attempt):
+        # A timeout left over from an earlier start of the same player says nothing about this one
+        entry = self.in_flight.get(id(player))
+        if entry is not None and entry[1] == attempt:
+            self._settle(player, False)
+
+
+class HealthMonitor(QObject):
+    """Notices dead or stalled tiles and reconnects them with jittered exponential backoff.
+
+    VLC's error/end events catch streams that fail outright; the demux byte and decoded
+    frame counters from media.get_stats() catch ones that stop delivering without an error.
+    """
+    player_failed = Signal(object, str)
+
+    def __init__(self, master_app, interval=2.0, stall_timeout=6.0, backoff_base=1.0, backoff_max=30.0):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.stall_timeout = stall_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.health = {}
+        self.reconnect_count = 0
+        self.player_failed.connect(self._on_player_failed)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval * 1000))
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+
+    def watch(self, player):
+        em = player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda e, p=player: self.player_failed.emit(p, "error"))
+        em.event_attach(vlc.EventType.MediaPlayerEndReached, lambda e, p=player: self.player_failed.emit(p, "ended"))
+
+    def _state(self, tile):
+        # Keyed per tile and channel; a retune starts from a clean slate
+        state = self.health.get(id(tile))
+        if state is None or state['url'] != tile.url:
+            state = {'url': tile.url, 'progress': None, 'changed': time.monotonic(), 'attempts': 0,
+                     'healthy_since': None, 'pending': False}
+            self.health[id(tile)] = state
+        return state
+
+    def check(self):
+        now = time.monotonic()
+        live = set()
+        for tile in self.master_app.tiles:
+            if (not tile.url or not tile.tuned or self.master_app.visibility.is_dormant(tile)
+                    or self.master_app.governor.is_paused(tile)):
+                # Hidden and governor-paused tiles stop decoding on purpose
+                continue
+            live.add(id(tile))
+            state = self._state(tile)
+            if state['pending']:
+                continue
+            if self.master_app.stream_scheduler.starting(tile):
+                # Not up yet: the scheduler's start timeout covers it, the stall clock starts after
+                state['changed'] = now
+                continue
+            media = tile.player.get_media()
+            stats = vlc.MediaStats()
+            if media is None or not media.get_stats(stats):
+                continue
+            progress = (stats.demux_read_bytes, stats.decoded_video, stats.decoded_audio)
+            if progress != state['progress']:
+                state['progress'] = progress
+                state['changed'] = now
+                if state['attempts'] and tile.player.get_state() == vlc.State.Playing:
+                    # Only forget the backoff once the stream has stayed up for a while
+                    if state['healthy_since'] is None:
+                        state['healthy_since'] = now
+                        tile.status_overlay.clear_status()
+                    elif now - state['healthy_since'] > self.stall_timeout * 2:
+                        state['attempts'] = 0
+            elif now - state['changed'] > self.stall_timeout:
+                self.fail(tile, "stalled")
+        for key in [key for key in self.health if key not in live]:
+            del self.health[key]
+
+    def _on_player_failed(self, player, reason):
+        for tile in self.master_app.tiles:
+            if tile.player is player and tile.url and tile.tuned and not self.master_app.visibility.is_dormant(tile):
+                self.fail(tile, reason)
+                return
+
+    def fail(self, tile, reason):
+        state = self._state(tile)
+        if state['pending']:
+            return
+        state['pending'] = True
+        state['healthy_since'] = None
+        delay = min(self.backoff_max, self.backoff_base * 2 ** state['attempts']) * random.uniform(0.5, 1.5)
+        state['attempts'] += 1
+        print(f"Stream {reason}, reconnecting in {delay:.1f}s (attempt {state['attempts']}): {tile.url}")
+        tile.status_overlay.show_status("STALLED" if reason == "stalled" else "RECONNECTING")
+        QTimer.singleShot(int(delay * 1000), lambda t=tile, url=tile.url: self.reconnect(t, url))
+
+    def reconnect(self, tile, url):
+        state = self.health.get(id(tile))
+        if state is None or tile.url != url or tile not in self.master_app.tiles:
+            # Retuned or parked in the meantime
+            return
+        state['pending'] = False
+        state['progress'] = None
+        state['changed'] = time.monotonic()
+        self.reconnect_count += 1
+        tile.status_overlay.show_status("RECONNECTING")
+        tile.player.stop()
+        channel = self.master_app.channel_for_url(url)
+        latency = self.master_app.latency
+        latency.begin('reconnect')
+        latency.trace(tile.player, channel.name)
+        app = self.master_app
+        index = app.tiles.index(tile) if tile in app.tiles else -1
+        tile.player.set_media(app.tile_media(tile, channel, index))
+        latency.mark(tile.player, 'set_media')
+        latency.mark(tile.player, 'play')
+        tile.player.play()
+
+
+class VisibilityPolicy(QObject):
+    """Stops hidden tiles spending CPU on pictures nobody can see.
+
+    A tile hidden by single fullscreen, or every tile while the window is minimised, goes
+    'warm': its video and audio tracks are switched off, so it only demuxes and comes back
+    at the next keyframe. After `stop_after` seconds hidden it is stopped outright and
+    reconnects when shown again. mode 'stop' skips the warm stage, 'play' keeps the old
+    always-decoding behaviour.
+    """
+
+    def __init__(self, master_app, mode='warm', stop_after=60.0):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.mode = mode
+        self.stop_after = stop_after
+        # id(tile) -> {'tile', 'url', 'state' ('warm'/'stopped'), 'since', 'video', 'audio'}
+        self.dormant = {}
+        self.watched = None
+
+    def is_dormant(self, tile):
+        return id(tile) in self.dormant
+
+    def watch(self):
+        # Restoring or uncovering the window only shows up as an Expose on its native
+        # window, which arrives after WindowStateChange, so follow those too
+        handle = self.master_app.windowHandle()
+        if handle is not None and handle is not self.watched:
+            if self.watched is not None:
+                self.watched.removeEventFilter(self)
+            handle.installEventFilter(self)
+            self.watched = handle
+
+    def eventFilter(self, obj, event):
+        if obj is self.watched and event.type() == QEvent.Expose:
+            QTimer.singleShot(0, self.update)
+        return False
+
+    def tile_hidden(self, tile):
+        app = self.master_app
+        if app.isMinimized():
+            return True
+        handle = app.windowHandle()
+        if handle is not None and app.isVisible() and not handle.isExposed():
+            # Platforms that report occlusion (macOS, Wayland) mark a covered window unexposed
+            return True
+        return not tile.video.isVisible()
+
+    def update(self):
+        app = self.master_app
+        if self.mode == 'play' or not app.isVisible():
+            return
+        self.watch()
+        live = {id(tile) for tile in app.tiles}
+        for key, entry in list(self.dormant.items()):
+            if entry['tile'].url != entry['url']:
+                # Retuned or parked: the new media starts with its tracks on
+                del self.dormant[key]
+            elif key not in live:
+                # Swapped out but still on its channel, e.g. kept warm by the prefetcher
+                self.wake(entry['tile'])
+        for tile in app.tiles:
+            if not tile.url or not tile.tuned:
+                continue
+            hidden = self.tile_hidden(tile)
+            if hidden and not self.is_dormant(tile):
+                self.sleep(tile)
+            elif not hidden and self.is_dormant(tile):
+                self.wake(tile)
+
+    def sleep(self, tile):
+        player = tile.player
+        entry = {'tile': tile, 'url': tile.url, 'state': 'warm', 'since': time.monotonic(),
+                 'video': player.video_get_track(), 'audio': player.audio_get_track()}
+        self.dormant[id(tile)] = entry
+        if self.mode == 'stop':
+            self._stop(entry)
+            return
+        player.video_set_track(-1)
+        player.audio_set_track(-1)
+        if self.stop_after > 0:
+            QTimer.singleShot(int(self.stop_after * 1000), lambda e=entry: self._expire(e))
+
+    def _expire(self, entry):
+        tile = entry['tile']
+        if self.dormant.get(id(tile)) is entry and entry['state'] == 'warm' and tile.url == entry['url']:
+            self._stop(entry)
+
+    def _stop(self, entry):
+        entry['state'] = 'stopped'
+        entry['tile'].player.stop()
+
+    def wake(self, tile):
+        entry = self.dormant.pop(id(tile), None)
+        if entry is None:
+            return
+        player = tile.player
+        if entry['state'] == 'stopped':
+            latency = self.master_app.latency
+            latency.begin('wake')
+            latency.trace(player, self.master_app.channel_for_url(tile.url).name)
+            latency.mark(player, 'play')
+            player.play()
+            return
+        player.video_set_track(entry['video'] if entry['video'] != -1 else self._first_track(player.video_get_track_description()))
+        player.audio_set_track(entry['audio'] if entry['audio'] != -1 else self._first_track(player.audio_get_track_description()))
+        # A muted tile goes back to not decoding its audio
+        self.master_app.set_audio_decoding(player, player.audio_get_mute() != 1)
+
+    @staticmethod
+    def _first_track(tracks):
+        return next((track[0] for track in tracks or [] if track[0] != -1), -1)
+
+
+class ResourceGovernor(QObject):
+    """Steps unwatched tiles down to cheaper playback while the machine is struggling.
+
+    Every `interval` seconds it samples process CPU (as a share of all cores), resident
+    memory and the frames the tiles dropped. After two pressured samples in a row the tiles
+    that aren't focused go one level down: lighter stream and decoding, keyframes only,
+    audio off, paused. After three relaxed samples they come one level back up. The gap
+    between the high and low thresholds plus the streaks keep it from flapping.
+    """
+    LEVELS = ('normal', 'lighter', 'frame skip', 'audio off', 'paused')
+    LIGHTER, FRAME_SKIP, AUDIO_OFF, PAUSED = 1, 2, 3, 4
+    DOWN_AFTER = 2
+    UP_AFTER = 3
+
+    def __init__(self, master_app, interval=5.0, cpu_high=85.0, cpu_low=60.0, memory_mb=0, drop_high=10.0, enabled=False):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.memory_limit = memory_mb * 2 ** 20
+        self.drop_high = drop_high
+        self.level = 0
+        self.streak = 0
+        self.last = (time.monotonic(), time.process_time())
+        self.frames = {}
+        self.audio_off = {}
+        self.paused = {}
+        self.decisions = deque(maxlen=100)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval * 1000))
+        self.timer.timeout.connect(self.tick)
+        if enabled:
+            self.timer.start()
+
+    def is_paused(self, tile):
+        return id(tile) in self.paused
+
+    def decoder(self, index):
+        # Decoder profile forced on tile `index` at this level, None to leave it be
+        if self.level < self.LIGHTER or index in self.spared():
+            return None
+        return 'skip' if self.level >= self.FRAME_SKIP else 'low'
+
+    def sample(self):
+        now, cpu = time.monotonic(), time.process_time()
+        last_now, last_cpu = self.last
+        self.last = (now, cpu)
+        cpu_percent = (cpu - last_cpu) / max(now - last_now, 1e-6) / (os.cpu_count() or 1) * 100
+        shown = lost = 0
+        stats = vlc.MediaStats()
+        frames = {}
+        for tile in self.master_app.tiles:
+            media = tile.player.get_media() if tile.url else None
+            if media is None or not media.get_stats(stats):
+                continue
+            counts = (tile.url, stats.displayed_pictures, stats.lost_pictures)
+            previous = self.frames.get(id(tile))
+            if previous is not None and previous[0] == tile.url:
+                shown += max(0, counts[1] - previous[1])
+                lost += max(0, counts[2] - previous[2])
+            frames[id(tile)] = counts
+        self.frames = frames
+        drop_percent = lost * 100 / (shown + lost) if shown + lost else 0.0
+        return {'cpu_percent': round(cpu_percent, 1), 'rss_mb': round(process_rss() / 2 ** 20), 'drop_percent': round(drop_percent, 1)}
+
+    def tick(self):
+        reading = self.sample()
+        rss = reading['rss_mb'] * 2 ** 20
+        pressured = (reading['cpu_percent'] > self.cpu_high
+                     or (self.memory_limit and rss > self.memory_limit)
+                     or reading['drop_percent'] > self.drop_high)
+        relaxed = (reading['cpu_percent'] < self.cpu_low
+                   and (not self.memory_limit or rss < self.memory_limit * 0.85)
+                   and reading['drop_percent'] < self.drop_high / 2)
+        if pressured:
+            self.streak = min(self.streak, 0) - 1
+        elif relaxed:
+            self.streak = max(self.streak, 0) + 1
+        else:
+            self.streak = 0
+        if self.streak <= -self.DOWN_AFTER and self.level < len(self.LEVELS) - 1:
+            self.set_level(self.level + 1, reading)
+        elif self.streak >= self.UP_AFTER and self.level > 0:
+            self.set_level(self.level - 1, reading)
+        else:
+            self.enforce()
+
+    def set_level(self, level, reading=None):
+        previous, self.level, self.streak = self.level, level, 0
+        decision = {'time': time.time(), 'from': self.LEVELS[previous], 'to': self.LEVELS[level], **(reading or {})}
+        self.decisions.append(decision)
+        print(f"Governor: {decision['from']} -> {decision['to']} "
+              f"(cpu {decision.get('cpu_percent')}%, rss {decision.get('rss_mb')} MB, dropped {decision.get('drop_percent')}%)")
+        self.enforce()
+        if (previous >= self.LIGHTER) != (level >= self.LIGHTER) or (previous >= self.FRAME_SKIP) != (level >= self.FRAME_SKIP):
+            # Cheaper streams go in straight away; better ones through the overlap handover
+            self.master_app.refresh_streams(in_place=level > previous)
+
+    def spared(self):
+        """Indices of the tiles every level leaves alone: the watched one(s)."""
+        app = self.master_app
+        indices = [i for i, tile in enumerate(app.tiles) if tile.url and not app.visibility.is_dormant(tile)]
+        focused = [i for i in indices if app.tile_focused(i)]
+        if not focused and indices:
+            # Nothing has focus (everything's muted or audible): spare the tile that starts first
+            focused = app.stream_scheduler.priority(indices)[:1]
+        return set(focused)
+
+    def governed(self):
+        """Tiles the audio-off and pause levels apply to: every playing tile but the spared ones."""
+        app = self.master_app
+        spared = self.spared()
+        return [tile for i, tile in enumerate(app.tiles)
+                if tile.url and tile.tuned and not app.visibility.is_dormant(tile) and i not in spared]
+
+    def enforce(self):
+        governed = {id(tile): tile for tile in self.governed()} if self.level >= self.AUDIO_OFF else {}
+        dormant = self.master_app.visibility.is_dormant
+        for key, (tile, url, track) in list(self.audio_off.items()):
+            if tile.url != url:
+                del self.audio_off[key]
+            elif dormant(tile):
+                # Left as is until the tile is shown again
+                continue
+            elif key not in governed:
+                del self.audio_off[key]
+                if track != -1:
+                    tile.player.audio_set_track(track)
+        for key, (tile, url) in list(self.paused.items()):
+            if tile.url != url:
+                del self.paused[key]
+            elif dormant(tile):
+                continue
+            elif key not in governed or self.level < self.PAUSED:
+                del self.paused[key]
+                self.resume(tile)
+        for key, tile in governed.items():
+            # Look at the player rather than audio_off: unmuting selects the track again
+            track = tile.player.audio_get_track()
+            if track != -1:
+                self.audio_off[key] = (tile, tile.url, track)
+                tile.player.audio_set_track(-1)
+            elif key not in self.audio_off:
+                self.audio_off[key] = (tile, tile.url, track)
+            if self.level >= self.PAUSED and key not in self.paused:
+                self.paused[key] = (tile, tile.url)
+                tile.player.set_pause(1)
+
+    def resume(self, tile):
+        # Restarting rejoins the live stream instead of playing on from where it paused
+        latency = self.master_app.latency
+        latency.begin('resume')
+        latency.trace(tile.player, self.master_app.channel_for_url(tile.url).name)
+        tile.player.stop()
+        latency.mark(tile.player, 'play')
+        tile.player.play()
+
+    def stop(self):
+        self.timer.stop()
+        self.audio_off.clear()
+        self.paused.clear()
+
+
+class LatencyHistogram:
+    """Latency samples in fixed buckets, plus a bounded window of recent ones for percentiles."""
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+    def __init__(self, window=500):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000, 1),
+            'p95_ms': round(self.quantile(0.95) * 1000, 1),
+            'max_ms': round(self.max * 1000, 1),
+        }
+
+
+class LatencyTracer:
+    """Times each tile from a user action to its first video frame.
+
+    An action (startup, playlist reload, group switch, zap, dropdown, reconnect) opens a
+    trace on every player it (re)tunes; set_media, play and VLC's Opening/Buffering/Playing/
+    Vout events stamp it as they happen, and the first Vout closes it into per-action and
+    per-channel histograms.
+    """
+    STAGES = ('set_media', 'play', 'opening', 'buffering', 'playing', 'vout')
+    EVENTS = [
+        ('MediaPlayerOpening', 'opening'),
+        ('MediaPlayerBuffering', 'buffering'),
+        ('MediaPlayerPlaying', 'playing'),
+        ('MediaPlayerVout', 'vout'),
+    ]
+
+    def __init__(self, summary_path=None):
+        self.summary_path = summary_path
+        self.lock = threading.Lock()
+        self.pending = None
+        self.traces = {}
+        self.by_action = {}
+        self.by_channel = {}
+        self.stages = {}
+
+    def watch(self, player):
+        em = player.event_manager()
+        for event_name, stage in self.EVENTS:
+            em.event_attach(getattr(vlc.EventType, event_name), self._on_event, player, stage)
+
+    def _on_event(self, event, player, stage):
+        # Vout also fires with a count of 0 when the video output goes away
+        if stage == 'vout' and getattr(getattr(event, 'u', None), 'new_count', 1) == 0:
+            return
+        self.mark(player, stage)
+
+    def begin(self, action, started=None):
+        """Start timing a user action; players traced until control returns to the event loop are charged to it."""
+        pending = self.pending = (action, started if started is not None else time.perf_counter())
+        # Actions tune their players straight away, so anything traced later belongs to something else
+        QTimer.singleShot(0, lambda: self._end(pending))
+
+    def _end(self, pending):
+        if self.pending is pending:
+            self.pending = None
+
+    def trace(self, player, channel_name):
+        if self.pending is None:
+            return
+        action, started = self.pending
+        with self.lock:
+            self.traces[id(player)] = {'action': action, 'channel': channel_name, 'started': started, 'stages': {}}
+
+    def mark(self, player, stage):
+        now = time.perf_counter()
+        with self.lock:
+            trace = self.traces.get(id(player))
+            if trace is None:
+                return
+            trace['stages'].setdefault(stage, now - trace['started'])
+            if stage != 'vout':
+                return
+            del self.traces[id(player)]
+            action, channel = trace['action'], trace['channel']
+            self.by_action.setdefault(action, LatencyHistogram()).add(trace['stages']['vout'])
+            self.by_channel.setdefault(channel, LatencyHistogram()).add(trace['stages']['vout'])
+            stages = self.stages.setdefault(action, {})
+            for name, offset in trace['stages'].items():
+                stages.setdefault(name, LatencyHistogram()).add(offset)
+
+    def summary(self):
+        with self.lock:
+            return {
+                'actions': {
+                    action: {
+                        'first_frame': hist.summary(),
+                        'stages_p50_ms': {
+                            stage: round(self.stages[action][stage].quantile(0.5) * 1000, 1)
+                            for stage in self.STAGES if stage in self.stages.get(action, {})
+                        },
+                    }
+                    for action, hist in self.by_action.items()
+                },
+                'channels': {channel: hist.summary() for channel, hist in sorted(self.by_channel.items())},
+            }
+
+    def report(self):
+        """Print the summary and write it next to the caches."""
+        summary = self.summary()
+        if not summary['actions']:
+            return summary
+        print("Time to first frame:")
+        for action, data in summary['actions'].items():
+            ff = data['first_frame']
+            stages = ", ".join(f"{stage} {ms:.0f}" for stage, ms in data['stages_p50_ms'].items())
+            print(f"  {action:<10} n={ff['count']:<4} p50 {ff['p50_ms']:.0f}ms p95 {ff['p95_ms']:.0f}ms max {ff['max_ms']:.0f}ms ({stages})")
+        slowest = sorted(summary['channels'].items(), key=lambda item: item[1]['p50_ms'], reverse=True)[:5]
+        if slowest:
+            print("  slowest channels: " + ", ".join(f"{name} {data['p50_ms']:.0f}ms" for name, data in slowest))
+        if self.summary_path is not None:
+            try:
+                self.summary_path.parent.mkdir(parents=True, exist_ok=True)
+                self.summary_path.write_text(json.dumps(summary, indent=2))
+            except Exception as e:
+                print(f"Error writing latency summary: {e}")
+        return summary
+
+
+TileSample = namedtuple('TileSample', 'time input_bitrate demux_bitrate read_bytes demux_read_bytes decoded_video '
+                                       'displayed_pictures lost_pictures decoded_audio played_abuffers lost_abuffers '
+                                       'demux_corrupted demux_discontinuity')
+
+
+class TelemetryCollector(QObject):
+    """Samples every tile's libvlc stats at a fixed low rate and keeps a short history per tile.
+
+    The samples drive the optional stats overlays and, with `metrics_port` set, a
+    Prometheus text endpoint on localhost.
+    """
+    STATS_FIELDS = TileSample._fields[1:]
+    # VLC reports bitrates in bytes per microsecond
+    BITRATE_SCALE = 8_000_000
+    METRICS = [
+        ('mtp_input_bitrate_bits_per_second', 'input_bitrate', 'gauge', 'Input bitrate as read from the network'),
+        ('mtp_demux_bitrate_bits_per_second', 'demux_bitrate', 'gauge', 'Bitrate after demuxing'),
+        ('mtp_read_bytes_total', 'read_bytes', 'counter', 'Bytes read from the network'),
+        ('mtp_demux_read_bytes_total', 'demux_read_bytes', 'counter', 'Bytes read by the demuxer'),
+        ('mtp_decoded_video_frames_total', 'decoded_video', 'counter', 'Video frames decoded'),
+        ('mtp_displayed_frames_total', 'displayed_pictures', 'counter', 'Video frames displayed'),
+        ('mtp_lost_frames_total', 'lost_pictures', 'counter', 'Video frames dropped'),
+        ('mtp_decoded_audio_blocks_total', 'decoded_audio', 'counter', 'Audio blocks decoded'),
+        ('mtp_played_audio_buffers_total', 'played_abuffers', 'counter', 'Audio buffers played'),
+        ('mtp_lost_audio_buffers_total', 'lost_abuffers', 'counter', 'Audio buffers dropped'),
+        ('mtp_demux_corrupted_total', 'demux_corrupted', 'counter', 'Corrupted packets seen by the demuxer'),
+        ('mtp_demux_discontinuity_total', 'demux_discontinuity', 'counter', 'Stream discontinuities seen by the demuxer'),
+    ]
+
+    def __init__(self, master_app, interval=5.0, history=120, port=None):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.history = history
+        self.tiles = {}
+        self.lock = threading.Lock()
+        self.show_overlays = False
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval * 1000))
+        self.timer.timeout.connect(self.sample)
+        self.timer.start()
+        
+        self.server = None
+        if port:
+            self.start_server(int(port))
+
+    def sample(self):
+        app = self.master_app
+        now = time.time()
+        stats = vlc.MediaStats()
+        current = {}
+        for slot, tile in enumerate(app.tiles):
+            media = tile.player.get_media() if tile.url else None
+            if media is None or not media.get_stats(stats):
+                continue
+            entry = self.tiles.get(id(tile))
+            if entry is None or entry['url'] != tile.url:
+                # New channel, new counters
+                entry = {'url': tile.url, 'channel': app.channel_for_url(tile.url).name, 'samples': deque(maxlen=self.history)}
+            entry['tile'] = slot + 1
+            entry['samples'].append(TileSample(now, *(getattr(stats, field) for field in self.STATS_FIELDS)))
+            current[id(tile)] = entry
+            if self.show_overlays:
+                tile.stats_overlay.show_stats(self.describe(entry['samples']))
+        with self.lock:
+            self.tiles = current
+
+    def describe(self, samples):
+        last = samples[-1]
+        prev = samples[-2] if len(samples) > 1 else None
+        elapsed = (last.time - prev.time) if prev else 0
+        fps = (last.displayed_pictures - prev.displayed_pictures) / elapsed if elapsed > 0 else 0.0
+        return (
+            f"in    {last.input_bitrate * self.BITRATE_SCALE / 1000:7.0f} kb/s\n"
+            f"demux {last.demux_bitrate * self.BITRATE_SCALE / 1000:7.0f} kb/s\n"
+            f"fps   {fps:7.1f}\n"
+            f"lost  {last.lost_pictures:7d} frames\n"
+            f"lost  {last.lost_abuffers:7d} audio"
+        )
+
+    def set_overlays_visible(self, visible):
+        self.show_overlays = visible
+        if visible:
+            self.sample()
         else:
-            if getattr(self, '_cursor_hidden', False):
-                QApplication.restoreOverrideCursor()
-                self._cursor_hidden = False
-                    
-        # Fade controls window based on mouse activity
-        if hasattr(self, 'controls_window'):
-            controls = self.controls_window
+            for tile in self.master_app.tiles:
+                tile.stats_overlay.hide()
+
+    def metrics_text(self):
+        with self.lock:
+            entries = sorted(self.tiles.values(), key=lambda e: e['tile'])
+        lines = [
+            "# HELP mtp_tiles Tiles with a stream",
+            "# TYPE mtp_tiles gauge",
+            f"mtp_tiles {len(entries)}",
+            "# HELP mtp_reconnects_total Automatic stream reconnects",
+            "# TYPE mtp_reconnects_total counter",
+            f"mtp_reconnects_total {getattr(self.master_app.health_monitor, 'reconnect_count', 0)}",
+            "# HELP mtp_governor_level How far unwatched tiles are stepped down (0 normal .. 4 paused)",
+            "# TYPE mtp_governor_level gauge",
+            f"mtp_governor_level {getattr(getattr(self.master_app, 'governor', None), 'level', 0)}",
+        ]
+        for name, field, kind, help_text in self.METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            scale = self.BITRATE_SCALE if field.endswith('bitrate') else 1
+            for entry in entries:
+                channel = entry['channel'].replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+                value = getattr(entry['samples'][-1], field) * scale
+                lines.append(f'{name}{{tile="{entry["tile"]}",channel="{channel}"}} {value}')
+        latency = getattr(self.master_app, 'latency', None)
+        if latency is not None:
+            lines.append("# HELP mtp_first_frame_seconds Time from a user action to a tile's first video frame")
+            lines.append("# TYPE mtp_first_frame_seconds histogram")
+            with latency.lock:
+                histograms = sorted(latency.by_action.items())
+                for action, hist in histograms:
+                    cumulative = 0
+                    for bound, count in zip(hist.BUCKETS + ('+Inf',), hist.counts):
+                        cumulative += count
+                        lines.append(f'mtp_first_frame_seconds_bucket{{action="{action}",le="{bound}"}} {cumulative}')
+                    lines.append(f'mtp_first_frame_seconds_sum{{action="{action}"}} {hist.total}')
+                    lines.append(f'mtp_first_frame_seconds_count{{action="{action}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, port):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = collector.metrics_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        try:
+            self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            print(f"Metrics on http://127.0.0.1:{self.server.server_address[1]}/metrics")
+        except Exception as e:
+            print(f"Error starting metrics endpoint: {e}")
+            self.server = None
+
+    def stop(self):
+        self.timer.stop()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class ZapPrefetcher(QObject):
+    """Keeps the channels either side of the surfed tile playing in hidden, muted tiles.
+
+    Zapping to one of them swaps its already-playing frame into the grid instead of
+    connecting from scratch. At most `budget` extra streams are kept open, nearest first.
+    """
+
+    def __init__(self, master_app, depth=0, budget=2, delay=1500):
+        super().__init__(master_app)
+        self.master_app = master_app
+        self.depth = depth
+        self.budget = budget
+        self.warm = {}
+        
+        # Wait for zapping to settle so the visible stream gets the bandwidth first
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(delay)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    @property
+    def enabled(self):
+        return self.depth > 0 and self.budget > 0
+
+    def focus_index(self):
+        # Only the tile being surfed is worth pre-tuning around
+        app = self.master_app
+        if len(app.tiles) == 1:
+            return 0
+        if app.single_fs_active:
+            return app.single_fs_index
+        return -1
+
+    def schedule(self):
+        if not self.enabled:
+            return
+        if self.focus_index() < 0:
+            self.clear()
+        else:
+            self.refresh_timer.start()
+
+    def take(self, url):
+        tile = self.warm.pop(url, None) if url else None
+        if tile is not None and tile.player.get_state() in (vlc.State.Ended, vlc.State.Error):
+            self.release(tile)
+            return None
+        return tile
+
+    def adopt(self, tile):
+        # A tile zapped away from is usually the next one zapped back to, so keep it warm
+        if not self.enabled or not tile.url or tile.url in self.warm:
+            self.release(tile)
+            return
+        tile.overlay.set_mute_ui(True)
+        self.warm[tile.url] = tile
+        self._trim()
+
+    def _trim(self):
+        # Never hold more streams than the budget: drop the channels furthest from the surfed one
+        if len(self.warm) <= self.budget:
+            return
+        app = self.master_app
+        idx = self.focus_index()
+        index = app.channel_index
+        center = index.position_by_url.get(app.tiles[idx].url) if 0 <= idx < len(app.tiles) else None
+        n = len(index)
+
+        def distance(url):
+            pos = index.position_by_url.get(url)
+            if pos is None or center is None:
+                return n
+            d = abs(pos - center) % n
+            return min(d, n - d)
+
+        for url in sorted(self.warm, key=distance)[self.budget:]:
+            self.release(self.warm.pop(url))
+
+    def release(self, tile):
+        tile.player.stop()
+        self.master_app.muted_audio_tracks.pop(id(tile.player), None)
+        tile.url = None
+        tile.tuned = tile.blocked = False
+        self.master_app.tile_pool.append(tile)
+
+    def clear(self):
+        self.refresh_timer.stop()
+        for tile in self.warm.values():
+            self.release(tile)
+        self.warm.clear()
+
+    def refresh(self):
+        app = self.master_app
+        idx = self.focus_index()
+        if not self.enabled or idx < 0 or idx >= len(app.tiles) or app.instance is None:
+            self.clear()
+            return
+        if any(tile.blocked for tile in app.tiles):
+            # Tuners go to visible tiles first
+            self.clear()
+            return
+        live = {tile.url for tile in app.tiles}
+        wanted = [
+            (num, channel) for num, channel in app.channel_index.neighbours(app.tiles[idx].url, self.depth)
+            if channel.url and channel.url not in live
+        ]
+        if app.tuners.enabled:
+            # Channels on a mux that's already being received cost no extra tuner
+            in_use = app.tuners.muxes(app.channel_for_url(t.url) for t in app.tiles if t.tuned)
+            wanted.sort(key=lambda item: app.tuners.mux_for(item[1]) not in in_use)
+        wanted = wanted[:self.budget]
+        wanted_urls = {channel.url for _, channel in wanted}
+        
+        for url in [url for url in self.warm if url not in wanted_urls]:
+            self.release(self.warm.pop(url))
+        for num, channel in wanted:
+            if channel.url in self.warm:
+                continue
+            holders = [app.channel_for_url(t.url) for t in app.tiles + list(self.warm.values()) if t.tuned]
+            if not app.tuners.admits(channel, holders):
+                continue
+            tile = app.tile_pool.pop() if app.tile_pool else app._create_tile(idx, channel)
+            app._retune_tile(tile, channel, num, idx)
+            tile.tuned = True
+            tile.overlay.set_mute_ui(True)
+            tile.player.play()
+            self.warm[channel.url] = tile
+
+
+class MultiPlayerApp(QMainWindow):
+    first_frame = Signal()
+    # A tile's video frame changed size (see Tile.pixel_size)
+    tile_resized = Signal(object)
+    video_started = Signal(object)
+
+    def __init__(self, config):
+        super().__init__()
+        self.setWindowTitle("multi-tv-player")
+        self.setMinimumSize(640, 480)
+        self.setContentsMargins(0, 0, 0, 0)
+        
+        # We apply this universally to KILL any default Qt margins or lines
+        self.setStyleSheet("background-color: black; border: none;")
+
+        self.central_widget = QWidget()
+        self.central_widget.setStyleSheet("background-color: black; margin: 0px; padding: 0px; border: none;")
+        self.setCentralWidget(self.central_widget)
+        self.grid_layout = QGridLayout(self.central_widget)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+        self.grid_layout.setSpacing(0)
+
+        self.is_fullscreen = False
+        # Live tiles in grid order, plus spares parked by a smaller group
+        self.tiles = []
+        self.tile_pool = []
+        self.players = []
+        self.videos = []
+        self.overlays = []
+        self.channel_overlays = []
+        self.mute_overlays = []
+        self.status_overlays = []
+        self.stats_overlays = []
+        self.tile_by_video = {}
+        
+        self.show_epg_overlays = True
+        self.epg_mode = 'hover'
+        self.epg_data = {}
+        self.epg_overlays = []
+        self.grid_rows = 2
+        self.grid_cols = 2
+        self.tile_layout = TileLayout.build("2x2", 4)
+        
+        self.single_fs_active = False
+        self.single_fs_index = -1
+
+        self.config = config
+        self.cache_dir = self.get_cache_dir()
+        # Fastboot skips the channel number overrides and starts every stream at once
+        self.fastboot = bool(self.config.get('fastboot', False)) or os.path.exists(".fastboot")
+        self.latency = LatencyTracer(self.cache_dir / "latency.json")
+        self.stream_scheduler = StreamScheduler(
+            self,
+            concurrency=0 if self.fastboot else int(self.config.get('stream_start_concurrency', 2) or 0),
+            timeout=float(self.config.get('stream_start_timeout', 8)),
+        )
+        self.stream_scheduler.finished.connect(self._on_streams_started)
+        self.health_monitor = HealthMonitor(self, stall_timeout=float(self.config.get('stream_stall_timeout', 6)))
+        self.visibility = VisibilityPolicy(
+            self,
+            mode=self.config.get('hidden_tiles', 'warm'),
+            stop_after=float(self.config.get('hidden_stop_after', 60) or 0),
+        )
+        self.governor = ResourceGovernor(
+            self,
+            interval=float(self.config.get('governor_interval', 5)),
+            cpu_high=float(self.config.get('governor_cpu_high', 85)),
+            cpu_low=float(self.config.get('governor_cpu_low', 60)),
+            memory_mb=int(self.config.get('governor_memory_mb', 0) or 0),
+            drop_high=float(self.config.get('governor_drop_high', 10)),
+            enabled=bool(self.config.get('governor', False)),
+        )
+        self.telemetry = TelemetryCollector(
+            self,
+            interval=float(self.config.get('telemetry_interval', 5)),
+            history=int(self.config.get('telemetry_history', 120)),
+            port=self.config.get('metrics_port'),
+        )
+        self.tuners = TunerAdmission(int(self.config.get('tuners', 0) or 0), self.config.get('channel_muxes'))
+        self.mux_map_path = self.cache_dir / "muxes.json"
+        self.mux_programs = load_mux_map(self.mux_map_path)
+        self.tuners.learned = {key: mux for key, (mux, _) in self.mux_programs.items()}
+        self.mux_relay = None
+        if self.config.get('mux_streaming'):
+            # Tiles on the same mux share one connection, demultiplexed locally
+            template = self.config.get('mux_stream_url') or "{tvh_url}/stream/mux/{mux}"
+            self.mux_relay = MuxRelay(template.replace("{tvh_url}", self.get_tvh_url())).start()
+        self.variants = VariantSelector(
+            self,
+            profiles=self.config.get('stream_profiles'),
+            hls=bool(self.config.get('hls_variants', True)),
+        )
+        self.variants.loaded.connect(self.refresh_variants)
+        # Muted tiles have their audio track switched off instead of decoded and thrown away
+        self.decode_muted_audio = bool(self.config.get('decode_muted_audio', False))
+        self.muted_audio_tracks = {}
+        # A frame-rate cap joins any video filters set through vlc_options rather than replacing them
+        video_filter = ''
+        options = self.vlc_options()
+        for n, option in enumerate(options):
+            if option.startswith('--video-filter='):
+                video_filter = option.split('=', 1)[1]
+            elif option == '--video-filter' and n + 1 < len(options):
+                video_filter = options[n + 1]
+        self.decoder_profiles = DecoderProfiles(
+            self.config.get('decoder_profiles', {}),
+            deinterlace=bool(self.config.get('decoder_deinterlace', False)),
+            video_filter=video_filter,
+        )
+        self.handovers = {}
+        # Layout and fullscreen changes settle before tiles switch streams
+        self.variant_timer = QTimer(self)
+        self.variant_timer.setSingleShot(True)
+        self.variant_timer.setInterval(300)
+        self.variant_timer.timeout.connect(self._refresh_variants)
+        self.prefetcher = ZapPrefetcher(
+            self,
+            depth=int(self.config.get('zap_prefetch_depth', 0) or 0),
+            budget=int(self.config.get('zap_prefetch_budget', 2) or 0),
+        )
+        self.epg_fetcher = EPGFetcher(self.get_tvh_url(), cache=EPGCache(self.cache_dir / "epg.sqlite3"))
+        self.epg_fetcher.data_ready.connect(self.on_epg_data_ready)
+        self.startup_timings = {}
+        
+        # Nothing below blocks on the network or the disk: the EPG cache, the playlist and
+        # the EPG are read concurrently in the background, and the window is shown straight away.
+        self.epg_fetcher.start()
+        self.load_channels_from_url()
+
+        # A group is a list of channels, or {layout: ..., channels: [...]} (see TileLayout)
+        groups = list(self.config['stream_groups'].values())
+        self.stream_groups_numbers = [g.get('channels', []) if isinstance(g, dict) else g for g in groups]
+        self.group_layouts = [g.get('layout') if isinstance(g, dict) else None for g in groups]
+        self.all_groups_labels = list(self.config['stream_groups'].keys())
+        self.stream_groups = self.resolve_stream_groups()
+        self.original_stream_groups = copy.deepcopy(self.stream_groups)
+        self.current_group_index = 0
+
+        # Set application palette to pure black just in case
+        palette = self.palette()
+        palette.setColor(self.backgroundRole(), Qt.black)
+        self.setPalette(palette)
+
+        # VLC and the players are created once the window is on screen (see start_playback)
+        self.instance = None
+        self.placeholders = []
+        self._on_vout_cb = lambda e: self.first_frame.emit()
+        self.first_frame.connect(self._on_first_frame)
+        self.video_started.connect(self._on_video_started)
+        self.video_started.connect(self._on_audio_ready)
+        self.stream_scheduler.player_event.connect(self._on_audio_ready)
+        self.tile_resized.connect(self.refresh_variants)
+        self.stream_scheduler.player_event.connect(self._on_handover_event)
+        
+        # Shortcuts
+        QShortcut(QKeySequence("M"), self, self.handle_mute_toggle, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("S"), self, self.handle_sub_toggle, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("I"), self, self.toggle_stats_overlays, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("L"), self, self.latency.report, context=Qt.ApplicationShortcut)
+        for i in range(1, 10):
+            QShortcut(QKeySequence(str(i)), self, lambda checked=False, idx=i-1: self.handle_number_shortcut(idx), context=Qt.ApplicationShortcut)
             
-            if getattr(self, 'single_fs_active', False):
-                # Completely hide the global controls in single fullscreen
-                if controls.opacity_effect.opacity() > 0 or controls.isVisible():
-                    controls.fade_out()
-            else:
-                mapped_controls = controls.mapFromGlobal(pos)
-                over_controls = controls.isVisible() and controls.rect().contains(mapped_controls)
-                
-                # Check if mouse is hovering over the main application window
-                mapped_main = self.mapFromGlobal(pos)
-                over_main_window = self.rect().contains(mapped_main)
-                
-                # Make the HUD disappear faster (0.5s) than the video controls
-                hud_is_idle = idle_time >= 0.5
-                
-                if (hud_is_idle and not over_controls) or not over_main_window:
-                    if controls.opacity_effect.opacity() > 0 or controls.isVisible():
-                        controls.fade_out()
-                elif over_main_window:
-                    controls.fade_in()
+        QShortcut(QKeySequence("F11"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("F"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("0"), self, self.toggle_app_fullscreen, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("Esc"), self, self.handle_escape, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("*"), self, self.close, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("Ctrl+W"), self, self.close, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("Up"), self, self.unmute_all, context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("Down"), self, self.mute_all, context=Qt.ApplicationShortcut)
+        
+        QShortcut(QKeySequence("Left"), self, lambda: self.handle_arrow_cycle(-1), context=Qt.ApplicationShortcut)
+        QShortcut(QKeySequence("Right"), self, lambda: self.handle_arrow_cycle(1), context=Qt.ApplicationShortcut)
+            
+        # Default main window size to 1080p instead of forcing borderless fullscreen
+        self.resize(1920, 1080)
+
+        # Hover overlays, the HUD and the cursor follow mouse events; nothing polls
+        self.hover_tracker = HoverTracker(self)
+        self.hover_tracker.track(self)
+        
+        self.installEventFilter(self)
+
+    def tile_at(self, global_pos):
+        # Grid arithmetic instead of hit-testing every video widget
+        if not self.videos:
+            return -1
+        local = self.central_widget.mapFromGlobal(global_pos)
+        w, h = self.central_widget.width(), self.central_widget.height()
+        if w <= 0 or h <= 0 or not (0 <= local.x() < w and 0 <= local.y() < h):
+            return -1
+        if self.single_fs_active:
+            return self.single_fs_index
+        idx = self.tile_layout.index_at(local.y() * self.grid_rows // h, local.x() * self.grid_cols // w)
+        return idx if idx < len(self.videos) else -1
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         for t in [10, 50, 200, 500]:
             QTimer.singleShot(t, lambda: [o.update_position() for o in self.overlays])
             QTimer.singleShot(t, lambda: [e.update_position() for e in getattr(self, 'epg_overlays', [])])
+            QTimer.singleShot(t, lambda: [s.update_position() for s in self.status_overlays + self.stats_overlays])
             
         if hasattr(self, 'controls_window'):
             for t in [10, 50, 200, 500]:
@@ -1126,12 +3572,14 @@ class MultiPlayerApp(QMainWindow):
         for t in [10, 50, 200, 500]:
             QTimer.singleShot(t, lambda: [o.update_position() for o in self.overlays])
             QTimer.singleShot(t, lambda: [c.update_position() for c in self.channel_overlays])
+            QTimer.singleShot(t, lambda: [s.update_position() for s in self.status_overlays + self.stats_overlays])
             QTimer.singleShot(t, lambda: [e.update_position() for e in getattr(self, 'epg_overlays', [])])
 
     def showEvent(self, event):
         super().showEvent(event)
-        import sys
-        import os
+        if 'window' not in self.startup_timings:
+            self.startup_timings['window'] = time.perf_counter() - PROCESS_START
+            QTimer.singleShot(0, self.start_playback)
         if sys.platform == 'win32':
             try:
                 import ctypes
@@ -1172,12 +3620,15 @@ class MultiPlayerApp(QMainWindow):
                 return True
                 
         if event.type() in (QEvent.Move, QEvent.Resize):
-            for overlay in self.overlays:
-                overlay.update_position()
-            for chan_overlay in getattr(self, 'channel_overlays', []):
-                chan_overlay.update_position()
-            for mute_overlay in getattr(self, 'mute_overlays', []):
-                mute_overlay.update_position()
+            tile = self.tile_by_video.get(id(obj))
+            if tile is not None:
+                # One tile moved or resized: only its own overlays follow, not every tile's
+                tile.update_positions()
+                if event.type() == QEvent.Resize:
+                    self.tile_resized.emit(tile)
+            else:
+                for tile in self.tiles:
+                    tile.update_positions()
                 
         elif event.type() == QEvent.MouseButtonRelease:
             if obj in self.videos:
@@ -1248,65 +3699,72 @@ class MultiPlayerApp(QMainWindow):
         current_streams = self.stream_groups[self.current_group_index]
         if video_index >= len(current_streams): return
         
-        current_url = current_streams[video_index][1]
-        
         try:
-            sorted_channels = sorted(
-                self.channels_by_number.items(), 
-                key=lambda item: int(item[0]) if str(item[0]).isdigit() else 999999
-            )
-            # Find current channel index in the sorted list
-            current_sorted_index = -1
-            for idx, (num, data) in enumerate(sorted_channels):
-                if data[1] == current_url:
-                    current_sorted_index = idx
-                    break
-                    
-            if current_sorted_index != -1:
-                next_index = (current_sorted_index + direction) % len(sorted_channels)
-                next_channel_num, next_channel_data = sorted_channels[next_index]
-                
-                # Switch the video player
-                media = self.create_media(next_channel_data[0], next_channel_data[1])
-                self.players[video_index].set_media(media)
-                self.players[video_index].play()
-                
-                # Update the stream array
-                current_streams[video_index] = next_channel_data
-                
-                # Update the 1x1 preset array specifically so state is maintained globally
-                if hasattr(self, 'all_groups_labels'):
-                    try:
-                        one_by_one_idx = self.all_groups_labels.index('1x1')
-                        if self.current_group_index == one_by_one_idx:
-                            self.stream_groups[one_by_one_idx] = [next_channel_data]
-                    except ValueError:
-                        pass
-                
-                # Update UI overlays
-                if video_index < len(self.channel_overlays):
-                    self.channel_overlays[video_index].real_channel_number = str(next_channel_num)
-                    self.channel_overlays[video_index].show_number()
-                    
-                if hasattr(self, 'epg_overlays') and video_index < len(self.epg_overlays):
-                    self.epg_overlays[video_index].channel_name = next_channel_data[0]
-                    epg_data = getattr(self, 'epg_data', {})
-                    self.epg_overlays[video_index].update_data(epg_data.get(next_channel_data[0], {}))
-                    
-                # Update the dropdown if it is visible
-                if video_index < len(self.overlays):
-                    dropdown = getattr(self.overlays[video_index], 'channel_dropdown', None)
-                    if dropdown:
-                        dropdown.blockSignals(True)
-                        for idx in range(dropdown.count()):
-                            num = dropdown.itemData(idx)
-                            if num == str(next_channel_num):
-                                dropdown.setCurrentIndex(idx)
-                                break
-                        dropdown.blockSignals(False)
+            stepped = self.channel_index.step(current_streams[video_index].url, direction)
+            if stepped:
+                self.tune_tile(video_index, stepped[0], action='zap')
         except Exception as e:
             print(f"Error cycling channel: {e}")
 
+    def tune_tile(self, video_index, channel_num, action='tune'):
+        """Switch one tile to another channel and bring its overlays and presets along."""
+        position = self.channel_index.position_by_number.get(str(channel_num))
+        if position is None or video_index >= len(self.players):
+            return
+        channel = self.channel_index.records[position]
+        self.latency.begin(action)
+        
+        # Switch the video player, or swap in a pre-tuned one that's already playing
+        warm = self.prefetcher.take(channel.url)
+        if warm is not None:
+            self._swap_tile(video_index, warm)
+            # Already drawing: the swap itself is the whole wait
+            self.latency.trace(warm.player, channel.name)
+            self.latency.mark(warm.player, 'vout')
+        else:
+            tile = self.tiles[video_index]
+            self.stream_scheduler.discard(tile)
+            tile.player.stop()
+            self.latency.trace(tile.player, channel.name)
+            tile.url = channel.url
+            tile.tuned = tile.blocked = False
+            tile.status_overlay.status = None
+            tile.status_overlay.hide()
+            tile.player.set_media(self.tile_media(tile, channel, video_index))
+            self.latency.mark(tile.player, 'set_media')
+            if self.admit_tile(tile):
+                tile.placeholder.setText(f"{channel.name}\nLoading...")
+                self.latency.mark(tile.player, 'play')
+                tile.player.play()
+        
+        # Update the stream array
+        current_streams = self.stream_groups[self.current_group_index]
+        if video_index < len(current_streams):
+            current_streams[video_index] = channel
+            self.update_epg_watch()
+            
+            if video_index < len(self.epg_overlays):
+                self.epg_overlays[video_index].channel_name = channel.name
+                self.epg_overlays[video_index].update_data(self.epg_data.get(channel.name, {}))
+        
+        # Update the 1x1 preset array specifically so state is maintained globally
+        try:
+            one_by_one_idx = self.all_groups_labels.index('1x1')
+            if self.current_group_index == one_by_one_idx:
+                self.stream_groups[one_by_one_idx] = [channel]
+        except ValueError:
+            pass
+        
+        # Update Top Left Number
+        if video_index < len(self.channel_overlays):
+            self.channel_overlays[video_index].real_channel_number = str(channel_num)
+            self.channel_overlays[video_index].show_number()
+            
+        if video_index < len(self.overlays):
+            self.overlays[video_index].select_channel(position)
+        self.retry_blocked()
+        self.prefetcher.schedule()
+
     def handle_single_click(self, index, is_left_click=True):
         if index < len(self.overlays):
             unmuted_indices = [i for i, o in enumerate(self.overlays) if not o.player.audio_get_mute()]
@@ -1338,6 +3796,12 @@ class MultiPlayerApp(QMainWindow):
             if len(new_unmuted) == 1:
                 self.last_unmuted_index = new_unmuted[0]
 
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            # Minimising sends every tile to sleep; restoring wakes them
+            self.visibility.update()
+        super().changeEvent(event)
+
     def update_window_state(self):
         app_fs = getattr(self, 'app_fs_active', False)
         if app_fs or self.single_fs_active:
@@ -1415,6 +3879,11 @@ class MultiPlayerApp(QMainWindow):
             self.overlays[index].fs_btn.setText("🗖")
             for chan_overlay in getattr(self, 'channel_overlays', []):
                 chan_overlay.show_number()
+            for status_overlay in self.status_overlays:
+                if status_overlay.status:
+                    status_overlay.show_status(status_overlay.status)
+            if self.telemetry.show_overlays:
+                self.telemetry.sample()
                 
             for epg in getattr(self, 'epg_overlays', []):
                 QTimer.singleShot(100, epg.update_position)
@@ -1422,8 +3891,7 @@ class MultiPlayerApp(QMainWindow):
             self.update_window_state()
         else:
             # Go single fullscreen
-            import time
-            self.force_show_overlays_until = time.time() + 1.6
+            self.force_show_overlays_until = time.time() + HoverTracker.OVERLAY_IDLE
             for i, v in enumerate(self.videos):
                 if i != index:
                     v.hide()
@@ -1435,6 +3903,9 @@ class MultiPlayerApp(QMainWindow):
                     if i < len(getattr(self, 'mute_overlays', [])):
                         self.mute_overlays[i].hide()
                         self.mute_overlays[i].hide_timer.stop()
+                    if i < len(self.status_overlays):
+                        self.status_overlays[i].hide()
+                        self.stats_overlays[i].hide()
             self.videos[index].show()
             self.single_fs_active = True
             
@@ -1462,22 +3933,26 @@ class MultiPlayerApp(QMainWindow):
             self.update_window_state()
             
         self.setUpdatesEnabled(True)
+        self.hover_tracker.refresh(force=True)
+        self.prefetcher.schedule()
+        self.visibility.update()
+        self._refresh_variants()
         
         for delay in (10, 50, 200, 500):
             QTimer.singleShot(delay, lambda: [o.update_position() for o in self.overlays])
             QTimer.singleShot(delay, lambda: [c.update_position() for c in getattr(self, 'channel_overlays', [])])
             QTimer.singleShot(delay, lambda: [m.update_position() for m in getattr(self, 'mute_overlays', [])])
+            QTimer.singleShot(delay, lambda: [s.update_position() for s in self.status_overlays + self.stats_overlays])
             QTimer.singleShot(delay, lambda: [e.update_position() for e in getattr(self, 'epg_overlays', [])])
 
     def on_epg_data_ready(self, data):
+        self.startup_timings.setdefault('epg', time.perf_counter() - PROCESS_START)
         self.epg_data = data
         for overlay in self.epg_overlays:
             if hasattr(overlay, 'channel_name'):
                 overlay.update_data(data.get(overlay.channel_name, {}))
                 
-        for overlay in self.overlays:
-            if hasattr(overlay, 'update_epg_labels'):
-                overlay.update_epg_labels(data)
+        self.channel_model.update_epg(data)
                 
         if getattr(self, 'epg_mode', 'locked') == 'locked':
             for o in self.epg_overlays:
@@ -1495,174 +3970,586 @@ class MultiPlayerApp(QMainWindow):
                 o.fade_in()
 
     def closeEvent(self, event):
+        self.latency.report()
+        self.telemetry.stop()
+        self.stream_scheduler.cancel()
+        self.prefetcher.clear()
+        self.cancel_handovers()
+        self.visibility.dormant.clear()
+        self.governor.stop()
+        if self.mux_relay is not None:
+            self.mux_relay.stop()
         if hasattr(self, 'epg_fetcher'):
-            self.epg_fetcher.running = False
+            self.epg_fetcher.stop()
             self.epg_fetcher.wait(1000)
         super().closeEvent(event)
 
+    def get_cache_dir(self):
+        if self.config.get('cache_dir'):
+            return Path(self.config['cache_dir']).expanduser()
+        return Path.home() / ".cache" / "multi-tv-player"
+
+    def get_tvh_url(self):
+        # Explicit tvh_url wins, otherwise assume the playlist is served by TVHeadend itself
+        if self.config.get('tvh_url'):
+            return self.config['tvh_url'].rstrip('/')
+        parts = urlsplit(self.config['playlist_url'])
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def update_epg_watch(self):
+        if hasattr(self, 'epg_fetcher') and hasattr(self, 'stream_groups'):
+            current_streams = self.stream_groups[self.current_group_index]
+            self.epg_fetcher.set_watched_channels([channel.name for channel in current_streams])
+
+    def on_mux_map_loaded(self, muxes):
+        if muxes:
+            # Tiles already playing keep their connection; the relay picks up new tunes
+            self.mux_programs = muxes
+            self.tuners.learned = {key: mux for key, (mux, _) in muxes.items()}
+        self.retry_blocked()
+
+    def stream_url(self, channel):
+        if self.mux_relay is not None:
+            for key in (channel.tvg_id, channel.number, channel.name):
+                program = self.mux_programs.get(key) if key else None
+                if program and program[1]:
+                    return self.mux_relay.url_for(*program)
+        return channel.url
+
+    def channel_for_url(self, url):
+        position = self.channel_index.position_by_url.get(url)
+        if position is None:
+            return Channel(url, url)
+        return self.channel_index.records[position]
+
+    def admit_tile(self, tile):
+        """Let a tile take a tuner if its mux is already received or a tuner is free."""
+        channel = self.channel_for_url(tile.url)
+        holders = [self.channel_for_url(t.url) for t in self.tiles + list(self.prefetcher.warm.values()) if t.tuned and t is not tile]
+        if not self.tuners.admits(channel, holders) and self.prefetcher.warm:
+            # Visible tiles come before pre-tuned ones
+            self.prefetcher.clear()
+            holders = [self.channel_for_url(t.url) for t in self.tiles if t.tuned and t is not tile]
+        tile.tuned = self.tuners.admits(channel, holders)
+        tile.blocked = not tile.tuned
+        if tile.blocked:
+            tile.player.stop()
+            tile.placeholder.setText(f"{channel.name}\nNo tuner available")
+            tile.placeholder.show()
+        return tile.tuned
+
+    def retry_blocked(self):
+        blocked = [i for i, t in enumerate(self.tiles) if t.blocked]
+        if blocked:
+            order = self.stream_scheduler.priority(blocked, self.tile_at(QCursor.pos()))
+            self.stream_scheduler.start([self.tiles[i] for i in order])
+
     def load_channels_from_url(self):
         url = self.config['playlist_url']
-        self.channels = {}            
-        self.channels_by_number = {}  
+        self.playlist_cache = PlaylistCache(self.cache_dir)
+        
+        # Start from the last good list if we have one; the loader revalidates it in the background
+        snapshot = self.playlist_cache.load(url)
+        self.channels = snapshot['channels'] if snapshot else {}
+        self.channels_by_number = snapshot['channels_by_number'] if snapshot else {}
+        self.channel_index = ChannelIndex(self.channels_by_number, self.channels)
+        self.channel_model = ChannelListModel(self)
+        self.channel_model.set_channel_index(self.channel_index, self.epg_data)
+        
+        self.playlist_loader = PlaylistLoader(url, self.playlist_cache)
+        self.playlist_loader.loaded.connect(self.on_playlist_loaded)
+        self.playlist_loader.start()
+        
+        if self.tuners.enabled or self.mux_relay is not None:
+            self.mux_loader = MuxMapLoader(self.get_tvh_url(), self.mux_map_path)
+            self.mux_loader.loaded.connect(self.on_mux_map_loaded)
+            self.mux_loader.start()
 
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            lines = response.text.splitlines()
-        except requests.RequestException as e:
-            print(f"Error fetching playlist: {e}")
+    def resolve_channel(self, key):
+        # Groups normally list channel numbers, but names work for unnumbered channels
+        key = str(key)
+        channel = self.channels_by_number.get(key) or self.channel_index.by_name.get(key)
+        if channel is None:
+            # Not in the playlist (yet): placeholder with no URL
+            channel = Channel(f"Channel {key}", None, key)
+        return channel
+
+    def resolve_stream_groups(self):
+        return [[self.resolve_channel(key) for key in group] for group in self.stream_groups_numbers]
+
+    def on_playlist_loaded(self, channels, channels_by_number):
+        first_load = 'playlist' not in self.startup_timings
+        self.startup_timings.setdefault('playlist', time.perf_counter() - PROCESS_START)
+        if not channels_by_number:
+            return
+        self.channels = channels
+        self.channels_by_number = channels_by_number
+        self.channel_index = ChannelIndex(channels_by_number, channels)
+        # Resetting the model moves every combo's selection, so keep that from retuning tiles
+        for overlay in self.overlays:
+            overlay.channel_dropdown.blockSignals(True)
+        self.channel_model.set_channel_index(self.channel_index, self.epg_data)
+        for overlay in self.overlays:
+            overlay.channel_dropdown.blockSignals(False)
+        
+        old_original = self.original_stream_groups
+        self.original_stream_groups = self.resolve_stream_groups()
+        if 'vlc' in self.startup_timings and first_load:
+            # Tiles waiting on the first playlist still count towards startup
+            self.latency.begin('startup', PROCESS_START + self.startup_timings['vlc'])
+        else:
+            self.latency.begin('playlist')
+        to_start = []
+        for g, group in enumerate(self.stream_groups):
+            for i, entry in enumerate(group):
+                resolved = self.original_stream_groups[g][i]
+                # Leave tiles alone if the user already tuned them elsewhere
+                if entry != old_original[g][i] or entry == resolved:
+                    continue
+                group[i] = resolved
+                if g == self.current_group_index and i < len(self.players):
+                    self._start_tile(i)
+                    to_start.append(i)
+        order = self.stream_scheduler.priority(to_start, self.tile_at(QCursor.pos()))
+        self.stream_scheduler.start([self.tiles[i] for i in order])
+        for overlay in self.overlays:
+            overlay.sync_channel_selection()
+        self.update_epg_watch()
+        self.prefetcher.schedule()
+
+    def _start_tile(self, i):
+        channel = self.stream_groups[self.current_group_index][i]
+        name = channel.name
+        self.tiles[i].url = channel.url
+        self.tiles[i].tuned = self.tiles[i].blocked = False
+        self.latency.trace(self.players[i], name)
+        self.players[i].set_media(self.tile_media(self.tiles[i], channel, i))
+        self.latency.mark(self.players[i], 'set_media')
+        if i < len(self.epg_overlays):
+            self.epg_overlays[i].channel_name = name
+            self.epg_overlays[i].update_data(self.epg_data.get(name, {}))
+        if i < len(self.placeholders):
+            self.placeholders[i].setText(f"{name}\nLoading...")
+
+    def vlc_options(self):
+        extra = self.config.get('vlc_options') or []
+        if isinstance(extra, str):
+            extra = extra.split()
+        return list(extra)
+
+    def start_playback(self):
+        if self.instance is not None:
             return
+        # Force VLC to use Direct3D11, as older renderers (Direct3D9) often create a 1px border
+        # Extra libvlc arguments from the config come last, so they override these (e.g. --vout=dummy)
+        extra = self.vlc_options()
+        caching = int(self.config.get('network_caching', 100))
+        self.instance = vlc.Instance('--quiet', f'--network-caching={caching}', "--aout=directsound", "--vout=direct3d11", "--no-keyboard-events", *extra)
+        self.startup_timings['vlc'] = time.perf_counter() - PROCESS_START
+        self.latency.begin('startup')
+        self.setup_players(self.stream_groups[self.current_group_index])
+
+    def _on_first_frame(self):
+        if 'first_frame' in self.startup_timings:
+            return
+        self.startup_timings['first_frame'] = time.perf_counter() - PROCESS_START
+        report = ", ".join(f"{k} {v:.2f}s" for k, v in self.startup_timings.items())
+        print(f"Startup timings: {report}")
 
-        for i in range(len(lines)):
-            line = lines[i].strip()
-            if line.startswith('#EXTINF'):
-                name_match = line.split(',', 1)
-                channel_name = name_match[1].strip() if len(name_match) > 1 else f"Unknown_{i}"
+    def slot_height(self, i):
+        """Device pixels tile i is drawn at, going by the layout rather than the widget."""
+        ratio = self.devicePixelRatioF()
+        height = self.central_widget.height() or self.height()
+        if self.single_fs_active and i == self.single_fs_index:
+            return round(height * ratio)
+        if i >= len(self.tile_layout.cells):
+            return None
+        return round(height * self.tile_layout.cells[i][2] / self.tile_layout.rows * ratio)
 
-                if 'HD' in channel_name:
-                    print(line)
+    def tile_focused(self, i):
+        # The tile being watched: the single-fullscreen one, or the one left unmuted
+        if self.single_fs_active:
+            return i == self.single_fs_index
+        unmuted = [j for j, tile in enumerate(self.tiles) if tile.player.audio_get_mute() == 0]
+        return i in unmuted and len(unmuted) < len(self.tiles)
 
-                chno_match = re.search(r'tvg-chno="(\d+)"', line)
-                channel_number = chno_match.group(1) if chno_match else None
+    def stream_choice(self, channel, index, focused=None):
+        """(variant key, url, decoder profile) for grid slot `index` (-1 if it isn't in the grid)."""
+        if focused is None:
+            focused = index >= 0 and self.tile_focused(index)
+        url = self.stream_url(channel)
+        height = self.slot_height(index) if index >= 0 else None
+        decoder = self.governor.decoder(index)
+        if decoder is not None:
+            # Under load unfocused tiles take the lightest variant going
+            height = 1
+        key = None
+        if url == channel.url:
+            # Relayed mux streams are split locally; there's nothing lighter to ask for
+            key, url = self.variants.pick(url, height)
+        return key, url, decoder or self.decoder_profiles.pick(height, focused)
 
-                if i + 1 < len(lines):
-                    stream_url = lines[i + 1].strip()
-                    self.channels[channel_name] = stream_url
-                    if channel_number:
-                        self.channels_by_number[channel_number] = (channel_name, stream_url)
+    def tile_media(self, tile, channel, index, focused=None):
+        """Media for a tile in grid slot `index`, from the lightest stream and decoder settings that still fill it."""
+        if focused is None:
+            focused = index >= 0 and self.tile_focused(index)
+        tile.variant, url, tile.decoder = self.stream_choice(channel, index, focused)
+        self.decoder_profiles.apply(tile.player, tile.decoder, focused)
+        # A track remembered while muted belongs to the old media
+        self.muted_audio_tracks.pop(id(tile.player), None)
+        return self.create_media(channel, url, self.decoder_profiles.media_options(tile.decoder))
 
-    def create_media(self, channel_name, channel_url):
-        media = self.instance.media_new(channel_url)
-        if 'radio' in channel_name.lower():
+    def create_media(self, channel, url=None, options=()):
+        media = self.instance.media_new(url or self.stream_url(channel))
+        for option in options:
+            media.add_option(option)
+        if 'radio' in channel.name.lower():
             media.add_option('network-caching=500')
+        # Per-channel options from #EXTVLCOPT lines in the playlist
+        for option in channel.options:
+            media.add_option(option)
         return media
 
     def setup_players(self, streams):
+        """Lay out one tile per stream, reusing live tiles instead of rebuilding them.
+
+        Tiles already playing a channel in the new group keep playing untouched; the
+        rest are retuned from leftover or pooled tiles, and only those get (re)started.
+        """
         self.epg_mode = 'hover'
-        for player in self.players:
-            player.stop()
-        for video in self.videos:
-            self.grid_layout.removeWidget(video)
-            video.deleteLater()
-        for overlay in self.overlays:
-            overlay.deleteLater()
-        for chan_overlay in self.channel_overlays:
-            chan_overlay.deleteLater()
-        for mute_overlay in self.mute_overlays:
-            mute_overlay.deleteLater()
-        for epg_overlay in getattr(self, 'epg_overlays', []):
-            epg_overlay.deleteLater()
-            
-        self.videos.clear()
-        self.players.clear()
-        self.overlays.clear()
-        self.channel_overlays.clear()
-        self.mute_overlays.clear()
-        self.epg_overlays.clear()
-        
+        self.prefetcher.clear()
+        self.cancel_handovers()
+        if self.single_fs_active:
+            for v in self.videos:
+                v.show()
+            self.overlays[self.single_fs_index].fs_btn.setText("🗖")
         self.single_fs_active = False
         self.single_fs_index = -1
 
         num_streams = len(streams)
-        if num_streams == 1:
-            self.grid_rows, self.grid_cols = 1, 1
-        elif num_streams <= 4:
-            self.grid_rows, self.grid_cols = 2, 2
-        else:
-            self.grid_rows, self.grid_cols = 3, 3
-
-        for i, (name,url) in enumerate(streams):
-            player = self.instance.media_player_new()
-            media = self.create_media(name, url)
-            player.set_media(media)
-            self.players.append(player)
-
-            video_widget = QFrame(self)
-            video_widget.setFrameShape(QFrame.NoFrame)
-            video_widget.setStyleSheet("background-color: black; border: none;")
-            self.grid_layout.addWidget(video_widget, i // self.grid_cols, i % self.grid_cols)
-            self.videos.append(video_widget)
-            
-            # Important: set event filter on video frame too to catch resizes
-            video_widget.installEventFilter(self)
-            self.set_vlc_video_widget(player, video_widget)
-            
-            # Disable VLC's native mouse handling so Qt can receive double clicks
-            player.video_set_mouse_input(False)
-            player.video_set_key_input(False)
-            
-            overlay = OverlayControls(self, video_widget, player, i)
-            self.overlays.append(overlay)
-            
-            epg_overlay = EPGOverlay(self, video_widget, name)
-            if hasattr(self, 'epg_data') and name in self.epg_data:
-                epg_overlay.update_data(self.epg_data[name])
-            self.epg_overlays.append(epg_overlay)
+        self.tile_layout = TileLayout.build(self.group_layouts[self.current_group_index], num_streams)
+        self.grid_rows, self.grid_cols = self.tile_layout.rows, self.tile_layout.cols
+
+        # Keep tiles whose channel carries over, wherever they end up in the grid
+        playing = {}
+        for tile in self.tiles:
+            if tile.url:
+                playing.setdefault(tile.url, []).append(tile)
+        layout = [None] * num_streams
+        for i, channel in enumerate(streams):
+            if channel.url and playing.get(channel.url):
+                layout[i] = playing[channel.url].pop(0)
+        kept = {id(tile) for tile in layout if tile is not None}
+        leftover = [tile for tile in self.tiles if id(tile) not in kept]
+        
+        to_start = []
+        for i, channel in enumerate(streams):
+            if layout[i] is not None:
+                continue
+            if leftover:
+                tile = leftover.pop(0)
+            elif self.tile_pool:
+                tile = self.tile_pool.pop()
+            else:
+                tile = self._create_tile(i, channel)
+            if channel.url:
+                self.latency.trace(tile.player, channel.name)
+            # The old grid's mute state says nothing about who'll have focus in this one
+            self._retune_tile(tile, channel, self.stream_groups_numbers[self.current_group_index][i], i, focused=False)
+            layout[i] = tile
+            if channel.url:
+                to_start.append(i)
             
-            channel_number = self.stream_groups_numbers[self.current_group_index][i]
+        # Tiles that carried over without a tuner get another go
+        to_start += [i for i, tile in enumerate(layout) if tile.blocked and i not in to_start]
             
-            # User requested hardcoded display overrides for the first 6 channels
-            # Grid Top Row: 24, 109, 63
-            # Grid Second Row: 87, 18, 247
-            override_numbers = ["24", "109", "63", "87", "18", "247"]
-            initial_override = None
-            if not os.path.exists(".fastboot") and i < len(override_numbers):
-                initial_override = override_numbers[i]
-                
-            chan_overlay = ChannelOverlay(self, video_widget, channel_number, initial_override)
-            chan_overlay.attach_player(player)
-            self.channel_overlays.append(chan_overlay)
+        # Park whatever the new group doesn't need
+        for tile in leftover:
+            tile.player.stop()
+            tile.url = None
+            tile.tuned = tile.blocked = False
+            tile.video.hide()
+            tile.overlay.hide_instantly()
+            tile.epg_overlay.hide_instantly()
+            tile.chan_overlay.hide()
+            tile.mute_overlay.hide()
+            tile.mute_overlay.hide_timer.stop()
+            tile.status_overlay.hide()
+            tile.stats_overlay.hide()
+            self.tile_pool.append(tile)
             
-            mute_overlay = MuteOverlay(self, video_widget)
-            self.mute_overlays.append(mute_overlay)
+        for tile in self.tiles:
+            self.grid_layout.removeWidget(tile.video)
+        for i, tile in enumerate(layout):
+            self.grid_layout.addWidget(tile.video, *self.tile_layout.cells[i])
+            tile.video.show()
+            tile.overlay.index = i
+            tile.overlay.set_mute_ui(False)
             
-            should_mute = False
-            overlay.set_mute_ui(should_mute)
+        self.tiles = layout
+        self._sync_tile_lists()
+        for overlay in self.overlays:
+            overlay.sync_channel_selection()
             
-            QTimer.singleShot(1000, overlay.check_sub_state)
+        self.update_epg_watch()
             
-        # Staggered loading
-        load_order_1_based = [5, 1, 3, 2, 4, 6, 7, 8, 9]
-        self.load_queue = [x - 1 for x in load_order_1_based if (x - 1) < num_streams]
-        for i in range(num_streams):
-            if i not in self.load_queue:
-                self.load_queue.append(i)
-                
-        if not hasattr(self, 'load_timer'):
-            self.load_timer = QTimer(self)
-            self.load_timer.timeout.connect(self._load_next_stream)
-        
-        if os.path.exists(".fastboot"):
-            self.load_timer.setInterval(0)
+        # Start only the tiles that changed channel, the one under the mouse first
+        self.stream_scheduler.cancel()
+        focus = self.tile_at(QCursor.pos())
+        order = self.stream_scheduler.priority(to_start, focus)
+        if order:
+            self.stream_scheduler.start([layout[i] for i in order])
         else:
-            self.load_timer.setInterval(1000)
-            
-        # Start the first stream immediately, and the timer will handle the rest
-        self.load_timer.stop()
-        self._load_next_stream()
-        self.load_timer.start()
+            self._auto_lock_epg()
         
         if hasattr(self, 'controls_window'):
             self.controls_window.raise_()
+        self.hover_tracker.refresh(force=True)
+        self.prefetcher.schedule()
+        self.visibility.update()
+        for delay in (10, 50, 200):
+            QTimer.singleShot(delay, lambda: [o.update_position() for o in self.overlays + self.channel_overlays + self.epg_overlays])
+
+    def _sync_tile_lists(self):
+        layout = self.tiles
+        self.players = [t.player for t in layout]
+        self.videos = [t.video for t in layout]
+        self.placeholders = [t.placeholder for t in layout]
+        self.overlays = [t.overlay for t in layout]
+        self.epg_overlays = [t.epg_overlay for t in layout]
+        self.channel_overlays = [t.chan_overlay for t in layout]
+        self.mute_overlays = [t.mute_overlay for t in layout]
+        self.status_overlays = [t.status_overlay for t in layout]
+        self.stats_overlays = [t.stats_overlay for t in layout]
+        self.tile_by_video = {id(t.video): t for t in layout}
+
+    def _swap_tile(self, i, tile, keep_old=True):
+        """Put a pre-tuned tile in grid slot i and hand the old one to the prefetcher."""
+        old = self.tiles[i]
+        self.setUpdatesEnabled(False)
+        self.grid_layout.removeWidget(old.video)
+        self.grid_layout.addWidget(tile.video, *self.tile_layout.cells[i])
+        tile.video.setVisible(old.video.isVisible())
+        old.video.hide()
+        tile.overlay.index = i
+        tile.overlay.set_mute_ui(old.player.audio_get_mute() == 1)
+        if old.overlay.isVisible():
+            tile.overlay.fade_in()
+        if old.epg_overlay.isVisible():
+            tile.epg_overlay.show_instantly()
+        old.overlay.hide_instantly()
+        old.epg_overlay.hide_instantly()
+        old.chan_overlay.hide()
+        old.mute_overlay.hide()
+        old.mute_overlay.hide_timer.stop()
+        old.status_overlay.hide()
+        old.stats_overlay.hide()
+        self.tiles[i] = tile
+        self._sync_tile_lists()
+        self.setUpdatesEnabled(True)
+        if keep_old:
+            self.prefetcher.adopt(old)
+        else:
+            self.prefetcher.release(old)
+        QTimer.singleShot(10, lambda: [o.update_position() for o in (tile.overlay, tile.epg_overlay, tile.chan_overlay)])
+
+    def refresh_variants(self, *args):
+        self.variant_timer.start()
+
+    def _refresh_variants(self):
+        self.refresh_streams()
+        # A tile that just got focus shouldn't wait for the next governor sample to play or be heard
+        self.governor.enforce()
+
+    def refresh_streams(self, in_place=False):
+        """Move tiles whose size or focus changed onto the stream variant and decoder profile that suit them.
 
-    def _load_next_stream(self):
-        if not hasattr(self, 'load_queue') or not self.load_queue:
-            if hasattr(self, 'load_timer'):
-                self.load_timer.stop()
+        The new variant plays in a hidden spare tile and is swapped in once it's drawing,
+        so the tile never goes black in between (see _on_video_started). With `in_place`
+        tiles are simply retuned, which costs a moment of black but no second stream; they
+        queue on the stream scheduler, so only a few restart at once and tuners are respected.
+        """
+        if self.instance is None:
             return
+        streams = self.stream_groups[self.current_group_index]
+        retune = []
+        for i, tile in enumerate(self.tiles):
+            if i >= len(streams) or not tile.url or not tile.tuned or tile.url != streams[i].url:
+                continue
+            if self.visibility.is_dormant(tile):
+                continue
+            channel = streams[i]
+            focused = self.tile_focused(i)
+            self.decoder_profiles.apply(tile.player, tile.decoder, focused)
+            key, _, decoder = self.stream_choice(channel, i, focused)
+            wanted = (key, decoder)
+            pending = self.handovers.get(i)
+            if pending is not None:
+                if pending.url == tile.url and (pending.variant, pending.decoder) == wanted:
+                    continue
+                self._cancel_handover(i)
+            if (tile.variant, tile.decoder) == wanted:
+                continue
+            if in_place:
+                retune.append(i)
+                continue
+            spare = self.tile_pool.pop() if self.tile_pool else self._create_tile(i, channel)
+            spare.video.hide()
+            self._retune_tile(spare, channel, tile.chan_overlay.real_channel_number, i)
+            spare.tuned = True
+            spare.player.audio_set_mute(True)
+            self.handovers[i] = spare
+            spare.player.play()
+        if retune:
+            order = self.stream_scheduler.priority(retune)
+            self.stream_scheduler.start([self.tiles[i] for i in order], prepare=self._retune_in_place)
+
+    def _retune_in_place(self, tile):
+        # The old stream keeps playing until the scheduler gets round to this tile
+        i = self.tiles.index(tile)
+        channel = self.stream_groups[self.current_group_index][i]
+        tile.tuned = tile.blocked = False
+        tile.player.set_media(self.tile_media(tile, channel, i))
+
+    def _on_video_started(self, player):
+        for i, spare in list(self.handovers.items()):
+            if spare.player is not player:
+                continue
+            del self.handovers[i]
+            if i >= len(self.tiles) or self.tiles[i].url != spare.url:
+                # The tile was zapped or regrouped meanwhile
+                self.prefetcher.release(spare)
+                return
+            old = self.tiles[i]
+            spare.player.audio_set_mute(old.player.audio_get_mute() == 1)
+            self._swap_tile(i, spare, keep_old=False)
+            self.governor.enforce()
+            return
+
+    def set_audio_decoding(self, player, enabled):
+        """Turn a tile's audio track off while it's muted and back on (the same track) when it isn't."""
+        if self.decode_muted_audio:
+            return
+        for tile in self.tiles:
+            if tile.player is player and self.visibility.is_dormant(tile):
+                # Hidden tiles get their tracks back when they wake
+                return
+        current = player.audio_get_track()
+        if enabled and current == -1:
+            # Same track as before if this media still has it (a retune may have changed the ids)
+            tracks = [track[0] for track in player.audio_get_track_description() or [] if track[0] != -1]
+            track = self.muted_audio_tracks.pop(id(player), -1)
+            if track not in tracks:
+                track = tracks[0] if tracks else -1
+            if track != -1:
+                player.audio_set_track(track)
+        elif not enabled and current != -1:
+            self.muted_audio_tracks[id(player)] = current
+            player.audio_set_track(-1)
+
+    def _on_audio_ready(self, player, ok=True):
+        # A new media starts with its audio selected; switch it off again if the tile is muted.
+        # Handover spares keep theirs, so the sound carries straight on when they're swapped in
+        if any(spare.player is player for spare in self.handovers.values()):
+            return
+        if ok and player.audio_get_mute() == 1:
+            self.set_audio_decoding(player, False)
+
+    def _on_handover_event(self, player, ok):
+        if ok:
+            return
+        for i, spare in list(self.handovers.items()):
+            if spare.player is player:
+                # Keep the stream the tile already has
+                self._cancel_handover(i)
+
+    def _cancel_handover(self, i):
+        spare = self.handovers.pop(i, None)
+        if spare is not None:
+            self.prefetcher.release(spare)
+
+    def cancel_handovers(self):
+        self.variant_timer.stop()
+        for i in list(self.handovers):
+            self._cancel_handover(i)
+
+    def _create_tile(self, i, channel):
+        player = self.instance.media_player_new()
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerVout, self._on_vout_cb)
+        player.event_manager().event_attach(vlc.EventType.MediaPlayerVout, lambda e, p=player: self.video_started.emit(p))
+        self.stream_scheduler.watch(player)
+        self.latency.watch(player)
+
+        video_widget = QFrame(self)
+        video_widget.setFrameShape(QFrame.NoFrame)
+        video_widget.setStyleSheet("background-color: black; border: none;")
+        
+        # Shown until VLC starts drawing into the frame
+        placeholder = QLabel("", video_widget)
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        placeholder.setStyleSheet("color: #666666; font-size: 22px; font-weight: bold; background: transparent;")
+        placeholder_layout = QVBoxLayout(video_widget)
+        placeholder_layout.setContentsMargins(0, 0, 0, 0)
+        placeholder_layout.addWidget(placeholder)
+        
+        # Important: set event filter on video frame too to catch resizes
+        video_widget.installEventFilter(self)
+        self.set_vlc_video_widget(player, video_widget)
+        
+        # Disable VLC's native mouse handling so Qt can receive double clicks
+        player.video_set_mouse_input(False)
+        player.video_set_key_input(False)
+        
+        overlay = OverlayControls(self, video_widget, player, i)
+        self.hover_tracker.track(video_widget)
+        self.hover_tracker.track(overlay)
+        
+        epg_overlay = EPGOverlay(self, video_widget, channel.name)
+        
+        # User requested hardcoded display overrides for the first 6 channels
+        # Grid Top Row: 24, 109, 63
+        # Grid Second Row: 87, 18, 247
+        override_numbers = ["24", "109", "63", "87", "18", "247"]
+        initial_override = None
+        if not self.fastboot and i < len(override_numbers) and not self.tiles and not self.tile_pool:
+            initial_override = override_numbers[i]
             
-        idx = self.load_queue.pop(0)
-        is_fastboot = os.path.exists(".fastboot")
-        delay = 0 if is_fastboot else 3600
-        
-        if idx < len(self.players) and idx < len(self.channel_overlays):
-            self.players[idx].play()
-            if getattr(self, 'epg_mode', 'locked') == 'locked' and idx < len(getattr(self, 'epg_overlays', [])):
-                if self.epg_overlays[idx].windowOpacity() == 0.0:
-                    QTimer.singleShot(delay, self.epg_overlays[idx].show_instantly)
-            
-            if not self.load_queue:
-                QTimer.singleShot(delay, self._auto_lock_epg)
+        chan_overlay = ChannelOverlay(self, video_widget, "", initial_override)
+        chan_overlay.attach_player(player)
+        chan_overlay.playing_signal.connect(placeholder.hide)
+        
+        mute_overlay = MuteOverlay(self, video_widget)
+        status_overlay = TileStatusOverlay(self, video_widget)
+        chan_overlay.playing_signal.connect(status_overlay.clear_status)
+        stats_overlay = StatsOverlay(self, video_widget)
+        self.health_monitor.watch(player)
+        
+        QTimer.singleShot(1000, overlay.check_sub_state)
+        return Tile(player, video_widget, placeholder, overlay, epg_overlay, chan_overlay, mute_overlay, status_overlay,
+                    stats_overlay)
+
+    def _retune_tile(self, tile, channel, channel_number, index=-1, focused=None):
+        tile.status_overlay.status = None
+        tile.status_overlay.hide()
+        tile.player.stop()
+        tile.url = channel.url
+        tile.tuned = tile.blocked = False
+        if channel.url:
+            tile.player.set_media(self.tile_media(tile, channel, index, focused))
+            self.latency.mark(tile.player, 'set_media')
+        tile.placeholder.setText(f"{channel.name}\n{'Loading...' if channel.url else 'Waiting for playlist...'}")
+        tile.placeholder.show()
+        tile.epg_overlay.channel_name = channel.name
+        tile.epg_overlay.update_data(self.epg_data.get(channel.name, {}))
+        tile.chan_overlay.real_channel_number = str(channel_number)
+
+    def _on_tile_started(self, tile):
+        if self.epg_mode == 'locked' and tile.epg_overlay.windowOpacity() == 0.0:
+            QTimer.singleShot(0 if self.fastboot else 3600, tile.epg_overlay.show_instantly)
+
+    def _on_streams_started(self):
+        QTimer.singleShot(0 if self.fastboot else 3600, self._auto_lock_epg)
 
     def _auto_lock_epg(self):
         if getattr(self, 'epg_mode', 'hover') != 'locked':
@@ -1681,6 +4568,7 @@ class MultiPlayerApp(QMainWindow):
 
     def showFullScreenOnMonitor(self, monitor_index):
         # Kept for reference, but we default to 1080p normal window now
+        from screeninfo import get_monitors
         monitors = get_monitors()
         if monitor_index >= len(monitors):
             monitor_index = 0
@@ -1697,8 +4585,10 @@ class MultiPlayerApp(QMainWindow):
                 return
             self.current_group_index = group_index
             print(f"Switched to group {group_index}")
-            import copy
+            self.latency.begin('group')
             self.stream_groups[group_index] = copy.deepcopy(self.original_stream_groups[group_index])
+            if self.instance is None:
+                return
             self.setup_players(self.stream_groups[group_index])
             QTimer.singleShot(1000, self.subs_all_on)
 
@@ -1711,6 +4601,9 @@ class MultiPlayerApp(QMainWindow):
         else:
             self.unmute_all()
 
+    def toggle_stats_overlays(self):
+        self.telemetry.set_overlays_visible(not self.telemetry.show_overlays)
+
     def handle_sub_toggle(self):
         if not self.players: return
         any_subs_on = any(o.sub_state for o in self.overlays)
@@ -1778,6 +4671,7 @@ class MultiPlayerApp(QMainWindow):
                 print(f"Screenshot saved for player {i+1} at {filepath}")
 
     def take_combined_screenshot(self):
+        from PIL import Image
         downloads = Path.home() / "Downloads" / "tvplayer_screenshots"
         downloads.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -1790,21 +4684,21 @@ class MultiPlayerApp(QMainWindow):
             filepath = downloads / filename
             if self._take_snapshot(player, filepath):
                 img = Image.open(filepath)
-                snapshots.append(img)
+                snapshots.append((self.tile_layout.cells[i], img))
                 temp_files.append(filepath)
         if not snapshots: return
         num_images = len(snapshots)
-        cols = self.grid_cols
-        rows = (num_images + cols - 1) // cols
         if num_images == 1:
             print(f"Screenshot saved at {temp_files[0]}")
             return
-        width, height = snapshots[0].size
-        combined_img = Image.new('RGB', (width * cols, height * rows))
-        for idx, img in enumerate(snapshots):
-            x = (idx % cols) * width
-            y = (idx // cols) * height
-            combined_img.paste(img, (x, y))
+        # One grid cell per snapshot size; tiles spanning several cells are scaled up to fit
+        (_, _, rowspan, colspan), first = snapshots[0]
+        width, height = first.size[0] // colspan, first.size[1] // rowspan
+        combined_img = Image.new('RGB', (width * self.grid_cols, height * self.grid_rows))
+        for (row, col, rowspan, colspan), img in snapshots:
+            if img.size != (width * colspan, height * rowspan):
+                img = img.resize((width * colspan, height * rowspan))
+            combined_img.paste(img, (col * width, row * height))
         combined_filename = downloads / f"{timestamp}_combined_grid.jpg"
         combined_img.save(combined_filename, "JPEG", quality=90)
         for file_path in temp_files:
@@ -1820,6 +4714,7 @@ class MultiPlayerApp(QMainWindow):
         temp_png = final_filepath.with_suffix('.png')
         result = player.video_take_snapshot(0, str(temp_png), 0, 0) == 0
         if not result or not temp_png.exists(): return False
+        from PIL import Image
         img = Image.open(temp_png)
         img.convert("RGB").save(final_filepath, "JPEG", quality=90)
         temp_png.unlink()
@@ -1886,7 +4781,6 @@ class ControlsWindow(QWidget):
         w, h = self.width(), self.height()
         
         try:
-            from datetime import datetime
             import pytz
             uk_tz = pytz.timezone('Europe/London')
             now = datetime.now(uk_tz)
@@ -2056,6 +4950,7 @@ if __name__ == "__main__":
     all_groups_labels = list(config['stream_groups'].keys())
     controls = ControlsWindow(main_app, all_groups_labels)
     main_app.controls_window = controls
+    main_app.hover_tracker.track(controls)
     controls.show()
     
     # When the main window is closed, quit the application